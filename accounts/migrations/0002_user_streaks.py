@@ -0,0 +1,76 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:00
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def backfill_streaks(apps, schema_editor):
+    """
+    Compute streaks from existing attempts. Every user is on the default
+    time zone at this point, so one pass over all attempts is enough.
+    """
+    User = apps.get_model('accounts', 'User')
+    QuizAttempt = apps.get_model('quizzes', 'QuizAttempt')
+    tz = timezone.get_default_timezone()
+
+    days_by_user = {}
+    for field in ('started_at', 'completed_at'):
+        rows = (
+            QuizAttempt.objects
+            .exclude(**{f'{field}__isnull': True})
+            .annotate(day=TruncDate(field, tzinfo=tz))
+            .order_by()
+            .values_list('user_id', 'day')
+            .distinct()
+        )
+        for user_id, day in rows.iterator(chunk_size=2000):
+            days_by_user.setdefault(user_id, set()).add(day)
+
+    for user_id, days in days_by_user.items():
+        current = longest = 0
+        previous = None
+        for day in sorted(days):
+            current = current + 1 if previous and day - previous == timedelta(days=1) else 1
+            longest = max(longest, current)
+            previous = day
+
+        User.objects.filter(pk=user_id).update(
+            current_streak=current,
+            longest_streak=longest,
+            last_active_date=previous
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('quizzes', '0025_userstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='current_streak',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='last_active_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='longest_streak',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='time_zone',
+            field=models.CharField(blank=True, max_length=63),
+        ),
+        migrations.RunPython(backfill_streaks, migrations.RunPython.noop),
+    ]
@@ -41,6 +41,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     preferred_categories = models.JSONField(null=True, blank=True)
     preferred_difficulty = models.CharField(max_length=1, blank=True, null=True)
 
+    # IANA name, e.g. "Asia/Kolkata"; blank means settings.TIME_ZONE
+    time_zone = models.CharField(max_length=63, blank=True)
+
+    # Daily quiz streak, kept up to date by quizzes.streaks as attempts
+    # start and complete. Dates are in the user's time zone.
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_active_date = models.DateField(null=True, blank=True)
+
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
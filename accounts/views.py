@@ -4,7 +4,6 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.views import LoginView
 from django.urls import reverse_lazy
-from django.db.models import Avg, Sum
 from django.http import JsonResponse
 from django.contrib.auth import update_session_auth_hash
 
@@ -81,7 +80,8 @@ class CustomLoginView(LoginView):
 def profile_view(request):
     user = request.user
 
-    from quizzes.models import QuizAttempt
+    from quizzes.streaks import current_streak
+    from quizzes.user_stats import get_user_stats
 
     if request.method == "POST":
         form_type = request.POST.get("form_type")
@@ -142,30 +142,22 @@ def profile_view(request):
     # ---------------------------
     # GET REQUEST (Page Load)
     # ---------------------------
-    completed_quizzes = QuizAttempt.objects.filter(
-        user=user,
-        status=QuizAttempt.STATUS_COMPLETED
-    )
+    stats = get_user_stats(user)
 
-    quizzes_taken = completed_quizzes.count()
-    avg_score = completed_quizzes.aggregate(avg=Avg('score'))['avg'] or 0
-
-    total_time = completed_quizzes.aggregate(
-        total=Sum('time_spent_seconds')
-    )['total'] or 0
-
-    time_spent_hours = round(total_time / 3600, 1)
+    time_spent_hours = round(stats.time_taken_sum / 3600, 1)
 
     # Get shared quizzes taken by this user (via shared links)
     from quizzes.models import SharedQuizAttempt
     shared_quiz_attempts = SharedQuizAttempt.objects.filter(
         attempt__user=user
-    ).select_related('shared_quiz', 'shared_quiz__creator', 'attempt').order_by('-accessed_at')
+    ).select_related(
+        'shared_quiz', 'shared_quiz__creator', 'shared_quiz__question_set', 'attempt'
+    ).defer('shared_quiz__question_set__questions').order_by('-accessed_at')
 
     context = {
-        'quizzes_taken': quizzes_taken,
-        'avg_score': round(avg_score, 1),
-        'current_streak': 0,
+        'quizzes_taken': stats.completed_count,
+        'avg_score': round(stats.avg_score, 1),
+        'current_streak': current_streak(user),
         'time_spent': time_spent_hours,
         'shared_quiz_attempts': shared_quiz_attempts,
     }
@@ -0,0 +1,80 @@
+# core/landing.py
+"""
+Landing page data.
+
+The public index page shows site-wide counters (active users, completed
+quizzes, satisfaction) and a few testimonials. Counting users and
+attempts and averaging ratings on every anonymous hit grows with the
+database, so `landing_stats()` computes the counters at most once per
+LANDING_CACHE_TTL and the template caches the rendered testimonials
+fragment for the same period. A warm hit runs no queries.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg
+
+from accounts.models import User
+from quizzes.models import Feedback, QuizAttempt
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'landing:stats'
+CACHE_TTL_SECONDS = getattr(settings, 'LANDING_CACHE_TTL', 300)
+
+TESTIMONIAL_COUNT = 6
+# Shown until there is approved feedback to average
+DEFAULT_SATISFACTION_RATE = 98
+
+
+def compute_landing_stats():
+    """
+    The landing page counters, straight from the database.
+    """
+    total_users = User.objects.filter(is_active=True).count()
+    total_quizzes = QuizAttempt.objects.filter(status=QuizAttempt.STATUS_COMPLETED).count()
+
+    # Feedback ratings (1-5 scale) converted to a percentage
+    avg_rating = Feedback.objects.filter(is_approved=True).aggregate(avg=Avg('rating'))['avg']
+    satisfaction_rate = int((avg_rating / 5) * 100) if avg_rating else DEFAULT_SATISFACTION_RATE
+
+    return {
+        'total_users': total_users,
+        'total_quizzes': total_quizzes,
+        'satisfaction_rate': satisfaction_rate,
+    }
+
+
+def landing_stats():
+    """
+    The landing page counters, refreshed at most every CACHE_TTL_SECONDS.
+    """
+    try:
+        stats = cache.get(CACHE_KEY)
+    except Exception:
+        logger.exception("Landing cache read failed")
+        stats = None
+    if stats is not None:
+        return stats
+
+    stats = compute_landing_stats()
+
+    try:
+        cache.set(CACHE_KEY, stats, CACHE_TTL_SECONDS)
+    except Exception:
+        logger.exception("Landing cache write failed")
+    return stats
+
+
+def testimonials():
+    """
+    Approved feedback for the testimonials carousel, featured first.
+    Lazy: the template only evaluates it when its cached fragment expires.
+    """
+    return Feedback.objects.filter(
+        is_approved=True
+    ).select_related(
+        'user', 'quiz_attempt__category'
+    ).order_by('-is_featured', '-rating', '-created_at')[:TESTIMONIAL_COUNT]
@@ -195,6 +195,97 @@ AUTH_USER_MODEL = 'accounts.User'
 # OpenAI API Key for quiz generation with GPT 3.5
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
+# Shared OpenAI client (quizzes/llm_client.py). Point OPENAI_API_BASE at a
+# local stub server to run the AI features without calling OpenAI.
+OPENAI_API_BASE = os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
+OPENAI_CONNECT_TIMEOUT = 5   # seconds
+OPENAI_READ_TIMEOUT = int(os.environ.get("OPENAI_READ_TIMEOUT", 60))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", 3))
+OPENAI_POOL_SIZE = 10
+OPENAI_CACHE_TTL = int(os.environ.get("OPENAI_CACHE_TTL", 60 * 60 * 24))  # seconds
+
+# Per-user dashboard chart payloads (quizzes/analytics.py), keyed by stats
+# version so a completed quiz is picked up by every worker at once
+ANALYTICS_CACHE_TTL = int(os.environ.get("ANALYTICS_CACHE_TTL", 300))  # seconds
+
+# Performance report PDFs (quizzes/reports.py). Kept outside MEDIA_ROOT so
+# they are only served through the login-protected download view; reports
+# with more topics than PERFORMANCE_REPORT_INLINE_TOPICS render in a job.
+PERFORMANCE_REPORT_ROOT = Path(os.environ.get("PERFORMANCE_REPORT_ROOT", BASE_DIR / "reports"))
+PERFORMANCE_REPORT_INLINE_TOPICS = int(os.environ.get("PERFORMANCE_REPORT_INLINE_TOPICS", 50))
+
+# Landing page counters and testimonials (core/landing.py)
+LANDING_CACHE_TTL = int(os.environ.get("LANDING_CACHE_TTL", 300))  # seconds
+
+# Fixed fields (title, creator, ids) of shared quizzes being joined
+# (quizzes/shared_join.py); active flag, expiry and limits are always read live
+SHARED_QUIZ_CACHE_TTL = int(os.environ.get("SHARED_QUIZ_CACHE_TTL", 300))  # seconds
+
+# Live classroom results streams (quizzes/classroom_live.py) open at once
+# per shared quiz, per process
+CLASSROOM_LIVE_MAX_STREAMS = int(os.environ.get("CLASSROOM_LIVE_MAX_STREAMS", 5))
+
+# AI quiz generator uploads (quizzes/utils/file_parser.py): PDFs with at
+# least DOCUMENT_PARSE_PARALLEL_PAGES pages are parsed by a pool of
+# DOCUMENT_PARSE_WORKERS processes (0 = parse in the request process)
+DOCUMENT_PARSE_WORKERS = int(os.environ.get("DOCUMENT_PARSE_WORKERS", 0))
+DOCUMENT_PARSE_PARALLEL_PAGES = int(os.environ.get("DOCUMENT_PARSE_PARALLEL_PAGES", 50))
+# Extracted text and generated questions per uploaded document (by
+# content hash, see quizzes/document_cache.py)
+DOCUMENT_CACHE_TTL = int(os.environ.get("DOCUMENT_CACHE_TTL", 60 * 60 * 24))  # seconds
+
+# ========================
+# CACHES
+# ========================
+# "llm" holds OpenAI responses keyed by a hash of the prompt; "analytics"
+# holds per-user dashboard chart data; "documents" holds text and questions
+# for uploaded documents keyed by a hash of the file. Local-memory caches are per process
+# and evict least-recently-used entries once full; point these at
+# Redis/Memcached in production to share them across workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+    },
+    'llm': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'llm',
+        'TIMEOUT': OPENAI_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    'analytics': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'analytics',
+        'TIMEOUT': ANALYTICS_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'documents': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'documents',
+        'TIMEOUT': DOCUMENT_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# ========================
+# BACKGROUND JOBS
+# ========================
+# Slow work (AI question generation) is queued in the database and run by
+# `python manage.py run_jobs` workers. Set BACKGROUND_JOBS_EAGER=True to run
+# jobs inside the web process instead (local development without a worker).
+BACKGROUND_JOBS_EAGER = os.environ.get('BACKGROUND_JOBS_EAGER', 'False').lower() == 'true'
+BACKGROUND_JOBS_LOCK_TIMEOUT = 600  # seconds before a stuck job is re-claimed
+
+# Question bank pools (one per SubCategory x difficulty) are refilled in the
+# background once they drop below the low-water mark.
+QUESTION_POOL_LOW_WATER_MARK = int(os.environ.get('QUESTION_POOL_LOW_WATER_MARK', 50))
+QUESTION_POOL_TARGET_SIZE = int(os.environ.get('QUESTION_POOL_TARGET_SIZE', 100))
+QUESTION_POOL_REFILL_BATCH = 10
+
+# Prefetch quiz player: ship the whole question set (without answers) to the
+# browser once, navigate locally and sync answers to the server in batches.
+QUIZ_PLAYER_PREFETCH = os.environ.get('QUIZ_PLAYER_PREFETCH', 'False').lower() == 'true'
+
 
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:8000",
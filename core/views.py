@@ -3,29 +3,15 @@
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
-from django.db.models import Avg
-from quizzes.models import Feedback, QuizAttempt
-from accounts.models import User
+from core import landing
 
 def index(request):
-    # Get approved testimonials for the landing page
-    testimonials = Feedback.objects.filter(
-        is_approved=True
-    ).select_related('user').order_by('-is_featured', '-rating', '-created_at')[:6]
-    
-    # Real-time stats from database
-    total_users = User.objects.filter(is_active=True).count()
-    total_quizzes = QuizAttempt.objects.filter(status=QuizAttempt.STATUS_COMPLETED).count()
-    
-    # Calculate satisfaction rate from feedback ratings (1-5 scale converted to percentage)
-    avg_rating = Feedback.objects.filter(is_approved=True).aggregate(avg=Avg('rating'))['avg']
-    satisfaction_rate = int((avg_rating / 5) * 100) if avg_rating else 98  # Default to 98% if no feedback
-    
+    # Counters and testimonials are cached (see core/landing.py), so the
+    # anonymous landing page costs the same however large the site grows
     return render(request, "core/index_new.html", {
-        'testimonials': testimonials,
-        'total_users': total_users,
-        'total_quizzes': total_quizzes,
-        'satisfaction_rate': satisfaction_rate,
+        'testimonials': landing.testimonials(),
+        'landing_cache_ttl': landing.CACHE_TTL_SECONDS,
+        **landing.landing_stats(),
     })
 
 def root_redirect(request):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, SubCategory, QuizAttempt, Concept, Feedback
+from .models import Category, SubCategory, QuizAttempt, Concept, Feedback, BackgroundJob, UserStats
 
 
 @admin.register(Category)
@@ -35,3 +35,18 @@ class FeedbackAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'comment')
     list_editable = ('is_approved', 'is_featured')
     ordering = ('-created_at',)
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'attempts', 'run_after', 'finished_at')
+    list_filter = ('kind', 'status')
+    search_fields = ('dedupe_key', 'error')
+    ordering = ('-created_at',)
+
+
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'attempts_started', 'completed_count', 'abandoned_count', 'updated_at')
+    search_fields = ('user__username',)
+    readonly_fields = ('updated_at',)
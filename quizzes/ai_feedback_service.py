@@ -1,7 +1,5 @@
-import requests
-from django.conf import settings
+from .llm_client import chat_completion
 
-OPENAI_URL = "https://api.openai.com/v1/chat/completions"
 OPENAI_MODEL = "gpt-3.5-turbo"
 
 
@@ -11,10 +9,6 @@ def generate_ai_feedback(summary_data):
     in guaranteed bullet-point format.
     """
 
-    api_key = getattr(settings, "OPENAI_API_KEY", None)
-    if not api_key:
-        raise Exception("OPENAI_API_KEY not configured in settings.")
-
     prompt = f"""
 You are an expert computer science mentor.
 
@@ -46,26 +40,19 @@ OUTPUT EXAMPLE (FOLLOW EXACTLY):
 OUTPUT ONLY BULLET POINTS.
 """
 
-    response = requests.post(
-        OPENAI_URL,
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": OPENAI_MODEL,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.3,
-        },
-        timeout=30,
+    text = chat_completion(
+        [{"role": "user", "content": prompt}],
+        model=OPENAI_MODEL,
+        temperature=0.3,
+        read_timeout=30,
+        purpose="feedback",
+        cache=True,  # reopening the same results page sends the same prompt
     )
 
-    response.raise_for_status()
-
     # ---------------------------
     # 🔐 SAFETY POST-PROCESSING
     # ---------------------------
-    text = response.json()["choices"][0]["message"]["content"].strip()
+    text = text.strip()
 
     lines = text.split("\n")
     bullets = []
@@ -5,15 +5,12 @@ Generates quiz questions based on topic, category, and difficulty.
 """
 import json
 import re
-import os
-import requests
-from django.conf import settings
 
+from .llm_client import chat_completion
 
-# API Configuration
-OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY') or getattr(settings, 'OPENAI_API_KEY', None)
+
+# API Configuration (connection, retries and timeouts live in llm_client)
 OPENAI_MODEL = "gpt-3.5-turbo"
-OPENAI_URL = "https://api.openai.com/v1/chat/completions"
 
 
 def clean_json(text: str) -> str:
@@ -148,65 +145,43 @@ IMPORTANT: Return ONLY the JSON array. No text before or after.
 """
 
 
-def generate_quiz_questions(topic, category, difficulty, count=10, concepts=None):
+def generate_quiz_questions(topic, category, difficulty, count=10, concepts=None, cache=True):
     """
     Generate MCQs using OpenAI GPT API.
+    Identical requests are answered from the LLM cache unless cache=False
+    (question bank refills need fresh questions, not a repeat).
     """
     print(f"[AI Service] Generating {count} questions for {topic} ({category}) - {difficulty}")
     
-    if not OPENAI_API_KEY:
-        raise Exception("OPENAI_API_KEY not configured. Please set it in your .env file.")
-    
     prompt = build_prompt(topic, category, difficulty, count, concepts)
     
-    try:
-        response = requests.post(
-            OPENAI_URL,
-            headers={
-                "Authorization": f"Bearer {OPENAI_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": OPENAI_MODEL,
-                "max_tokens": 4096,
-                "messages": [
-                    {
-                        "role": "system", 
-                        "content": "You are an expert quiz question generator. Return only valid JSON arrays with quiz questions."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7,
-            },
-            timeout=60
-        )
-
-        if response.status_code == 401:
-            raise Exception("Invalid OpenAI API key. Please check your OPENAI_API_KEY in .env file.")
-        
-        if response.status_code == 429:
-            raise Exception("OpenAI API rate limit exceeded. Please wait a moment and try again.")
-        
-        if response.status_code >= 500:
-            raise Exception(f"OpenAI server error ({response.status_code}). Please try again later.")
-
-        response.raise_for_status()
-        data = response.json()
-        
-        message_content = data["choices"][0]["message"]["content"]
-        cleaned = clean_json(message_content)
-        questions = json.loads(cleaned)
-        
-        print(f"[AI Service] Successfully generated {len(questions)} questions!")
+    def parse(message_content):
+        questions = json.loads(clean_json(message_content))
         return validate_questions(questions, count)
 
-    except requests.exceptions.Timeout:
-        raise Exception("OpenAI API request timed out. Please try again.")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"OpenAI API request failed: {str(e)}")
+    # LLMError from the client already carries a user-facing message
+    try:
+        questions = chat_completion(
+            [
+                {
+                    "role": "system", 
+                    "content": "You are an expert quiz question generator. Return only valid JSON arrays with quiz questions."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            model=OPENAI_MODEL,
+            temperature=0.7,
+            max_tokens=4096,
+            purpose="quiz_questions",
+            parse=parse,
+            cache=cache
+        )
     except json.JSONDecodeError as e:
         raise Exception(f"Failed to parse AI response as JSON: {str(e)}")
 
+    print(f"[AI Service] Successfully generated {len(questions)} questions!")
+    return questions
+
 
 def generate_feedback(quiz_data, score, total, difficulty):
     """
@@ -0,0 +1,138 @@
+# quizzes/analytics.py
+"""
+Dashboard chart data.
+
+`chart_bundle()` builds everything the dashboard charts show (30-day
+activity and score series, category and difficulty distributions, and a
+summary) in one pass over the user's UserStats daily buckets. The result
+is cached per user and stats version, so the dashboard page and
+dashboard_charts_api serve the same payload, and a completed quiz moves
+every worker onto a new key at once. `invalidate_chart_bundle` drops an
+entry whose numbers changed without a new completion (rebuild_user_stats).
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.utils import timezone
+
+from .user_stats import get_user_stats, stats_version, window_days
+
+
+logger = logging.getLogger(__name__)
+
+CHART_DAYS = 30
+TOP_CATEGORIES = 6
+
+CACHE_ALIAS = 'analytics'
+# Upper bound on staleness after rebuild_user_stats when the cache is per
+# process (LocMem); completions change the key instead
+CACHE_TTL_SECONDS = getattr(settings, 'ANALYTICS_CACHE_TTL', 300)
+
+
+def _get_cache():
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def _cache_key(stats):
+    # The 30-day window moves at midnight, so yesterday's entry is never read
+    return (
+        f"analytics:charts:{stats.user_id}:{stats_version(stats)}:"
+        f"{timezone.localdate().isoformat()}"
+    )
+
+
+def build_chart_bundle(stats):
+    """
+    Compute the chart payload from a UserStats row.
+    """
+    chart_labels = []
+    chart_quiz_counts = []
+    chart_scores = []
+    categories = {}
+    difficulties = {}
+    total = 0
+    score_sum = 0.0
+
+    for day in window_days(CHART_DAYS):
+        bucket = stats.daily.get(day.isoformat())
+        chart_labels.append(day.strftime('%b %d'))
+
+        if not bucket:
+            chart_quiz_counts.append(0)
+            chart_scores.append(0)
+            continue
+
+        chart_quiz_counts.append(bucket['n'])
+        chart_scores.append(round(bucket['score'] / bucket['n'], 1))
+        total += bucket['n']
+        score_sum += bucket['score']
+
+        for category_key, n in bucket.get('cat', {}).items():
+            name = stats.by_category.get(category_key, {}).get('name') or 'Unknown'
+            categories[name] = categories.get(name, 0) + n
+
+        for difficulty, diff in bucket.get('diff', {}).items():
+            entry = difficulties.setdefault(difficulty, {'n': 0, 'score': 0.0})
+            entry['n'] += diff['n']
+            entry['score'] += diff['score']
+
+    top_categories = sorted(categories.items(), key=lambda item: -item[1])[:TOP_CATEGORIES]
+    difficulty_items = sorted(difficulties.items())
+
+    return {
+        'chart_labels': chart_labels,
+        'chart_quiz_counts': chart_quiz_counts,
+        'chart_scores': chart_scores,
+        'category_labels': [name for name, _ in top_categories],
+        'category_counts': [n for _, n in top_categories],
+        'difficulty_labels': [difficulty.capitalize() for difficulty, _ in difficulty_items],
+        'difficulty_counts': [entry['n'] for _, entry in difficulty_items],
+        'difficulty_scores': [round(entry['score'] / entry['n'], 1) for _, entry in difficulty_items],
+        'summary': {
+            'total_completed': stats.completed_count,
+            'total_30_days': total,
+            'avg_score_30_days': round(score_sum / total, 1) if total else 0,
+        },
+    }
+
+
+def chart_bundle(user, stats=None):
+    """
+    The user's chart payload, from the cache when possible.
+    Pass `stats` if the caller already loaded the UserStats row.
+    """
+    stats = stats or get_user_stats(user)
+    key = _cache_key(stats)
+    cache = _get_cache()
+
+    try:
+        bundle = cache.get(key)
+    except Exception:
+        logger.exception("Analytics cache read failed")
+        bundle = None
+    if bundle is not None:
+        return bundle
+
+    bundle = build_chart_bundle(stats)
+
+    try:
+        cache.set(key, bundle, CACHE_TTL_SECONDS)
+    except Exception:
+        logger.exception("Analytics cache write failed")
+    return bundle
+
+
+def invalidate_chart_bundle(stats):
+    """
+    Drop the cached chart payload for `stats` (call once it is committed).
+    Only needed when the numbers changed without a new completion.
+    """
+    try:
+        _get_cache().delete(_cache_key(stats))
+    except Exception:
+        logger.exception("Analytics cache delete failed")
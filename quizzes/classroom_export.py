@@ -0,0 +1,289 @@
+# quizzes/classroom_export.py
+"""
+Classroom quiz result exports (CSV / XLSX / PDF).
+
+Every format is fed by `export_rows()`, a generator that walks the quiz's
+participants with `.iterator()` and loads their answers one chunk at a
+time, so memory stays flat however large the class is. Each row holds
+the participant's summary followed by one cell per question: the option
+they picked, marked right or wrong ("B ✓", "C ✗"), or empty if unanswered.
+
+CSV is streamed to the client as rows are produced. XLSX and PDF are
+container formats that can only be sent once complete, so they are
+written row by row to a temporary file which is then streamed.
+"""
+import csv
+import tempfile
+
+from django.utils import timezone
+from django.utils.text import slugify
+from openpyxl import Workbook
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas as pdf_canvas
+
+from .models import AttemptQuestion, QuizAttempt, SharedQuizAttempt
+
+
+EXPORT_FORMATS = ('csv', 'xlsx', 'pdf')
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+}
+
+CHUNK_SIZE = 500
+
+SUMMARY_COLUMNS = [
+    'Full Name', 'Username', 'Email', 'Status', 'Score', 'Correct',
+    'Answered', 'Skipped', 'Not Attempted', 'Time Taken (s)', 'Started At', 'Completed At',
+]
+
+MARK_CORRECT = '✓'
+MARK_WRONG = '✗'
+
+# Spreadsheet apps run text starting with these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def export_filename(shared_quiz, fmt):
+    return f"{slugify(shared_quiz.title) or 'classroom-quiz'}_results.{fmt}"
+
+
+def question_count(shared_quiz):
+    return len(shared_quiz.questions or [])
+
+
+def export_header(shared_quiz):
+    return SUMMARY_COLUMNS + [f'Q{i}' for i in range(1, question_count(shared_quiz) + 1)]
+
+
+def _format_time(value):
+    return timezone.localtime(value).strftime('%Y-%m-%d %H:%M') if value else ''
+
+
+def _participants(shared_quiz):
+    return SharedQuizAttempt.objects.filter(
+        shared_quiz=shared_quiz
+    ).select_related(
+        'attempt', 'attempt__user'
+    ).only(
+        'attempt__status', 'attempt__score', 'attempt__correct_answers',
+        'attempt__total_questions', 'attempt__time_taken_seconds',
+        'attempt__started_at', 'attempt__completed_at',
+        'attempt__user__username', 'attempt__user__email', 'attempt__user__full_name',
+    ).order_by('accessed_at', 'id')
+
+
+def _answers(attempt_ids):
+    """
+    {attempt_id: {question_order: (selected_option, is_correct, status)}} for a chunk.
+    """
+    answers = {}
+    rows = AttemptQuestion.objects.filter(attempt_id__in=attempt_ids).values_list(
+        'attempt_id', 'question_order', 'selected_option', 'is_correct', 'status'
+    ).order_by()
+    for attempt_id, order, selected_option, is_correct, status in rows:
+        answers.setdefault(attempt_id, {})[order] = (selected_option, is_correct, status)
+    return answers
+
+
+def _row(attempt, answers, questions):
+    user = attempt.user
+    answered = sum(1 for selected, _, _ in answers.values() if selected)
+    skipped = sum(1 for _, _, status in answers.values() if status == AttemptQuestion.STATUS_SKIPPED)
+    completed = attempt.status == QuizAttempt.STATUS_COMPLETED
+
+    cells = []
+    for order in range(questions):
+        selected, is_correct, _ = answers.get(order, (None, None, None))
+        if not selected:
+            cells.append('')
+        else:
+            cells.append(f"{selected} {MARK_CORRECT if is_correct else MARK_WRONG}")
+
+    return [
+        user.full_name or user.username,
+        user.username,
+        user.email,
+        attempt.get_status_display(),
+        round(attempt.score or 0, 1) if completed else '',
+        attempt.correct_answers if completed else '',
+        answered,
+        skipped,
+        max((attempt.total_questions or questions) - answered - skipped, 0),
+        attempt.time_taken_seconds if completed else '',
+        _format_time(attempt.started_at),
+        _format_time(attempt.completed_at),
+    ] + cells
+
+
+def export_rows(shared_quiz, chunk_size=CHUNK_SIZE):
+    """
+    Yield one result row per participant (header not included).
+    Runs one query per chunk of participants for their answers.
+    """
+    questions = question_count(shared_quiz)
+    chunk = []
+
+    def flush():
+        answers = _answers([link.attempt_id for link in chunk])
+        for link in chunk:
+            yield _row(link.attempt, answers.get(link.attempt_id, {}), questions)
+
+    for link in _participants(shared_quiz).iterator(chunk_size=chunk_size):
+        chunk.append(link)
+        if len(chunk) >= chunk_size:
+            yield from flush()
+            chunk = []
+
+    if chunk:
+        yield from flush()
+
+
+# ------------------------------------------------------------
+# Writers
+# ------------------------------------------------------------
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+    def write(self, value):
+        return value
+
+
+def _spreadsheet_row(row):
+    """
+    Quote cells a spreadsheet would evaluate (a name like "=HYPERLINK(...)")
+    with a leading apostrophe so they are shown as text.
+    """
+    return [
+        f"'{value}" if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) else value
+        for value in row
+    ]
+
+
+def stream_csv(shared_quiz):
+    """
+    Yield the CSV export line by line (for StreamingHttpResponse).
+    """
+    writer = csv.writer(_Echo())
+    # BOM so Excel opens the file as UTF-8
+    yield '\ufeff' + writer.writerow(export_header(shared_quiz))
+    for row in export_rows(shared_quiz):
+        yield writer.writerow(_spreadsheet_row(row))
+
+
+def write_xlsx(shared_quiz, fileobj):
+    # write_only keeps only the current row in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title='Results')
+    sheet.append(export_header(shared_quiz))
+    for row in export_rows(shared_quiz):
+        sheet.append(_spreadsheet_row(row))
+    workbook.save(fileobj)
+
+
+# PDF layout: one line per participant, answers as a compact string
+PDF_PAGE = landscape(A4)
+PDF_MARGIN = 36
+PDF_LINE_HEIGHT = 14
+PDF_COLUMNS = [
+    # (header, row index or None for the answer string, x offset)
+    ('Participant', 0, 0),
+    ('Status', 3, 170),
+    ('Score', 4, 250),
+    ('Answered', 6, 295),
+    ('Time (s)', 9, 350),
+    ('Completed At', 11, 400),
+    ('Answers', None, 500),
+]
+
+
+def _answer_string(cells):
+    """
+    Uppercase = correct, lowercase = wrong, '-' = unanswered.
+    """
+    letters = []
+    for cell in cells:
+        if not cell:
+            letters.append('-')
+        elif cell.endswith(MARK_CORRECT):
+            letters.append(cell[0].upper())
+        else:
+            letters.append(cell[0].lower())
+    return ''.join(letters)
+
+
+def write_pdf(shared_quiz, fileobj):
+    """
+    Draw the export line by line with the canvas API. Platypus would build
+    and lay out a flowable for every row first; here finished pages are
+    only kept as compressed page streams until save().
+    """
+    width, height = PDF_PAGE
+    pdf = pdf_canvas.Canvas(fileobj, pagesize=PDF_PAGE)
+    answers_width = width - PDF_MARGIN - (PDF_MARGIN + PDF_COLUMNS[-1][2])
+    answers_chars = max(int(answers_width / pdf.stringWidth('M', 'Courier', 8)), 1)
+    summary_count = len(SUMMARY_COLUMNS)
+
+    def start_page():
+        pdf.setFont('Helvetica-Bold', 12)
+        pdf.drawString(PDF_MARGIN, height - PDF_MARGIN, f"{shared_quiz.title} – Results")
+        pdf.setFont('Helvetica', 8)
+        pdf.setFillColor(colors.grey)
+        pdf.drawString(
+            PDF_MARGIN, height - PDF_MARGIN - 14,
+            "Answers: uppercase = correct, lowercase = wrong, - = unanswered"
+        )
+        pdf.drawRightString(width - PDF_MARGIN, PDF_MARGIN / 2, f"Page {pdf.getPageNumber()}")
+        pdf.setFillColor(colors.black)
+        pdf.setFont('Helvetica-Bold', 9)
+        y = height - PDF_MARGIN - 36
+        for header, _, x in PDF_COLUMNS:
+            pdf.drawString(PDF_MARGIN + x, y, header)
+        pdf.line(PDF_MARGIN, y - 4, width - PDF_MARGIN, y - 4)
+        return y - PDF_LINE_HEIGHT - 2
+
+    y = start_page()
+    for row in export_rows(shared_quiz):
+        answers = _answer_string(row[summary_count:])
+        # Long quizzes wrap the answer string onto extra lines
+        answer_lines = [
+            answers[i:i + answers_chars] for i in range(0, len(answers), answers_chars)
+        ] or ['']
+
+        if y - PDF_LINE_HEIGHT * (len(answer_lines) - 1) < PDF_MARGIN:
+            pdf.showPage()
+            y = start_page()
+
+        pdf.setFont('Helvetica', 8)
+        for _, index, x in PDF_COLUMNS[:-1]:
+            value = str(row[index])
+            if index == 0:
+                value = value[:32]
+            pdf.drawString(PDF_MARGIN + x, y, value)
+
+        pdf.setFont('Courier', 8)
+        for line in answer_lines:
+            pdf.drawString(PDF_MARGIN + PDF_COLUMNS[-1][2], y, line)
+            y -= PDF_LINE_HEIGHT
+
+    pdf.save()
+
+
+def write_export(shared_quiz, fmt):
+    """
+    Write an XLSX or PDF export to a temporary file, rewound for reading.
+    """
+    tmp = tempfile.TemporaryFile()
+    try:
+        if fmt == 'xlsx':
+            write_xlsx(shared_quiz, tmp)
+        else:
+            write_pdf(shared_quiz, tmp)
+        tmp.seek(0)
+    except Exception:
+        tmp.close()
+        raise
+    return tmp
@@ -0,0 +1,172 @@
+# quizzes/classroom_live.py
+"""
+Live classroom results (server-sent events).
+
+Views call `publish()` when a shared-quiz participant joins, answers,
+completes or quits. That inserts one small ClassroomEvent row, in the
+same transaction as the change, so the feed works across processes with
+no extra infrastructure.
+
+`event_stream()` feeds the results page's EventSource as a long poll.
+It polls for events newer than the last one it sent (one indexed query
+per second). When there are any, it re-renders just the changed
+participants' rows, sends the running totals and ends; otherwise it ends
+after STREAM_SECONDS. Either way the browser reconnects with
+Last-Event-ID and resumes where it stopped, so a dashboard never holds
+a worker thread (and its database connection) for long. At most
+CLASSROOM_LIVE_MAX_STREAMS streams per quiz run at once in a process;
+extra dashboards are told to come back later.
+"""
+import json
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .classroom_results import participant_summary, participants_for_attempts
+from .models import ClassroomEvent
+
+
+POLL_SECONDS = 1
+HEARTBEAT_SECONDS = 15
+STREAM_SECONDS = 25
+# Browser reconnect delay after a stream ends
+RETRY_MILLISECONDS = 2000
+# Reconnect delay for a dashboard turned away by the stream cap
+BUSY_RETRY_MILLISECONDS = 10000
+BATCH_SIZE = 200
+MAX_STREAMS_PER_QUIZ = getattr(settings, 'CLASSROOM_LIVE_MAX_STREAMS', 5)
+
+# shared_quiz_id -> streams open in this process
+_open_streams = {}
+_open_streams_lock = threading.Lock()
+
+EVENT_RETENTION = timedelta(days=2)
+
+
+def shared_quiz_id_of(quiz_attempt):
+    """
+    The SharedQuiz id an attempt was started from, or None (no query).
+    """
+    meta = quiz_attempt.ai_meta or {}
+    if meta.get('source') == 'shared_quiz':
+        return meta.get('shared_quiz_id')
+    return None
+
+
+def publish(quiz_attempt, kind):
+    """
+    Record a change to a shared-quiz participant; no-op for other attempts.
+    """
+    shared_quiz_id = shared_quiz_id_of(quiz_attempt)
+    if shared_quiz_id:
+        ClassroomEvent.objects.create(
+            shared_quiz_id=shared_quiz_id,
+            attempt_id=quiz_attempt.id,
+            kind=kind
+        )
+
+
+def prune_events(older_than=EVENT_RETENTION):
+    """
+    Delete events older than `older_than`. Returns the number deleted.
+    """
+    cutoff = timezone.now() - older_than
+    deleted, _ = ClassroomEvent.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+def latest_event_id(shared_quiz):
+    return ClassroomEvent.objects.filter(
+        shared_quiz=shared_quiz
+    ).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def _sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _acquire_stream(shared_quiz_id):
+    with _open_streams_lock:
+        if _open_streams.get(shared_quiz_id, 0) >= MAX_STREAMS_PER_QUIZ:
+            return False
+        _open_streams[shared_quiz_id] = _open_streams.get(shared_quiz_id, 0) + 1
+        return True
+
+
+def _release_stream(shared_quiz_id):
+    with _open_streams_lock:
+        _open_streams[shared_quiz_id] -= 1
+        if not _open_streams[shared_quiz_id]:
+            del _open_streams[shared_quiz_id]
+
+
+def event_stream(shared_quiz, last_event_id=None):
+    """
+    Yield SSE messages for the quiz: "participant" ({attempt_id, status_code,
+    html}) per changed participant and "summary" (participant_summary)
+    after each batch. Starts from now, with a summary, unless resuming
+    from `last_event_id`. Ends after the first batch or STREAM_SECONDS.
+    """
+    if not _acquire_stream(shared_quiz.id):
+        yield f"retry: {BUSY_RETRY_MILLISECONDS}\n\n"
+        return
+
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+
+        if last_event_id is None:
+            last_id = latest_event_id(shared_quiz)
+            yield _sse('summary', participant_summary(shared_quiz), last_id)
+        else:
+            last_id = last_event_id
+
+        yield from _poll_events(shared_quiz, last_id)
+    finally:
+        _release_stream(shared_quiz.id)
+
+
+def _poll_events(shared_quiz, last_id):
+    deadline = time.monotonic() + STREAM_SECONDS
+    last_sent = time.monotonic()
+
+    while time.monotonic() < deadline:
+        events = list(
+            ClassroomEvent.objects.filter(
+                shared_quiz=shared_quiz,
+                id__gt=last_id
+            ).order_by('id').values_list('id', 'attempt_id')[:BATCH_SIZE]
+        )
+
+        if events:
+            last_id = events[-1][0]
+            attempt_ids = list(dict.fromkeys(attempt_id for _, attempt_id in events))
+
+            for p in participants_for_attempts(shared_quiz, attempt_ids):
+                yield _sse('participant', {
+                    'attempt_id': str(p['attempt_id']),
+                    'status_code': p['status_code'],
+                    'html': render_to_string('quizzes/classroom_participant_row.html', {'p': p}),
+                }, last_id)
+
+            # A full batch means more are waiting
+            if len(events) == BATCH_SIZE:
+                continue
+
+            yield _sse('summary', participant_summary(shared_quiz), last_id)
+            return
+
+        if time.monotonic() - last_sent >= HEARTBEAT_SECONDS:
+            # Comment line keeps proxies from closing an idle connection
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+
+        time.sleep(POLL_SECONDS)
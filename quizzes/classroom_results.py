@@ -0,0 +1,220 @@
+# quizzes/classroom_results.py
+"""
+Classroom quiz results, aggregated in the database.
+
+The results page used to load every participant with their full attempt
+JSON and total them in Python. Here:
+  - `participant_summary()`  participant / completion counts and average
+                             score in one aggregate query
+  - `question_stats()`       per-question item statistics (percent
+                             correct, how often each option was picked,
+                             average time to answer) from two GROUP BY
+                             queries over AttemptQuestion
+  - `participant_page()`     one page of participants, with answered and
+                             skipped counts for just that page
+  - `participants_for_attempts()`  the same rows for chosen attempts
+                             (used by the live stream)
+"""
+from django.core.paginator import Paginator
+from django.db.models import Avg, Count, F, FloatField, Func, Q
+
+from .models import AttemptQuestion, QuizAttempt, SharedQuizAttempt
+
+
+PARTICIPANTS_PAGE_SIZE = 25
+
+OPTION_LETTERS = ('A', 'B', 'C', 'D')
+
+
+class SecondsBetween(Func):
+    """
+    Seconds from the second datetime expression to the first, in native
+    SQL (SQLite would otherwise subtract datetimes in a Python function
+    called once per row).
+    """
+    arity = 2
+    output_field = FloatField()
+    template = 'EXTRACT(EPOCH FROM (%(expressions)s))'
+    arg_joiner = ' - '
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='((julianday(%(expressions)s)) * 86400.0)',
+            arg_joiner=') - julianday(',
+            **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        end, start = self.source_expressions
+        return Func(
+            start, end, function='TIMESTAMPDIFF', template='(%(function)s(MICROSECOND, %(expressions)s) / 1000000.0)'
+        ).as_sql(compiler, connection, **extra_context)
+
+
+def participant_summary(shared_quiz):
+    """
+    {'total', 'completed', 'in_progress', 'avg_score'} for a shared quiz.
+    """
+    completed = Q(attempt__status=QuizAttempt.STATUS_COMPLETED)
+    summary = SharedQuizAttempt.objects.filter(shared_quiz=shared_quiz).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=completed),
+        in_progress=Count('id', filter=Q(attempt__status=QuizAttempt.STATUS_IN_PROGRESS)),
+        avg_score=Avg('attempt__score', filter=completed),
+    )
+    summary['avg_score'] = round(summary['avg_score'] or 0, 1)
+    return summary
+
+
+def question_stats(shared_quiz):
+    """
+    One entry per question of the quiz:
+    {'number', 'question', 'correct_answer', 'responses', 'correct',
+     'percent_correct', 'skipped', 'avg_time', 'options': [{'letter',
+     'text', 'count', 'percent', 'is_correct'}]}.
+    `avg_time` is the mean seconds from first showing the question to the
+    answer, or None.
+    """
+    answers = AttemptQuestion.objects.filter(
+        attempt__shared_quiz_link__shared_quiz=shared_quiz
+    ).order_by()
+
+    per_question = {
+        row['question_order']: row
+        for row in answers.values('question_order').annotate(
+            responses=Count('id', filter=Q(selected_option__isnull=False)),
+            correct=Count('id', filter=Q(is_correct=True)),
+            skipped=Count('id', filter=Q(status=AttemptQuestion.STATUS_SKIPPED)),
+            avg_time=Avg(
+                SecondsBetween(F('answered_at'), F('visited_at')),
+                filter=Q(
+                    selected_option__isnull=False,
+                    answered_at__isnull=False,
+                    visited_at__isnull=False
+                )
+            ),
+        )
+    }
+
+    picks = {}
+    for order, option, n in answers.filter(
+        selected_option__isnull=False
+    ).values_list('question_order', 'selected_option').annotate(n=Count('id')):
+        picks.setdefault(order, {})[option.upper()] = n
+
+    stats = []
+    for order, question in enumerate(shared_quiz.questions or []):
+        row = per_question.get(order, {})
+        responses = row.get('responses', 0)
+        correct_answer = (question.get('correct_answer') or '').upper()
+        avg_time = row.get('avg_time')
+        option_picks = picks.get(order, {})
+
+        stats.append({
+            'number': order + 1,
+            'question': question.get('question', ''),
+            'correct_answer': correct_answer,
+            'responses': responses,
+            'correct': row.get('correct', 0),
+            'percent_correct': round(row.get('correct', 0) * 100 / responses, 1) if responses else None,
+            'skipped': row.get('skipped', 0),
+            'avg_time': round(avg_time, 1) if avg_time is not None else None,
+            'options': [
+                {
+                    'letter': letter,
+                    'text': question.get(f'option_{letter.lower()}', ''),
+                    'count': option_picks.get(letter, 0),
+                    'percent': round(option_picks.get(letter, 0) * 100 / responses, 1) if responses else 0,
+                    'is_correct': letter == correct_answer,
+                }
+                for letter in OPTION_LETTERS
+            ],
+        })
+    return stats
+
+
+def _participant_links(shared_quiz):
+    return SharedQuizAttempt.objects.filter(
+        shared_quiz=shared_quiz
+    ).select_related(
+        'attempt', 'attempt__user'
+    ).only(
+        'attempt__status', 'attempt__score', 'attempt__correct_answers',
+        'attempt__total_questions', 'attempt__time_taken_seconds',
+        'attempt__started_at', 'attempt__completed_at',
+        'attempt__user__username', 'attempt__user__email', 'attempt__user__full_name',
+        'attempt__user__avatar_path', 'attempt__user__date_joined',
+    )
+
+
+def _participant_rows(links):
+    """
+    Template rows for a list of SharedQuizAttempt links (one extra query
+    for their answered / skipped counts).
+    """
+    counts = {
+        row['attempt_id']: row
+        for row in AttemptQuestion.objects.filter(
+            attempt_id__in=[link.attempt_id for link in links]
+        ).order_by().values('attempt_id').annotate(
+            answered=Count('id', filter=Q(selected_option__isnull=False)),
+            skipped=Count('id', filter=Q(status=AttemptQuestion.STATUS_SKIPPED)),
+        )
+    } if links else {}
+
+    participants = []
+    for link in links:
+        attempt = link.attempt
+        user = attempt.user
+        answered = counts.get(attempt.id, {}).get('answered', 0)
+        skipped = counts.get(attempt.id, {}).get('skipped', 0)
+
+        participants.append({
+            'user': user,
+            'username': user.username,
+            'email': user.email,
+            'full_name': user.full_name or user.username,  # Fallback to username if no full_name
+            'avatar': user.avatar_path.url if user.avatar_path else None,
+            'date_joined': user.date_joined,
+            'score': attempt.score if attempt.status == QuizAttempt.STATUS_COMPLETED else None,
+            'correct_answers': attempt.correct_answers,
+            'status': attempt.get_status_display(),
+            'status_code': attempt.status,
+            'answered': answered,
+            'skipped': skipped,
+            'not_attempted': max((attempt.total_questions or 0) - answered - skipped, 0),
+            'completed_at': attempt.completed_at,
+            'started_at': attempt.started_at,
+            'time_taken': attempt.time_taken_seconds,
+            'attempt_id': attempt.id,
+        })
+
+    return participants
+
+
+def participant_page(shared_quiz, page_number=None, search=''):
+    """
+    (page_obj, participants) for one page of the quiz's participants,
+    most recently completed first. `search` matches name, username or email.
+    """
+    links = _participant_links(shared_quiz).order_by('-attempt__completed_at', '-id')
+
+    if search:
+        links = links.filter(
+            Q(attempt__user__username__icontains=search)
+            | Q(attempt__user__email__icontains=search)
+            | Q(attempt__user__full_name__icontains=search)
+        )
+
+    page_obj = Paginator(links, PARTICIPANTS_PAGE_SIZE).get_page(page_number)
+    return page_obj, _participant_rows(list(page_obj))
+
+
+def participants_for_attempts(shared_quiz, attempt_ids):
+    """
+    Current template rows for the given attempts of the quiz.
+    """
+    return _participant_rows(list(
+        _participant_links(shared_quiz).filter(attempt_id__in=attempt_ids)
+    ))
@@ -0,0 +1,84 @@
+# quizzes/document_cache.py
+"""
+Uploaded documents, cached by content.
+
+Teachers upload the same PDF/DOCX to the AI generator again and again
+(retries, another difficulty, a colleague with the same handout). Each
+upload used to be parsed and sent to OpenAI from scratch. Uploads are
+identified by the SHA-256 of their bytes, whatever the file is called:
+  - `document_text()`       the extracted text, cached per document and
+                            character budget
+  - `document_questions()`  the generated questions, cached per
+                            (document, difficulty, question count)
+Both live in the "documents" cache for DOCUMENT_CACHE_TTL, so a repeat
+upload is answered without parsing the file or calling OpenAI.
+"""
+import hashlib
+import logging
+
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+from .utils.file_parser import extract_text_from_file
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'documents'
+
+
+def _get_cache():
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def _cached(key, compute):
+    try:
+        value = _get_cache().get(key)
+    except Exception:
+        logger.exception("Document cache read failed")
+        value = None
+    if value is not None:
+        return value
+
+    value = compute()
+    try:
+        _get_cache().set(key, value)
+    except Exception:
+        logger.exception("Document cache write failed")
+    return value
+
+
+def file_digest(uploaded_file):
+    """
+    SHA-256 of the upload's bytes (read in chunks, file rewound after).
+    """
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def document_text(uploaded_file, max_chars=None):
+    """
+    (digest, text) for an upload; see extract_text_from_file for `max_chars`.
+    """
+    digest = file_digest(uploaded_file)
+    # The extension picks the parser, so it is part of the key
+    extension = uploaded_file.name.rsplit('.', 1)[-1].lower()
+    text = _cached(
+        f"document:text:{digest}:{extension}:{max_chars}",
+        lambda: extract_text_from_file(uploaded_file, max_chars=max_chars)
+    )
+    return digest, text
+
+
+def document_questions(digest, difficulty, count, generate):
+    """
+    Questions generated from the document `digest`; `generate()` is only
+    called when none are cached for this difficulty and count.
+    """
+    return _cached(f"document:questions:{digest}:{difficulty}:{count}", generate)
@@ -0,0 +1,64 @@
+# quizzes/feedback.py
+"""
+Performance summary for a finished attempt.
+
+Shared by the results page (strong/weak areas) and the background job that
+asks OpenAI for learning feedback (see tasks.generate_feedback_job), so
+both describe the attempt the same way.
+"""
+
+
+def attempt_topic(quiz_attempt):
+    """
+    Display topic of an attempt (AI quizzes have no subcategory).
+    """
+    if quiz_attempt.subcategory:
+        return quiz_attempt.subcategory.name
+    return (quiz_attempt.ai_meta or {}).get('topic', 'General')
+
+
+def performance_areas(quiz_attempt, answered_questions):
+    """
+    Split the attempt's topics into (strong_areas, weak_areas), top 3 each.
+    `answered_questions` is QuizAttempt.answered_questions().
+    """
+    default_topic = attempt_topic(quiz_attempt)
+    strong_areas = []
+    weak_areas = []
+
+    for q in answered_questions:
+        topic = q.get('topic', default_topic)
+        if q.get('is_correct'):
+            if topic not in strong_areas:
+                strong_areas.append(topic)
+        else:
+            if topic not in weak_areas:
+                weak_areas.append(topic)
+
+    # Remove overlaps - if in both, keep in weak
+    strong_areas = [a for a in strong_areas if a not in weak_areas]
+
+    return strong_areas[:3], weak_areas[:3]
+
+
+def feedback_summary(quiz_attempt, answered_questions=None):
+    """
+    The performance data sent to generate_ai_feedback.
+    """
+    if answered_questions is None:
+        answered_questions = quiz_attempt.answered_questions()
+
+    total = len(answered_questions)
+    correct = sum(1 for q in answered_questions if q['is_correct'])
+    strong_areas, weak_areas = performance_areas(quiz_attempt, answered_questions)
+
+    return {
+        "subcategory": attempt_topic(quiz_attempt),
+        "category": quiz_attempt.category.name if quiz_attempt.category else "General",
+        "difficulty": quiz_attempt.difficulty,
+        "score": round((correct * 100) / total, 2) if total else 0,
+        "correct": correct,
+        "total": total,
+        "strong_areas": strong_areas,
+        "weak_areas": weak_areas,
+    }
@@ -0,0 +1,198 @@
+# quizzes/jobs.py
+"""
+Minimal DB-backed background job queue.
+
+Jobs are rows in `BackgroundJob`. Views call `enqueue()`, and one or more
+`python manage.py run_jobs` worker processes claim queued rows and run the
+handler registered for the job's kind (see quizzes/tasks.py).
+
+Claiming uses a conditional UPDATE on the job status, so any number of
+workers can poll the same table without picking up the same job twice.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# kind -> callable(payload)
+JOB_HANDLERS = {}
+
+# A RUNNING job whose lock is older than this is assumed to belong to a dead worker
+JOB_LOCK_TIMEOUT_SECONDS = getattr(settings, "BACKGROUND_JOBS_LOCK_TIMEOUT", 600)
+RETRY_BACKOFF_SECONDS = 30
+
+
+def job_handler(kind):
+    """
+    Register a function as the handler for jobs of the given kind.
+    """
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload=None, dedupe_key=None, max_attempts=1, delay_seconds=0):
+    """
+    Add a job to the queue and return it.
+
+    If `dedupe_key` is given and a job with that key is already queued or
+    running, that job is returned instead of creating a new one.
+    When BACKGROUND_JOBS_EAGER is enabled the job is run in-process
+    right after the surrounding transaction commits (handy for local dev).
+    """
+    fields = {
+        "kind": kind,
+        "payload": payload or {},
+        "max_attempts": max_attempts,
+        "run_after": timezone.now() + timedelta(seconds=delay_seconds),
+    }
+
+    if dedupe_key:
+        try:
+            with transaction.atomic():
+                job, created = BackgroundJob.objects.get_or_create(
+                    dedupe_key=dedupe_key,
+                    defaults=fields
+                )
+        except IntegrityError:
+            # Lost a race with another request enqueueing the same key
+            job, created = BackgroundJob.objects.get(dedupe_key=dedupe_key), False
+
+        # A finished job with the same key is recycled rather than duplicated
+        if not created and job.status in (BackgroundJob.STATUS_DONE, BackgroundJob.STATUS_FAILED):
+            created = BackgroundJob.objects.filter(
+                pk=job.pk,
+                status=job.status
+            ).update(status=BackgroundJob.STATUS_QUEUED, attempts=0, error="", finished_at=None, **fields) > 0
+            job.refresh_from_db()
+    else:
+        job, created = BackgroundJob.objects.create(**fields), True
+
+    if created and getattr(settings, "BACKGROUND_JOBS_EAGER", False):
+        transaction.on_commit(lambda: _run_eager(job.pk))
+
+    return job
+
+
+def _run_eager(job_id):
+    job = claim_job(job_id)
+    if job:
+        run_job(job)
+
+
+def claim_job(job_id):
+    """
+    Atomically mark a claimable job as RUNNING.
+    Returns the refreshed job, or None if another worker got it first.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+
+    claimed = BackgroundJob.objects.filter(
+        Q(status=BackgroundJob.STATUS_QUEUED, run_after__lte=now) |
+        Q(status=BackgroundJob.STATUS_RUNNING, locked_at__lt=stale_before),
+        pk=job_id
+    ).update(
+        status=BackgroundJob.STATUS_RUNNING,
+        locked_at=now,
+        attempts=F("attempts") + 1,
+        updated_at=now
+    )
+
+    if not claimed:
+        return None
+    return BackgroundJob.objects.get(pk=job_id)
+
+
+def claim_next_job(kinds=None):
+    """
+    Claim the oldest runnable job, optionally restricted to some kinds.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+
+    candidates = BackgroundJob.objects.filter(
+        Q(status=BackgroundJob.STATUS_QUEUED, run_after__lte=now) |
+        Q(status=BackgroundJob.STATUS_RUNNING, locked_at__lt=stale_before)
+    )
+    if kinds:
+        candidates = candidates.filter(kind__in=kinds)
+
+    # Try a few candidates in case other workers win the race for the first ones
+    for job_id in candidates.order_by("run_after", "id").values_list("id", flat=True)[:5]:
+        job = claim_job(job_id)
+        if job:
+            return job
+    return None
+
+
+def run_job(job):
+    """
+    Execute a claimed job and record the outcome.
+    Failed jobs are re-queued with a backoff until max_attempts is reached.
+    """
+    handler = JOB_HANDLERS.get(job.kind)
+    now = timezone.now()
+
+    if handler is None:
+        job.status = BackgroundJob.STATUS_FAILED
+        job.error = f"No handler registered for job kind '{job.kind}'"
+        job.finished_at = now
+        job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return job
+
+    try:
+        handler(job.payload)
+    except Exception as e:
+        logger.exception("Background job %s failed", job)
+        job.error = str(e)
+        if job.attempts < job.max_attempts:
+            job.status = BackgroundJob.STATUS_QUEUED
+            job.run_after = timezone.now() + timedelta(seconds=RETRY_BACKOFF_SECONDS * job.attempts)
+            job.save(update_fields=["status", "error", "run_after", "updated_at"])
+        else:
+            job.status = BackgroundJob.STATUS_FAILED
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return job
+
+    job.status = BackgroundJob.STATUS_DONE
+    job.error = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+    return job
+
+
+def work(kinds=None, once=False, sleep_seconds=1.0, stop_after=None):
+    """
+    Worker loop used by the run_jobs management command.
+    Returns the number of jobs processed.
+    """
+    processed = 0
+
+    while True:
+        close_old_connections()
+        job = claim_next_job(kinds)
+
+        if job is None:
+            if once:
+                break
+            time.sleep(sleep_seconds)
+            continue
+
+        run_job(job)
+        processed += 1
+
+        if stop_after and processed >= stop_after:
+            break
+
+    return processed
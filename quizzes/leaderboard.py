@@ -0,0 +1,143 @@
+# quizzes/leaderboard.py
+"""
+Incrementally maintained leaderboards.
+
+Each completed attempt adds its score to one LeaderboardEntry per board
+it belongs to (`record_score`, called from finalize_quiz_attempt):
+  - "all"                   all-time
+  - "week:2026-W07"         ISO week of completion (TIME_ZONE)
+  - "cat:<category id>"     per category
+  - "diff:<difficulty>"     per difficulty
+
+Entries keep quizzes / score_sum / avg_score, indexed by
+(board, -avg_score, -quizzes), so a page of the board and a user's rank
+are index reads instead of a GROUP BY over every attempt.
+`rebuild_leaderboards()` recomputes every board from history.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import LeaderboardEntry, QuizAttempt
+
+
+BOARD_ALL = 'all'
+
+BOARD_ORDERING = ('-avg_score', '-quizzes', 'user_id')
+
+
+def week_board(day=None):
+    """
+    Board key for the ISO week containing `day` (default: today).
+    """
+    year, week, _ = (day or timezone.localdate()).isocalendar()
+    return f'week:{year}-W{week:02d}'
+
+
+def category_board(category_id):
+    return f'cat:{category_id}'
+
+
+def difficulty_board(difficulty):
+    return f'diff:{difficulty}'
+
+
+def attempt_boards(quiz_attempt):
+    """
+    Every board a completed attempt counts towards.
+    """
+    boards = [BOARD_ALL, difficulty_board(quiz_attempt.difficulty)]
+    if quiz_attempt.completed_at:
+        boards.append(week_board(timezone.localdate(quiz_attempt.completed_at)))
+    if quiz_attempt.category_id:
+        boards.append(category_board(quiz_attempt.category_id))
+    return boards
+
+
+def _add_score(board, user_id, score):
+    entry = LeaderboardEntry.objects.filter(board=board, user_id=user_id)
+    updated = entry.update(
+        quizzes=F('quizzes') + 1,
+        score_sum=F('score_sum') + score,
+        updated_at=timezone.now()
+    )
+    if updated:
+        # Separate statement: MySQL evaluates SET assignments left to right
+        entry.update(avg_score=F('score_sum') / F('quizzes'))
+        return
+
+    try:
+        with transaction.atomic():
+            LeaderboardEntry.objects.create(
+                board=board, user_id=user_id, quizzes=1, score_sum=score, avg_score=score
+            )
+    except IntegrityError:
+        # Another completion created the row first
+        _add_score(board, user_id, score)
+
+
+def record_score(quiz_attempt):
+    """
+    Add a just-completed attempt to its boards. Call once per attempt,
+    inside the transaction that marks it completed.
+    """
+    score = float(quiz_attempt.score or 0)
+    with transaction.atomic():
+        for board in attempt_boards(quiz_attempt):
+            _add_score(board, quiz_attempt.user_id, score)
+
+
+def board_entries(board):
+    """
+    The board's entries in rank order (paginate this).
+    """
+    return LeaderboardEntry.objects.filter(board=board).select_related('user').order_by(*BOARD_ORDERING)
+
+
+def user_rank(board, user):
+    """
+    (entry, rank) for the user on a board, or (None, None) if not on it.
+    Rank follows board_entries ordering (two queries on the board index).
+    """
+    entry = LeaderboardEntry.objects.filter(board=board, user=user).first()
+    if entry is None:
+        return None, None
+
+    ahead = LeaderboardEntry.objects.filter(board=board).filter(
+        Q(avg_score__gt=entry.avg_score)
+        | Q(avg_score=entry.avg_score, quizzes__gt=entry.quizzes)
+        | Q(avg_score=entry.avg_score, quizzes=entry.quizzes, user_id__lt=entry.user_id)
+    ).count()
+    return entry, ahead + 1
+
+
+def rebuild_leaderboards():
+    """
+    Recompute every board from completed attempts. Returns the number of
+    entries. Completions that land while it runs can be missed, so run it
+    when traffic is low.
+    """
+    totals = {}
+    completed = QuizAttempt.objects.filter(
+        status=QuizAttempt.STATUS_COMPLETED
+    ).only('user_id', 'category_id', 'difficulty', 'score', 'completed_at').order_by()
+
+    for quiz_attempt in completed.iterator(chunk_size=2000):
+        for board in attempt_boards(quiz_attempt):
+            entry = totals.setdefault((board, quiz_attempt.user_id), [0, 0.0])
+            entry[0] += 1
+            entry[1] += float(quiz_attempt.score or 0)
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(
+            [
+                LeaderboardEntry(
+                    board=board, user_id=user_id,
+                    quizzes=quizzes, score_sum=score_sum, avg_score=score_sum / quizzes
+                )
+                for (board, user_id), (quizzes, score_sum) in totals.items()
+            ],
+            batch_size=2000
+        )
+    return len(totals)
@@ -0,0 +1,281 @@
+# quizzes/llm_client.py
+"""
+Shared OpenAI chat-completions client.
+
+Every AI call (question generation, feedback) goes through
+`chat_completion()`, which:
+  - reuses one pooled requests.Session, so calls share keep-alive
+    connections instead of doing a fresh TCP+TLS handshake each time
+  - retries 429/5xx responses and connection errors with jittered
+    exponential backoff (honouring Retry-After when OpenAI sends it)
+  - logs latency and token usage per call and keeps running totals
+    (see `get_stats()`)
+  - optionally caches results by a hash of model + messages +
+    temperature + max_tokens in the "llm" cache (TTL, LRU eviction), so
+    an identical prompt is answered without calling OpenAI
+
+Point OPENAI_API_BASE at a local stub server to exercise it without
+calling OpenAI.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+OPENAI_API_BASE = getattr(settings, 'OPENAI_API_BASE', 'https://api.openai.com/v1')
+# (connect, read) timeouts in seconds
+CONNECT_TIMEOUT = getattr(settings, 'OPENAI_CONNECT_TIMEOUT', 5)
+READ_TIMEOUT = getattr(settings, 'OPENAI_READ_TIMEOUT', 60)
+MAX_RETRIES = getattr(settings, 'OPENAI_MAX_RETRIES', 3)
+BACKOFF_BASE_SECONDS = getattr(settings, 'OPENAI_BACKOFF_BASE', 0.5)
+BACKOFF_MAX_SECONDS = getattr(settings, 'OPENAI_BACKOFF_MAX', 8)
+POOL_SIZE = getattr(settings, 'OPENAI_POOL_SIZE', 10)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+CACHE_ALIAS = 'llm'
+CACHE_TTL_SECONDS = getattr(settings, 'OPENAI_CACHE_TTL', 60 * 60 * 24)
+
+
+class LLMError(Exception):
+    """
+    An OpenAI call failed (after retries, where retrying made sense).
+    `status_code` is the last HTTP status, or None for network errors.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats = {
+    'calls': 0,
+    'errors': 0,
+    'retries': 0,
+    'latency_ms': 0.0,
+    'prompt_tokens': 0,
+    'completion_tokens': 0,
+    'cache_hits': 0,
+    'cache_misses': 0,
+}
+_stats_lock = threading.Lock()
+
+
+def get_session():
+    """
+    The process-wide pooled session (created on first use).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def get_stats():
+    """
+    Running totals for this process: calls, errors, retries, latency,
+    tokens and cache hits/misses.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record(latency_ms, usage=None, retries=0, error=False):
+    with _stats_lock:
+        _stats['calls'] += 1
+        _stats['retries'] += retries
+        _stats['latency_ms'] += latency_ms
+        if error:
+            _stats['errors'] += 1
+        if usage:
+            _stats['prompt_tokens'] += usage.get('prompt_tokens', 0)
+            _stats['completion_tokens'] += usage.get('completion_tokens', 0)
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _get_cache():
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def cache_key(model, messages, temperature, max_tokens=None):
+    """
+    Content-addressed key for one request.
+    """
+    raw = json.dumps(
+        {
+            'model': model,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+        },
+        sort_keys=True
+    )
+    return 'llm:' + hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _backoff_seconds(attempt, response=None):
+    """
+    Full-jitter exponential backoff, or the server's Retry-After if given.
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def _error_for_status(status_code):
+    if status_code == 401:
+        return LLMError("Invalid OpenAI API key. Please check your OPENAI_API_KEY in .env file.", status_code)
+    if status_code == 429:
+        return LLMError("OpenAI API rate limit exceeded. Please wait a moment and try again.", status_code)
+    if status_code >= 500:
+        return LLMError(f"OpenAI server error ({status_code}). Please try again later.", status_code)
+    return LLMError(f"OpenAI API request failed with status {status_code}.", status_code)
+
+
+def chat_completion(messages, model=DEFAULT_MODEL, temperature=0.7, max_tokens=None,
+                    read_timeout=None, purpose="chat", parse=None, cache=False):
+    """
+    Send one chat-completions request and return the message content,
+    or `parse(content)` if a parser is given. Raises LLMError when the
+    call fails; errors raised by `parse` propagate.
+
+    With cache=True the parsed result is stored under `cache_key()` and
+    identical requests are answered from the cache. Only results that
+    parsed successfully are cached.
+    """
+    key = None
+    if cache:
+        key = cache_key(model, messages, temperature, max_tokens)
+        try:
+            cached = _get_cache().get(key)
+        except Exception:
+            logger.exception("LLM cache read failed")
+            cached = None
+
+        if cached is not None:
+            _count('cache_hits')
+            logger.info("OpenAI %s call served from cache", purpose)
+            return cached
+        _count('cache_misses')
+
+    content = _request(messages, model, temperature, max_tokens, read_timeout, purpose)
+    result = parse(content) if parse else content
+
+    if key is not None:
+        try:
+            _get_cache().set(key, result, CACHE_TTL_SECONDS)
+        except Exception:
+            logger.exception("LLM cache write failed")
+
+    return result
+
+
+def _request(messages, model, temperature, max_tokens, read_timeout, purpose):
+    """
+    POST to the chat-completions endpoint with retries; returns the content.
+    """
+    api_key = getattr(settings, 'OPENAI_API_KEY', None) or os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        raise LLMError("OPENAI_API_KEY not configured. Please set it in your .env file.")
+
+    body = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+    }
+    if max_tokens:
+        body["max_tokens"] = max_tokens
+
+    timeout = (CONNECT_TIMEOUT, read_timeout or READ_TIMEOUT)
+    session = get_session()
+    start = time.perf_counter()
+    retries = 0
+
+    for attempt in range(MAX_RETRIES + 1):
+        response = None
+        retryable = True
+        try:
+            response = session.post(
+                f"{OPENAI_API_BASE}/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json",
+                },
+                json=body,
+                timeout=timeout
+            )
+        except requests.exceptions.Timeout:
+            error = LLMError("OpenAI API request timed out. Please try again.")
+        except requests.exceptions.RequestException as e:
+            error = LLMError(f"OpenAI API request failed: {str(e)}")
+        else:
+            if response.status_code < 400:
+                break
+            error = _error_for_status(response.status_code)
+            retryable = response.status_code in RETRY_STATUS_CODES
+
+        if not retryable or attempt >= MAX_RETRIES:
+            latency_ms = (time.perf_counter() - start) * 1000
+            _record(latency_ms, retries=retries, error=True)
+            logger.warning(
+                "OpenAI %s call failed after %d attempt(s) in %.0fms: %s",
+                purpose, attempt + 1, latency_ms, error
+            )
+            raise error
+
+        retries += 1
+        time.sleep(_backoff_seconds(attempt, response))
+
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    try:
+        data = response.json()
+        content = data["choices"][0]["message"]["content"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        _record(latency_ms, retries=retries, error=True)
+        raise LLMError("OpenAI API returned an unexpected response.", response.status_code)
+
+    usage = data.get("usage") or {}
+    _record(latency_ms, usage=usage, retries=retries)
+    logger.info(
+        "OpenAI %s call: %.0fms, %d retries, %s prompt + %s completion tokens",
+        purpose, latency_ms, retries,
+        usage.get("prompt_tokens", "?"), usage.get("completion_tokens", "?")
+    )
+
+    return content
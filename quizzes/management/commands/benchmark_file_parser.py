@@ -0,0 +1,111 @@
+# quizzes/management/commands/benchmark_file_parser.py
+"""
+Django management command to benchmark document text extraction.
+
+Builds text-heavy PDF fixtures (10, 100 and 1000 pages by default) with
+reportlab and times, for each:
+  - the previous extractor (every page, text += page). It keeps every
+    parsed page in memory, so it only runs up to --previous-max-pages
+    (a 1000-page fixture exhausted 6 GB)
+  - extract_pdf_text with the AI generator's 8000 character budget
+  - extract_pdf_text over the whole document, in process and with a
+    process pool
+    python manage.py benchmark_file_parser
+    python manage.py benchmark_file_parser --pages 10 100 --workers 4
+    python manage.py benchmark_file_parser --fixtures-dir /tmp/pdf-fixtures
+
+Fixtures are written to a temporary directory unless --fixtures-dir is
+given, in which case existing ones are reused.
+"""
+import os
+import tempfile
+import time
+
+import pdfplumber
+from django.core.management.base import BaseCommand
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from quizzes.utils.file_parser import extract_pdf_text
+
+
+LINES_PER_PAGE = 45
+TEXT_BUDGET = 8000
+
+
+def build_fixture(path, pages):
+    pdf = canvas.Canvas(path, pagesize=A4)
+    _, height = A4
+    for page in range(pages):
+        y = height - 50
+        for line in range(LINES_PER_PAGE):
+            pdf.drawString(
+                40, y,
+                f"Page {page + 1} line {line + 1}: photosynthesis converts light energy into chemical energy."
+            )
+            y -= 16
+        pdf.showPage()
+    pdf.save()
+
+
+def previous_extract_pdf_text(path):
+    text = ""
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    return text
+
+
+class Command(BaseCommand):
+    help = 'Time PDF text extraction over 10/100/1000-page fixtures'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Process pool size')
+        parser.add_argument('--fixtures-dir', help='Keep (and reuse) fixtures here')
+        parser.add_argument(
+            '--previous-max-pages',
+            type=int,
+            default=100,
+            help='Skip the previous extractor on larger fixtures'
+        )
+
+    def handle(self, *args, **options):
+        if options['fixtures_dir']:
+            os.makedirs(options['fixtures_dir'], exist_ok=True)
+            self._benchmark(options['fixtures_dir'], options)
+        else:
+            with tempfile.TemporaryDirectory() as fixtures_dir:
+                self._benchmark(fixtures_dir, options)
+
+    def _benchmark(self, fixtures_dir, options):
+        workers = max(options['workers'], 2)
+
+        self.stdout.write(
+            f"{'pages':>6}  {'previous':>10}  {'budget 8k':>10}  {'full':>10}  {f'full x{workers}':>10}"
+        )
+
+        for pages in options['pages']:
+            path = os.path.join(fixtures_dir, f"fixture-{pages}.pdf")
+            if not os.path.exists(path):
+                build_fixture(path, pages)
+
+            timings = []
+            for extract in (
+                (lambda: previous_extract_pdf_text(path)) if pages <= options['previous_max_pages'] else None,
+                lambda: extract_pdf_text(path, max_chars=TEXT_BUDGET, workers=0),
+                lambda: extract_pdf_text(path, workers=0),
+                lambda: extract_pdf_text(path, workers=workers),
+            ):
+                if extract is None:
+                    timings.append(None)
+                    continue
+                start = time.perf_counter()
+                extract()
+                timings.append(time.perf_counter() - start)
+
+            self.stdout.write(f"{pages:>6}  " + "  ".join(
+                f"{t * 1000:>8.0f}ms" if t is not None else f"{'skipped':>10}" for t in timings
+            ))
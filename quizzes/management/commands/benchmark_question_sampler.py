@@ -0,0 +1,139 @@
+# quizzes/management/commands/benchmark_question_sampler.py
+"""
+Django management command to benchmark question sampling.
+
+Builds throwaway pools of increasing size inside a transaction that is
+rolled back at the end, and compares the random-key sampler against the
+old ORDER BY RANDOM() approach:
+    python manage.py benchmark_question_sampler --sizes 1000,10000,100000,1000000
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import User
+from quizzes.models import Category, Question, SubCategory
+from quizzes.question_sampler import record_exposures, sample_questions
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark random question sampling against pool size'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000,100000',
+            help='Comma-separated pool sizes to test'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=20,
+            help='Samples drawn per pool size'
+        )
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=10,
+            help='Questions per sample (quiz length)'
+        )
+        parser.add_argument(
+            '--seen',
+            type=int,
+            default=50,
+            help='Number of questions the benchmark user has already seen'
+        )
+        parser.add_argument(
+            '--skip-order-by-random',
+            action='store_true',
+            help='Only time the new sampler (ORDER BY RANDOM() gets slow on big pools)'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options['sizes'].split(',') if s.strip()]
+
+        self.stdout.write(f"{'pool size':>10}  {'sampler (ms)':>14}  {'order_by ? (ms)':>16}")
+
+        try:
+            with transaction.atomic():
+                category = Category.objects.create(name='__sampler_benchmark__')
+                subcategory = SubCategory.objects.create(category=category, name='Benchmark')
+                user = User.objects.create_user(
+                    username='__sampler_benchmark__',
+                    email='sampler-benchmark@example.invalid'
+                )
+
+                created = 0
+                for size in sorted(sizes):
+                    created = self._grow_pool(category, subcategory, created, size)
+
+                    record_exposures(user, list(
+                        Question.objects.filter(subcategory=subcategory)
+                        .order_by('random_key')
+                        .values_list('id', flat=True)[:options['seen']]
+                    ))
+                    seen_hashes = set(
+                        Question.objects.filter(exposures__user=user)
+                        .values_list('normalized_hash', flat=True)
+                    )
+
+                    sampler_ms = self._time(options['runs'], lambda: sample_questions(
+                        subcategory, 'medium', options['count'], exclude_seen_by=user
+                    ))
+
+                    if options['skip_order_by_random']:
+                        legacy = '-'
+                    else:
+                        legacy = f"{self._time(options['runs'], lambda: self._order_by_random(subcategory, seen_hashes, options['count'])):.2f}"
+
+                    self.stdout.write(f"{size:>10}  {sampler_ms:>14.2f}  {legacy:>16}")
+
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Done (benchmark data rolled back).'))
+
+    def _grow_pool(self, category, subcategory, created, size):
+        batch = []
+        for i in range(created, size):
+            text = f'Benchmark question {i}'
+            batch.append(Question(
+                category=category,
+                subcategory=subcategory,
+                difficulty='medium',
+                question_text=text,
+                option_a='A', option_b='B', option_c='C', option_d='D',
+                correct_answer=random.choice('ABCD'),
+                explanation='',
+                normalized_hash=Question.make_hash(f'{text} {subcategory.id}'),
+            ))
+            if len(batch) >= 5000:
+                Question.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Question.objects.bulk_create(batch)
+        return max(created, size)
+
+    def _order_by_random(self, subcategory, seen_hashes, count):
+        # The previous implementation: full random sort, filtered in Python
+        existing = Question.objects.filter(
+            subcategory=subcategory,
+            difficulty='medium'
+        ).order_by('?')
+        return [q for q in existing if q.normalized_hash not in seen_hashes][:count]
+
+    def _time(self, runs, func):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,121 @@
+# quizzes/management/commands/benchmark_share_codes.py
+"""
+Django management command to stress share-code allocation.
+
+Creates thousands of shared quizzes from parallel threads (each with its
+own database connection) and checks every one got a distinct code.
+--code-length shrinks the code space so collisions, and the retry on
+the unique index, actually happen:
+    python manage.py benchmark_share_codes
+    python manage.py benchmark_share_codes --quizzes 5000 --concurrency 32
+    python manage.py benchmark_share_codes --code-length 3
+
+Everything it creates is deleted at the end. SQLite serializes writers,
+so run it against MySQL/PostgreSQL for representative throughput.
+"""
+import queue
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from accounts.models import User
+from quizzes.models import SharedQuiz
+
+
+class Command(BaseCommand):
+    help = 'Create shared quizzes in parallel and verify their share codes are unique'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quizzes', type=int, default=2000, help='Shared quizzes to create')
+        parser.add_argument('--concurrency', type=int, default=16, help='Parallel creating threads')
+        parser.add_argument(
+            '--code-length',
+            type=int,
+            default=SharedQuiz.SHARE_CODE_LENGTH,
+            help='Share code length for this run (smaller forces collisions)'
+        )
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        teacher = User.objects.create_user(
+            username=f'__share_code_benchmark_{tag}',
+            email=f'share-code-benchmark-{tag}@example.invalid'
+        )
+
+        # Count every code drawn: draws - quizzes created = retries
+        drawn = []
+        original_length = SharedQuiz.SHARE_CODE_LENGTH
+        original_new_share_code = SharedQuiz.new_share_code
+
+        def counting_new_share_code():
+            code = original_new_share_code()
+            drawn.append(code)
+            return code
+
+        SharedQuiz.SHARE_CODE_LENGTH = options['code_length']
+        SharedQuiz.new_share_code = staticmethod(counting_new_share_code)
+
+        try:
+            elapsed, errors = self._run(teacher, options['quizzes'], options['concurrency'])
+
+            codes = list(SharedQuiz.objects.filter(creator=teacher).values_list('share_code', flat=True))
+            created = len(codes)
+            duplicates = created - len(set(codes))
+
+            self.stdout.write(
+                f"{options['quizzes']} quizzes, {options['concurrency']} threads, "
+                f"{options['code_length']}-character codes"
+            )
+            self.stdout.write(f"  created:     {created} ({created / elapsed:.1f}/s)")
+            self.stdout.write(f"  retries:     {len(drawn) - created - errors}")
+            self.stdout.write(f"  errors:      {errors}")
+            if duplicates:
+                self.stdout.write(self.style.ERROR(f"  duplicates:  {duplicates}"))
+            else:
+                self.stdout.write(self.style.SUCCESS("  duplicates:  0"))
+        finally:
+            SharedQuiz.SHARE_CODE_LENGTH = original_length
+            SharedQuiz.new_share_code = original_new_share_code
+            teacher.delete()
+
+    def _run(self, teacher, total, concurrency):
+        """
+        Create `total` quizzes from `concurrency` threads.
+        Returns (elapsed seconds, error count).
+        """
+        pending = queue.Queue()
+        for i in range(total):
+            pending.put(i)
+
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    try:
+                        i = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        SharedQuiz.objects.create(creator=teacher, title=f'Share code benchmark {i}')
+                    except Exception as e:
+                        with lock:
+                            errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            self.stdout.write(self.style.WARNING(f'  first error: {errors[0]!r}'))
+        return elapsed, len(errors)
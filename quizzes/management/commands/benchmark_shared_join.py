@@ -0,0 +1,172 @@
+# quizzes/management/commands/benchmark_shared_join.py
+"""
+Django management command to load-test classroom joins.
+
+Creates a throwaway shared quiz and student accounts, then has every
+student join at once from a pool of threads (each with its own database
+connection), first through the previous per-request lookups and then
+through the cached fast path in quizzes/shared_join.py:
+    python manage.py benchmark_shared_join
+    python manage.py benchmark_shared_join --joins 500 --concurrency 100 --questions 30
+
+Everything it creates is deleted at the end. SQLite serializes writers,
+so run it against MySQL/PostgreSQL for representative throughput.
+"""
+import queue
+import statistics
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from quizzes.models import QuestionSet, QuizAttempt, SharedQuiz, SharedQuizAttempt
+from quizzes.shared_join import (
+    build_join_payload, invalidate_join_payload, join_payload, join_state, start_attempt
+)
+
+
+class Command(BaseCommand):
+    help = 'Simulate a classroom of students joining a shared quiz at once'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--joins', type=int, default=500, help='Students joining per run')
+        parser.add_argument('--concurrency', type=int, default=50, help='Parallel joining threads')
+        parser.add_argument('--questions', type=int, default=30, help='Questions in the quiz')
+
+    def handle(self, *args, **options):
+        joins = options['joins']
+        tag = uuid.uuid4().hex[:8]
+
+        teacher = User.objects.create_user(
+            username=f'__join_benchmark_{tag}',
+            email=f'join-benchmark-{tag}@example.invalid'
+        )
+        shared_quiz = SharedQuiz.objects.create(
+            creator=teacher,
+            title='Join benchmark',
+            max_attempts=1,
+            question_set=QuestionSet.for_questions([
+                {
+                    'question': f'Benchmark question {i + 1}?',
+                    'option_a': 'A', 'option_b': 'B', 'option_c': 'C', 'option_d': 'D',
+                    'correct_answer': 'A',
+                    'explanation': '',
+                }
+                for i in range(options['questions'])
+            ])
+        )
+
+        try:
+            User.objects.bulk_create([
+                User(username=f'__join_{tag}_{i}', email=f'join-{tag}-{i}@example.invalid')
+                for i in range(joins * 2 + 2)
+            ], batch_size=1000)
+            students = list(User.objects.filter(username__startswith=f'__join_{tag}_').order_by('id'))
+
+            paths = [('previous', self._previous_join), ('fast path', self._fast_join)]
+
+            self.stdout.write(
+                f"{joins} joins, {options['concurrency']} threads, {options['questions']} questions\n"
+            )
+            self.stdout.write(
+                f"{'path':<10}  {'queries/join':>12}  {'joins/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'errors':>6}"
+            )
+
+            for index, (name, join) in enumerate(paths):
+                # Start each run from a warm cache: a class joins well after
+                # the first student has loaded the quiz
+                invalidate_join_payload(shared_quiz.share_code)
+                join_payload(shared_quiz.share_code)
+                # One extra student per path, joined alone for its query count
+                probe = students[-1 - index]
+                with CaptureQueriesContext(connection) as queries:
+                    join(shared_quiz.share_code, probe)
+
+                batch = students[index * joins:(index + 1) * joins]
+                elapsed, latencies, errors = self._run(join, shared_quiz.share_code, batch, options['concurrency'])
+
+                latencies.sort()
+                p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+                self.stdout.write(
+                    f"{name:<10}  {len(queries.captured_queries):>12}  {len(latencies) / elapsed:>8.1f}  "
+                    f"{statistics.median(latencies) if latencies else 0:>8.1f}  {p95:>8.1f}  {errors:>6}"
+                )
+
+            created = SharedQuizAttempt.objects.filter(shared_quiz=shared_quiz).count()
+            self.stdout.write(f"\n{created} attempts created (expected {joins * 2 + 2})")
+        finally:
+            User.objects.filter(username__startswith=f'__join_{tag}_').delete()
+            teacher.delete()
+
+        self.stdout.write(self.style.SUCCESS('Done (benchmark data deleted).'))
+
+    def _run(self, join, share_code, students, concurrency):
+        """
+        Join every student from `concurrency` threads.
+        Returns (elapsed seconds, per-join latencies in ms, error count).
+        """
+        pending = queue.Queue()
+        for student in students:
+            pending.put(student)
+
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    try:
+                        student = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    start = time.perf_counter()
+                    try:
+                        join(share_code, student)
+                    except Exception as e:
+                        with lock:
+                            errors.append(e)
+                        continue
+                    with lock:
+                        latencies.append((time.perf_counter() - start) * 1000)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            self.stdout.write(self.style.WARNING(f'  first error: {errors[0]!r}'))
+        return elapsed, latencies, len(errors)
+
+    def _previous_join(self, share_code, user):
+        # The work start_shared_quiz did per request before the fast path:
+        # quiz by share code and two attempt lookups
+        shared_quiz = SharedQuiz.objects.select_related(
+            'creator', 'question_set'
+        ).get(share_code=share_code, is_active=True)
+        existing = SharedQuizAttempt.objects.filter(
+            shared_quiz=shared_quiz, attempt__user=user
+        ).select_related('attempt').first()
+        completed = SharedQuizAttempt.objects.filter(
+            shared_quiz=shared_quiz,
+            attempt__user=user,
+            attempt__status=QuizAttempt.STATUS_COMPLETED
+        ).count()
+        if existing is None and completed < shared_quiz.max_attempts:
+            start_attempt(build_join_payload(shared_quiz), user)
+
+    def _fast_join(self, share_code, user):
+        payload = join_payload(share_code)
+        completed, in_progress_id, _ = join_state(payload, user)
+        if in_progress_id is None and completed < payload['max_attempts']:
+            start_attempt(payload, user)
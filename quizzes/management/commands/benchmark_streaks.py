@@ -0,0 +1,119 @@
+# quizzes/management/commands/benchmark_streaks.py
+"""
+Django management command to benchmark streak lookups.
+
+Creates a throwaway user with one attempt per day for streaks of
+increasing length, inside a transaction that is rolled back at the end,
+and compares the stored streak, the one-query history fallback and the
+old one-query-per-day loop:
+    python manage.py benchmark_streaks --days 30,365,1000
+"""
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from quizzes.models import QuizAttempt
+from quizzes.streaks import current_streak, record_activity, streak_from_history
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark streak lookups against streak length'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            default='30,365,1000',
+            help='Comma-separated streak lengths (days) to test'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=20,
+            help='Lookups timed per streak length'
+        )
+
+    def handle(self, *args, **options):
+        lengths = sorted(int(d) for d in options['days'].split(',') if d.strip())
+
+        self.stdout.write(
+            f"{'days':>6}  {'stored (ms/q)':>16}  {'history (ms/q)':>16}  {'per-day loop (ms/q)':>20}"
+        )
+
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username='__streak_benchmark__',
+                    email='streak-benchmark@example.invalid'
+                )
+                today = timezone.localtime()
+
+                created = 0
+                for length in lengths:
+                    QuizAttempt.objects.bulk_create([
+                        QuizAttempt(
+                            user=user,
+                            status=QuizAttempt.STATUS_COMPLETED,
+                            started_at=today - timedelta(days=day),
+                            completed_at=today - timedelta(days=day),
+                        )
+                        for day in range(created, length)
+                    ], batch_size=2000)
+                    created = length
+
+                    streak_from_history(user)
+                    record_activity(user.pk)
+                    user.refresh_from_db()
+
+                    results = [
+                        self._time(options['runs'], lambda: current_streak(user)),
+                        self._time(options['runs'], lambda: streak_from_history(user, save=False)[0]),
+                        self._time(options['runs'], lambda: self._per_day_loop(user)),
+                    ]
+                    streaks = {value for value, _, _ in results}
+                    if streaks != {length}:
+                        self.stdout.write(self.style.WARNING(f'  streak mismatch: {sorted(streaks)}'))
+
+                    self.stdout.write(f"{length:>6}  " + "  ".join(
+                        f"{f'{ms:.2f}/{queries}':>{width}}"
+                        for (_, ms, queries), width in zip(results, (16, 16, 20))
+                    ))
+
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Done (benchmark data rolled back).'))
+
+    def _per_day_loop(self, user):
+        # The previous implementation: one exists() query per streak day
+        streak = 0
+        today = timezone.localdate()
+        while True:
+            check_date = today - timedelta(days=streak)
+            day_start = timezone.make_aware(datetime.combine(check_date, datetime.min.time()))
+            day_end = timezone.make_aware(datetime.combine(check_date, datetime.max.time()))
+            if not QuizAttempt.objects.filter(user=user, started_at__range=(day_start, day_end)).exists():
+                return streak
+            streak += 1
+
+    def _time(self, runs, func):
+        """
+        (result, median ms, queries per call)
+        """
+        timings = []
+        for _ in range(runs):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                result = func()
+                timings.append((time.perf_counter() - start) * 1000)
+        return result, statistics.median(timings), len(queries.captured_queries)
@@ -0,0 +1,30 @@
+# quizzes/management/commands/prune_classroom_events.py
+"""
+Django management command to delete old live classroom events.
+
+Events only matter while a results dashboard is open, so keep a couple
+of days and drop the rest (e.g. from a daily cron job):
+    python manage.py prune_classroom_events
+    python manage.py prune_classroom_events --days 1
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from quizzes.classroom_live import EVENT_RETENTION, prune_events
+
+
+class Command(BaseCommand):
+    help = 'Delete live classroom events older than --days'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=float,
+            default=EVENT_RETENTION.total_seconds() / 86400,
+            help='Keep events from the last N days (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_events(timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} classroom events.'))
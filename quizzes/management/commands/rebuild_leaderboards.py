@@ -0,0 +1,19 @@
+# quizzes/management/commands/rebuild_leaderboards.py
+"""
+Django management command to recompute every leaderboard.
+
+Boards are updated as attempts complete; run this after a bulk import
+or manual edits to QuizAttempt rows (ideally while traffic is low):
+    python manage.py rebuild_leaderboards
+"""
+from django.core.management.base import BaseCommand
+
+from quizzes.leaderboard import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Recompute leaderboard entries from completed quiz attempts'
+
+    def handle(self, *args, **options):
+        entries = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {entries} leaderboard entries.'))
@@ -0,0 +1,51 @@
+# quizzes/management/commands/rebuild_user_stats.py
+"""
+Django management command to recompute the per-user statistics rollup
+and daily streaks.
+
+UserStats rows and streaks are kept current as attempts start and
+finish; run this after a backfill, a bulk import or manual edits to
+QuizAttempt rows:
+    python manage.py rebuild_user_stats
+    python manage.py rebuild_user_stats alice bob
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from quizzes.analytics import invalidate_chart_bundle
+from quizzes.streaks import streak_from_history
+from quizzes.user_stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute dashboard statistics (UserStats) and streaks from quiz attempt history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'usernames',
+            nargs='*',
+            help='Only rebuild these users (default: every user with an attempt)'
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+
+        users = User.objects.order_by('pk')
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+        else:
+            users = users.filter(quiz_attempts__isnull=False).distinct()
+
+        rebuilt = 0
+        for user in users.iterator(chunk_size=500):
+            stats = rebuild_user_stats(user)
+            # Edited attempts can change the numbers but not the stats version
+            invalidate_chart_bundle(stats)
+            _, longest, _ = streak_from_history(user)
+            rebuilt += 1
+            self.stdout.write(
+                f'  {user.username}: {stats.completed_count} completed, '
+                f'{stats.abandoned_count} abandoned, longest streak {longest}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt statistics for {rebuilt} users.'))
@@ -0,0 +1,79 @@
+# quizzes/management/commands/refill_question_pools.py
+"""
+Django management command to keep the question bank pre-warmed.
+
+Finds every SubCategory x difficulty pool below the low-water mark and
+refills it from its concepts. Meant to be run periodically (cron / a
+scheduler), e.g. every 15 minutes:
+    python manage.py refill_question_pools --enqueue
+"""
+from django.core.management.base import BaseCommand
+
+from quizzes.models import SubCategory
+from quizzes.question_pool import POOL_LOW_WATER_MARK, POOL_TARGET_SIZE, low_pools, refill_pool
+from quizzes.tasks import enqueue_pool_refill
+
+
+class Command(BaseCommand):
+    help = 'Refill question pools that are below the low-water mark'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--low-water',
+            type=int,
+            default=POOL_LOW_WATER_MARK,
+            help=f'Refill pools with fewer questions than this (default {POOL_LOW_WATER_MARK})'
+        )
+        parser.add_argument(
+            '--target',
+            type=int,
+            default=POOL_TARGET_SIZE,
+            help=f'Fill pools up to this many questions (default {POOL_TARGET_SIZE})'
+        )
+        parser.add_argument(
+            '--enqueue',
+            action='store_true',
+            help='Queue refill jobs for the run_jobs workers instead of refilling inline'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the pools that need a refill'
+        )
+
+    def handle(self, *args, **options):
+        pools = low_pools(options['low_water'])
+
+        if not pools:
+            self.stdout.write(self.style.SUCCESS('All question pools are above the low-water mark.'))
+            return
+
+        subcategories = SubCategory.objects.select_related('category').in_bulk(
+            {subcategory_id for subcategory_id, _, _ in pools}
+        )
+
+        total_added = 0
+        for subcategory_id, difficulty, count in pools:
+            subcategory = subcategories[subcategory_id]
+            label = f'{subcategory.name} ({difficulty}): {count} questions'
+
+            if options['dry_run']:
+                self.stdout.write(f'  {label}')
+                continue
+
+            if options['enqueue']:
+                enqueue_pool_refill(subcategory_id, difficulty, target_size=options['target'])
+                self.stdout.write(f'  Queued refill for {label}')
+                continue
+
+            try:
+                added = refill_pool(subcategory, difficulty, target_size=options['target'])
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'  Failed {label} - {e}'))
+                continue
+
+            total_added += added
+            self.stdout.write(f'  Added {added} to {label}')
+
+        if not options['dry_run'] and not options['enqueue']:
+            self.stdout.write(self.style.SUCCESS(f'Added {total_added} questions across {len(pools)} pools.'))
@@ -0,0 +1,56 @@
+# quizzes/management/commands/run_jobs.py
+"""
+Django management command that runs a background job worker.
+
+Start as many of these as you need next to the web server, e.g.
+    python manage.py run_jobs
+    python manage.py run_jobs --kind generate_questions
+"""
+from django.core.management.base import BaseCommand
+
+from quizzes.jobs import work
+
+
+class Command(BaseCommand):
+    help = 'Process queued background jobs (question generation etc.)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind',
+            action='append',
+            dest='kinds',
+            help='Only process jobs of this kind (can be repeated)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the queue once and exit instead of polling forever'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between polls when the queue is empty'
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=None,
+            help='Exit after processing this many jobs'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Worker started. Waiting for jobs...')
+
+        try:
+            processed = work(
+                kinds=options['kinds'],
+                once=options['once'],
+                sleep_seconds=options['sleep'],
+                stop_after=options['max_jobs'],
+            )
+        except KeyboardInterrupt:
+            self.stdout.write('Worker stopped.')
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} job(s).'))
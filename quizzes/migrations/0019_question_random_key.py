@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:30
+
+import random
+
+import quizzes.models
+from django.db import migrations, models
+
+
+def assign_random_keys(apps, schema_editor):
+    """
+    AddField evaluates the callable default once, so every existing row
+    got the same key. Give each question its own random position.
+    """
+    Question = apps.get_model('quizzes', 'Question')
+
+    batch = []
+    for question in Question.objects.only('id').iterator(chunk_size=2000):
+        question.random_key = random.random()
+        batch.append(question)
+        if len(batch) >= 2000:
+            Question.objects.bulk_update(batch, ['random_key'])
+            batch = []
+
+    if batch:
+        Question.objects.bulk_update(batch, ['random_key'])
+
+
+class Migration(migrations.Migration):
+
+    # 0019 added an index on (subcategory, difficulty) and 0020 dropped it
+    # again for the random_key index below; databases that ran both are
+    # already in this state
+    replaces = [
+        ('quizzes', '0019_question_pool_index'),
+        ('quizzes', '0020_question_random_key'),
+    ]
+
+    dependencies = [
+        ('quizzes', '0018_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='random_key',
+            field=models.FloatField(default=quizzes.models.random_sort_key),
+        ),
+        migrations.RunPython(assign_random_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['subcategory', 'difficulty', 'random_key'], name='quizzes_que_subcate_1abce2_idx'),
+        ),
+    ]
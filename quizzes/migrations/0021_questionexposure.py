@@ -0,0 +1,62 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:30
+
+from datetime import timedelta
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_recent_exposures(apps, schema_editor):
+    """
+    Seed exposures from the last week of bank-quiz AttemptQuestion rows,
+    matching the window the quiz builder used to scan.
+    """
+    AttemptQuestion = apps.get_model('quizzes', 'AttemptQuestion')
+    QuestionExposure = apps.get_model('quizzes', 'QuestionExposure')
+
+    rows = AttemptQuestion.objects.filter(
+        question__isnull=False,
+        attempt__created_at__gte=timezone.now() - timedelta(days=7)
+    ).values_list('attempt__user_id', 'question_id', 'attempt__created_at')
+
+    latest = {}
+    for user_id, question_id, seen_at in rows.iterator(chunk_size=2000):
+        key = (user_id, question_id)
+        if key not in latest or seen_at > latest[key]:
+            latest[key] = seen_at
+
+    QuestionExposure.objects.bulk_create(
+        [
+            QuestionExposure(user_id=user_id, question_id=question_id, seen_at=seen_at)
+            for (user_id, question_id), seen_at in latest.items()
+        ],
+        batch_size=2000,
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0019_question_random_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionExposure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seen_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exposures', to='quizzes.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_exposures', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'question')},
+            },
+        ),
+        migrations.RunPython(backfill_recent_exposures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:00
+
+from django.db import migrations
+
+
+ANSWER_KEYS = ('user_answer', 'is_correct')
+
+
+def move_answers(apps, schema_editor):
+    """
+    Answers used to be written into QuizAttempt.questions. Copy any that
+    are missing from AttemptQuestion (creating rows for older attempts
+    that never had them) and strip the keys from the question snapshot.
+    """
+    QuizAttempt = apps.get_model('quizzes', 'QuizAttempt')
+    AttemptQuestion = apps.get_model('quizzes', 'AttemptQuestion')
+
+    # Status values as defined on AttemptQuestion
+    STATUS_UNVISITED, STATUS_SOLVED, STATUS_SKIPPED = 0, 1, 3
+
+    attempts = QuizAttempt.objects.exclude(questions__isnull=True).only('id', 'questions')
+    for attempt in attempts.iterator(chunk_size=500):
+        questions = attempt.questions
+        if not isinstance(questions, list):
+            continue
+
+        rows = {
+            aq.question_order: aq
+            for aq in AttemptQuestion.objects.filter(attempt_id=attempt.id)
+        }
+        to_create = []
+        to_update = []
+
+        for idx, q in enumerate(questions):
+            if not isinstance(q, dict):
+                continue
+            user_answer = q.get('user_answer')
+            aq = rows.get(idx)
+
+            if aq is None:
+                to_create.append(AttemptQuestion(
+                    attempt_id=attempt.id,
+                    question_order=idx,
+                    selected_option=user_answer,
+                    is_correct=q.get('is_correct') if user_answer else None,
+                    status=STATUS_SOLVED if user_answer else STATUS_UNVISITED,
+                ))
+            elif user_answer and aq.selected_option is None and aq.status != STATUS_SKIPPED:
+                aq.selected_option = user_answer
+                aq.is_correct = q.get('is_correct')
+                aq.status = STATUS_SOLVED
+                to_update.append(aq)
+
+        AttemptQuestion.objects.bulk_create(to_create)
+        AttemptQuestion.objects.bulk_update(to_update, ['selected_option', 'is_correct', 'status'])
+
+        if any(isinstance(q, dict) and any(k in q for k in ANSWER_KEYS) for q in questions):
+            attempt.questions = [
+                {k: v for k, v in q.items() if k not in ANSWER_KEYS} if isinstance(q, dict) else q
+                for q in questions
+            ]
+            attempt.save(update_fields=['questions'])
+
+
+def restore_answers(apps, schema_editor):
+    """
+    Write answered AttemptQuestion rows back into the question snapshot
+    (user_answer/is_correct), where the code before this migration reads
+    them. The AttemptQuestion rows are kept.
+    """
+    QuizAttempt = apps.get_model('quizzes', 'QuizAttempt')
+    AttemptQuestion = apps.get_model('quizzes', 'AttemptQuestion')
+
+    attempts = QuizAttempt.objects.exclude(questions__isnull=True).only('id', 'questions')
+    for attempt in attempts.iterator(chunk_size=500):
+        questions = attempt.questions
+        if not isinstance(questions, list):
+            continue
+
+        answers = {
+            order: (selected_option, is_correct)
+            for order, selected_option, is_correct in AttemptQuestion.objects.filter(
+                attempt_id=attempt.id,
+                selected_option__isnull=False
+            ).values_list('question_order', 'selected_option', 'is_correct')
+        }
+        if not answers:
+            continue
+
+        for idx, q in enumerate(questions):
+            if isinstance(q, dict) and idx in answers:
+                q['user_answer'], q['is_correct'] = answers[idx]
+        attempt.save(update_fields=['questions'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0021_questionexposure'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_answers, restore_answers),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0022_move_answers_to_attemptquestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='answer_sync_seq',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
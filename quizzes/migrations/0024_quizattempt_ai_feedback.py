@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0023_quizattempt_answer_sync_seq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='ai_feedback',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='quizattempt',
+            name='ai_feedback_status',
+            field=models.SmallIntegerField(choices=[(0, 'Not Requested'), (1, 'Pending'), (2, 'Ready'), (3, 'Failed')], default=0),
+        ),
+    ]
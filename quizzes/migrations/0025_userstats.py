@@ -0,0 +1,39 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0024_quizattempt_ai_feedback'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts_started', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('abandoned_count', models.PositiveIntegerField(default=0)),
+                ('timeup_auto_count', models.PositiveIntegerField(default=0)),
+                ('tabswitch_auto_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('best_score', models.FloatField(blank=True, null=True)),
+                ('worst_score', models.FloatField(blank=True, null=True)),
+                ('correct_sum', models.PositiveIntegerField(default=0)),
+                ('attempted_sum', models.PositiveIntegerField(default=0)),
+                ('time_taken_sum', models.PositiveIntegerField(default=0)),
+                ('by_difficulty', models.JSONField(blank=True, default=dict)),
+                ('by_category', models.JSONField(blank=True, default=dict)),
+                ('by_subcategory', models.JSONField(blank=True, default=dict)),
+                ('daily', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_leaderboards(apps, schema_editor):
+    """
+    Build the boards from completed attempts (same keys as quizzes.leaderboard).
+    """
+    QuizAttempt = apps.get_model('quizzes', 'QuizAttempt')
+    LeaderboardEntry = apps.get_model('quizzes', 'LeaderboardEntry')
+    STATUS_COMPLETED = 2
+
+    totals = {}
+    completed = QuizAttempt.objects.filter(status=STATUS_COMPLETED).values_list(
+        'user_id', 'category_id', 'difficulty', 'score', 'completed_at'
+    ).order_by()
+
+    for user_id, category_id, difficulty, score, completed_at in completed.iterator(chunk_size=2000):
+        boards = ['all', f'diff:{difficulty}']
+        if completed_at:
+            year, week, _ = timezone.localdate(completed_at).isocalendar()
+            boards.append(f'week:{year}-W{week:02d}')
+        if category_id:
+            boards.append(f'cat:{category_id}')
+
+        for board in boards:
+            entry = totals.setdefault((board, user_id), [0, 0.0])
+            entry[0] += 1
+            entry[1] += float(score or 0)
+
+    LeaderboardEntry.objects.bulk_create(
+        [
+            LeaderboardEntry(
+                board=board, user_id=user_id,
+                quizzes=quizzes, score_sum=score_sum, avg_score=score_sum / quizzes
+            )
+            for (board, user_id), (quizzes, score_sum) in totals.items()
+        ],
+        batch_size=2000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0025_userstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=40)),
+                ('quizzes', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('avg_score', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', '-avg_score', '-quizzes'], name='quizzes_lea_board_09a80a_idx')],
+                'unique_together': {('board', 'user')},
+            },
+        ),
+        migrations.RunPython(backfill_leaderboards, migrations.RunPython.noop),
+    ]
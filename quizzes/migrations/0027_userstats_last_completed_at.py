@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:00
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def backfill_last_completed_at(apps, schema_editor):
+    QuizAttempt = apps.get_model('quizzes', 'QuizAttempt')
+    UserStats = apps.get_model('quizzes', 'UserStats')
+    STATUS_COMPLETED = 2
+
+    latest = QuizAttempt.objects.filter(
+        user_id=OuterRef('user_id'),
+        status=STATUS_COMPLETED
+    ).order_by().values('user_id').annotate(latest=Max('completed_at')).values('latest')
+
+    UserStats.objects.update(last_completed_at=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0026_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstats',
+            name='last_completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_last_completed_at, migrations.RunPython.noop),
+    ]
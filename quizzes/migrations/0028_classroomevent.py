@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0027_userstats_last_completed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassroomEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('joined', 'Joined'), ('progress', 'Answered'), ('completed', 'Completed'), ('quit', 'Quit')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='quizzes.quizattempt')),
+                ('shared_quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='live_events', to='quizzes.sharedquiz')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['shared_quiz', 'id'], name='quizzes_cla_shared__6c363a_idx'), models.Index(fields=['created_at'], name='quizzes_cla_created_f2a181_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:00
+
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def content_hash(questions):
+    # Same as QuestionSet.make_hash
+    return hashlib.sha256(
+        json.dumps(questions, sort_keys=True, separators=(',', ':')).encode()
+    ).hexdigest()
+
+
+def move_questions_to_sets(apps, schema_editor):
+    """
+    Replace each attempt's and shared quiz's own copy of its questions
+    with a reference to one QuestionSet per distinct question list.
+    """
+    QuestionSet = apps.get_model('quizzes', 'QuestionSet')
+    set_ids = {}
+
+    for model_name in ('SharedQuiz', 'QuizAttempt'):
+        Model = apps.get_model('quizzes', model_name)
+        rows = Model.objects.filter(questions__isnull=False).only('pk', 'questions')
+        batch = []
+
+        for row in rows.iterator(chunk_size=500):
+            questions = row.questions
+            if not isinstance(questions, list):
+                continue
+
+            key = content_hash(questions)
+            if key not in set_ids:
+                set_ids[key] = QuestionSet.objects.get_or_create(
+                    content_hash=key,
+                    defaults={'questions': questions, 'question_count': len(questions)}
+                )[0].pk
+
+            row.question_set_id = set_ids[key]
+            batch.append(row)
+            if len(batch) >= 500:
+                Model.objects.bulk_update(batch, ['question_set'])
+                batch = []
+
+        Model.objects.bulk_update(batch, ['question_set'])
+
+
+def copy_questions_back(apps, schema_editor):
+    for model_name in ('SharedQuiz', 'QuizAttempt'):
+        Model = apps.get_model('quizzes', model_name)
+        rows = Model.objects.filter(question_set__isnull=False).select_related('question_set')
+        batch = []
+
+        for row in rows.iterator(chunk_size=500):
+            row.questions = row.question_set.questions
+            batch.append(row)
+            if len(batch) >= 500:
+                Model.objects.bulk_update(batch, ['questions'])
+                batch = []
+
+        Model.objects.bulk_update(batch, ['questions'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0028_classroomevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('questions', models.JSONField(default=list)),
+                ('question_count', models.PositiveSmallIntegerField(default=0)),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='quizattempt',
+            name='question_set',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='attempts', to='quizzes.questionset'),
+        ),
+        migrations.AddField(
+            model_name='sharedquiz',
+            name='question_set',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='shared_quizzes', to='quizzes.questionset'),
+        ),
+        migrations.RunPython(move_questions_to_sets, copy_questions_back),
+        migrations.RemoveField(
+            model_name='quizattempt',
+            name='questions',
+        ),
+        migrations.RemoveField(
+            model_name='sharedquiz',
+            name='questions',
+        ),
+    ]
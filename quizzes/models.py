@@ -1,10 +1,21 @@
 # quizzes/models.py
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
 from django.utils import timezone
 import hashlib
+import json
+import random
 import re
+import secrets
+import string
+
+
+def random_sort_key():
+    """Default for Question.random_key - a uniform value in [0, 1)."""
+    return random.random()
+
+
 class Category(models.Model):
     name = models.CharField(max_length=150, unique=True)
     description = models.TextField(blank=True)
@@ -31,6 +42,58 @@ class SubCategory(models.Model):
     def __str__(self):
         return f"{self.category.name} - {self.name}"
 
+class QuestionSet(models.Model):
+    """
+    An immutable list of quiz questions, stored once and referenced by
+    every attempt (and shared quiz) that serves it. Rows are keyed by a
+    hash of their content, so a classroom of 1,000 students taking the
+    same shared quiz stores the questions once; editing a quiz creates a
+    new set instead of changing the one existing attempts point at.
+    """
+    # JSON structure for questions:
+    # [
+    #   {
+    #     "id": 1,
+    #     "question": "What is...",
+    #     "option_a": "...",
+    #     "option_b": "...",
+    #     "option_c": "...",
+    #     "option_d": "...",
+    #     "correct_answer": "A",
+    #     "explanation": "..."
+    #   }
+    # ]
+    questions = models.JSONField(default=list)
+    question_count = models.PositiveSmallIntegerField(default=0)
+    content_hash = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.question_count} questions ({self.content_hash[:12]})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("QuestionSet rows are immutable; use QuestionSet.for_questions()")
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def make_hash(questions):
+        return hashlib.sha256(
+            json.dumps(questions, sort_keys=True, separators=(',', ':')).encode()
+        ).hexdigest()
+
+    @classmethod
+    def for_questions(cls, questions):
+        """
+        The set holding exactly `questions`, created if it does not exist yet.
+        """
+        question_set, _ = cls.objects.get_or_create(
+            content_hash=cls.make_hash(questions),
+            defaults={'questions': questions, 'question_count': len(questions)}
+        )
+        return question_set
+
+
 class QuizAttempt(models.Model):
 
     AUTO_SUBMIT_NONE = 0
@@ -62,6 +125,19 @@ class QuizAttempt(models.Model):
         (STATUS_COMPLETED, 'Completed'),
         (STATUS_ABANDONED, 'Abandoned'),
     ]
+
+    # AI feedback is generated once per attempt by a background job
+    FEEDBACK_NONE = 0
+    FEEDBACK_PENDING = 1
+    FEEDBACK_READY = 2
+    FEEDBACK_FAILED = 3
+
+    FEEDBACK_STATUS_CHOICES = [
+        (FEEDBACK_NONE, 'Not Requested'),
+        (FEEDBACK_PENDING, 'Pending'),
+        (FEEDBACK_READY, 'Ready'),
+        (FEEDBACK_FAILED, 'Failed'),
+    ]
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='quiz_attempts')
@@ -79,22 +155,15 @@ class QuizAttempt(models.Model):
     remaining_seconds = models.PositiveIntegerField(null=True, blank=True)  # NEW
 
 
-    # JSON structure for questions:
-    # [
-    #   {
-    #     "id": 1,
-    #     "question": "What is...",
-    #     "option_a": "...",
-    #     "option_b": "...",
-    #     "option_c": "...",
-    #     "option_d": "...",
-    #     "correct_answer": "A",
-    #     "explanation": "...",
-    #     "user_answer": null,  # filled when user answers
-    #     "is_correct": null    # calculated when user answers
-    #   }
-    # ]
-    questions = models.JSONField(null=True, blank=True)
+    # Set once when the quiz is assembled (null while generating) - the
+    # user's answers live in AttemptQuestion (selected_option/is_correct)
+    question_set = models.ForeignKey(
+        QuestionSet,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='attempts'
+    )
     
     # AI metadata (model used, tokens, generation time, etc.)
     ai_meta = models.JSONField(null=True, blank=True)
@@ -102,6 +171,8 @@ class QuizAttempt(models.Model):
     status = models.SmallIntegerField(default=STATUS_GENERATING, choices=STATUS_CHOICES)
     total_questions = models.SmallIntegerField(default=10)
     current_question_index = models.SmallIntegerField(default=0)  # Track progress
+    # Last answer batch applied from the prefetch quiz player (see quiz_player)
+    answer_sync_seq = models.PositiveIntegerField(default=0)
     score = models.FloatField(default=0.0)
     
     started_at = models.DateTimeField(null=True, blank=True)
@@ -113,6 +184,9 @@ class QuizAttempt(models.Model):
     is_auto_submitted = models.BooleanField(default=False)
     flagged_for_review = models.BooleanField(default=False)
 
+    ai_feedback = models.TextField(blank=True, default='')
+    ai_feedback_status = models.SmallIntegerField(default=FEEDBACK_NONE, choices=FEEDBACK_STATUS_CHOICES)
+
     class Meta:
         indexes = [
             models.Index(fields=['user', 'started_at']),
@@ -123,13 +197,18 @@ class QuizAttempt(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.subcategory.name if self.subcategory else 'N/A'} ({self.difficulty})"
+
+    @property
+    def questions(self):
+        """The attempt's question list, or None while it is being generated."""
+        return self.question_set.questions if self.question_set_id else None
     
     def calculate_score(self):
         """Calculate score based on correct answers"""
         if not self.questions:
             return 0
         
-        correct_count = sum(1 for q in self.questions if q.get('is_correct') == True)
+        correct_count = self.attempt_questions.filter(is_correct=True).count()
         self.score = (correct_count / len(self.questions)) * 100
         return self.score
     
@@ -143,7 +222,25 @@ class QuizAttempt(models.Model):
         """Check if all questions are answered"""
         if not self.questions:
             return False
-        return all(q.get('user_answer') is not None for q in self.questions)
+        return not self.attempt_questions.filter(selected_option__isnull=True).exists()
+
+    def answered_questions(self):
+        """
+        Question snapshot merged with the user's answers, for review pages.
+        Each entry is a copy of the question dict plus user_answer/is_correct.
+        """
+        answers = {
+            order: (selected_option, is_correct)
+            for order, selected_option, is_correct in self.attempt_questions.values_list(
+                'question_order', 'selected_option', 'is_correct'
+            )
+        }
+
+        merged = []
+        for idx, q in enumerate(self.questions or []):
+            user_answer, is_correct = answers.get(idx, (None, None))
+            merged.append({**q, "user_answer": user_answer, "is_correct": is_correct})
+        return merged
     
 class Question(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
@@ -169,6 +266,16 @@ class Question(models.Model):
     usage_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Random position inside its pool, used by question_sampler to draw
+    # random rows with an index range scan instead of ORDER BY RANDOM()
+    random_key = models.FloatField(default=random_sort_key)
+
+    class Meta:
+        indexes = [
+            # Pool lookups (COUNT per pool) and random-key range scans
+            models.Index(fields=['subcategory', 'difficulty', 'random_key']),
+        ]
+
     @staticmethod
     def normalize(text):
         text = text.lower()
@@ -183,6 +290,30 @@ class Question(models.Model):
     def __str__(self):
         return self.question_text[:60]
 
+class QuestionExposure(models.Model):
+    """
+    Records that a user was served a bank question (written when a quiz
+    is assembled). Lets the sampler exclude recently seen questions with
+    an indexed anti-join instead of re-reading old attempts' JSON.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='question_exposures'
+    )
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name='exposures'
+    )
+    seen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'question')
+
+    def __str__(self):
+        return f"{self.user_id} saw Q{self.question_id} at {self.seen_at:%Y-%m-%d}"
+
 class Concept(models.Model):
     subcategory = models.ForeignKey(
         SubCategory,
@@ -295,6 +426,11 @@ class SharedQuiz(models.Model):
     Represents a quiz that can be shared via link for classroom use.
     The creator can preview and edit questions before sharing.
     """
+    SHARE_CODE_ALPHABET = string.ascii_uppercase + string.digits
+    SHARE_CODE_LENGTH = 8
+    # 36^8 codes: a retry is already rare, ten in a row means something is wrong
+    SHARE_CODE_ATTEMPTS = 10
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     
     # Creator of the shared quiz
@@ -315,9 +451,14 @@ class SharedQuiz(models.Model):
         ('hard', 'Hard')
     ], default='medium')
     
-    # Questions (edited by creator)
-    # Same JSON structure as QuizAttempt.questions but without user_answer/is_correct
-    questions = models.JSONField(default=list)
+    # Questions as saved by the creator; attempts reference the same set
+    question_set = models.ForeignKey(
+        QuestionSet,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='shared_quizzes'
+    )
     
     # Time settings
     time_limit_seconds = models.IntegerField(default=600)  # 10 minutes default
@@ -342,18 +483,33 @@ class SharedQuiz(models.Model):
     def __str__(self):
         return f"{self.title} by {self.creator.username}"
     
+    @classmethod
+    def new_share_code(cls):
+        return ''.join(secrets.choice(cls.SHARE_CODE_ALPHABET) for _ in range(cls.SHARE_CODE_LENGTH))
+
     def save(self, *args, **kwargs):
-        if not self.share_code:
-            # Generate a unique 8-character code
-            import secrets
-            import string
-            while True:
-                code = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(8))
-                if not SharedQuiz.objects.filter(share_code=code).exists():
-                    self.share_code = code
-                    break
-        super().save(*args, **kwargs)
+        if self.share_code:
+            return super().save(*args, **kwargs)
+
+        # Insert with a random code and let the unique index reject a
+        # duplicate: no lookup per code, and two concurrent saves can
+        # never end up with the same one
+        for _ in range(self.SHARE_CODE_ATTEMPTS):
+            self.share_code = self.new_share_code()
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if not SharedQuiz.objects.filter(share_code=self.share_code).exists():
+                    raise  # some other constraint
+
+        self.share_code = ''
+        raise IntegrityError("Could not allocate a unique share code")
     
+    @property
+    def questions(self):
+        return self.question_set.questions if self.question_set_id else []
+
     def get_share_url(self):
         """Get the full shareable URL"""
         from django.urls import reverse
@@ -400,3 +556,181 @@ class SharedQuizAttempt(models.Model):
     
     def __str__(self):
         return f"{self.attempt.user.username} - {self.shared_quiz.title}"
+
+
+class ClassroomEvent(models.Model):
+    """
+    A change to one participant of a shared quiz (joined, answered,
+    completed, quit), read by the live results stream in
+    quizzes.classroom_live. Rows only say who changed; the stream reloads
+    the participant's current state.
+    """
+    KIND_JOINED = 'joined'
+    KIND_PROGRESS = 'progress'
+    KIND_COMPLETED = 'completed'
+    KIND_QUIT = 'quit'
+
+    KIND_CHOICES = [
+        (KIND_JOINED, 'Joined'),
+        (KIND_PROGRESS, 'Answered'),
+        (KIND_COMPLETED, 'Completed'),
+        (KIND_QUIT, 'Quit'),
+    ]
+
+    shared_quiz = models.ForeignKey(
+        SharedQuiz,
+        on_delete=models.CASCADE,
+        related_name='live_events'
+    )
+    attempt = models.ForeignKey(
+        QuizAttempt,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['shared_quiz', 'id']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.shared_quiz_id} - {self.kind} #{self.pk}"
+
+
+class BackgroundJob(models.Model):
+    """
+    A unit of work in the DB-backed job queue.
+    Workers started with `python manage.py run_jobs` claim and execute
+    these rows so slow work (AI generation etc.) stays off the request path.
+    """
+    STATUS_QUEUED = 0
+    STATUS_RUNNING = 1
+    STATUS_DONE = 2
+    STATUS_FAILED = 3
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+
+    # Optional idempotency key - enqueueing the same key twice returns the existing job
+    dedupe_key = models.CharField(max_length=100, unique=True, null=True, blank=True)
+
+    status = models.SmallIntegerField(choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    error = models.TextField(blank=True)
+
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+            models.Index(fields=['kind', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.get_status_display()})"
+
+
+class UserStats(models.Model):
+    """
+    Running totals of a user's quiz history, maintained by quizzes.user_stats
+    as attempts start, complete or are abandoned. Dashboards read this one
+    row instead of re-aggregating every QuizAttempt.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='quiz_stats'
+    )
+
+    attempts_started = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    abandoned_count = models.PositiveIntegerField(default=0)
+    timeup_auto_count = models.PositiveIntegerField(default=0)
+    tabswitch_auto_count = models.PositiveIntegerField(default=0)
+
+    # Totals over completed attempts
+    score_sum = models.FloatField(default=0.0)
+    best_score = models.FloatField(null=True, blank=True)
+    worst_score = models.FloatField(null=True, blank=True)
+    correct_sum = models.PositiveIntegerField(default=0)
+    attempted_sum = models.PositiveIntegerField(default=0)
+    time_taken_sum = models.PositiveIntegerField(default=0)
+    # Latest completion - changes whenever the numbers above do
+    last_completed_at = models.DateTimeField(null=True, blank=True)
+
+    # Counters over completed attempts, all shaped {"n", "score", "correct", "attempted"}:
+    #   by_difficulty   {"easy": {...}}
+    #   by_category     {"<category id>": {"name": "...", ...}}  ("" = no category)
+    #   by_subcategory  {"<subcategory id>": {"name": "...", ...}}
+    #   daily           {"2026-01-31": {..., "cat": {"<category id>": n},
+    #                                   "diff": {"easy": {"n", "score"}}}}
+    # Daily buckets are keyed by the local date of completed_at.
+    by_difficulty = models.JSONField(default=dict, blank=True)
+    by_category = models.JSONField(default=dict, blank=True)
+    by_subcategory = models.JSONField(default=dict, blank=True)
+    daily = models.JSONField(default=dict, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for {self.user_id} ({self.completed_count} completed)"
+
+    @property
+    def avg_score(self):
+        return self.score_sum / self.completed_count if self.completed_count else 0
+
+    @property
+    def accuracy(self):
+        """Correct answers as a percentage of attempted questions."""
+        return (self.correct_sum / self.attempted_sum) * 100 if self.attempted_sum else 0
+
+    @property
+    def completion_rate(self):
+        return (self.completed_count / self.attempts_started) * 100 if self.attempts_started else 0
+
+    @property
+    def avg_time_per_question(self):
+        return self.time_taken_sum / self.attempted_sum if self.attempted_sum else 0
+
+
+class LeaderboardEntry(models.Model):
+    """
+    One user's running total on one leaderboard, updated by
+    quizzes.leaderboard as attempts complete. `board` is "all",
+    "week:<iso year>-W<week>", "cat:<category id>" or "diff:<difficulty>".
+    """
+    board = models.CharField(max_length=40)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries'
+    )
+    quizzes = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    avg_score = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('board', 'user')
+        indexes = [
+            models.Index(fields=['board', '-avg_score', '-quizzes']),
+        ]
+
+    def __str__(self):
+        return f"{self.board}: {self.user_id} {self.avg_score:.1f}% ({self.quizzes})"
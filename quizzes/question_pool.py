@@ -0,0 +1,132 @@
+# quizzes/question_pool.py
+"""
+Question pool manager.
+
+A "pool" is the set of bank questions for one SubCategory x difficulty.
+Quizzes are assembled from the pool, so keeping every pool above a
+low-water mark means almost no quiz start ever has to wait on OpenAI.
+Pools are topped up from their Concept rows by a background job or by
+`python manage.py refill_question_pools` (e.g. from cron).
+"""
+import logging
+import random
+
+from django.conf import settings
+from django.db.models import Count
+
+from .ai_service import generate_quiz_questions
+from .models import Concept, Question
+from .quiz_assembly import store_generated_questions
+
+
+logger = logging.getLogger(__name__)
+
+# Refill a pool once it drops below this many questions...
+POOL_LOW_WATER_MARK = getattr(settings, 'QUESTION_POOL_LOW_WATER_MARK', 50)
+# ...back up to this many
+POOL_TARGET_SIZE = getattr(settings, 'QUESTION_POOL_TARGET_SIZE', 100)
+# Questions requested from the AI per call
+POOL_REFILL_BATCH = getattr(settings, 'QUESTION_POOL_REFILL_BATCH', 10)
+# Give up on a pool after this many calls that added nothing new
+MAX_EMPTY_ROUNDS = 3
+
+
+def pool_size(subcategory, difficulty):
+    """
+    Number of bank questions in one pool (single indexed COUNT).
+    """
+    return Question.objects.filter(
+        subcategory=subcategory,
+        difficulty=difficulty
+    ).count()
+
+
+def pool_levels():
+    """
+    Current size of every refillable pool.
+
+    Returns {(subcategory_id, difficulty): count} for every
+    SubCategory x difficulty that has concepts to generate from,
+    including pools that are still empty.
+    """
+    levels = {
+        (row['subcategory_id'], row['difficulty']): 0
+        for row in Concept.objects.values('subcategory_id', 'difficulty').distinct()
+    }
+
+    counts = Question.objects.values('subcategory_id', 'difficulty').annotate(
+        total=Count('id')
+    )
+    for row in counts:
+        key = (row['subcategory_id'], row['difficulty'])
+        if key in levels:
+            levels[key] = row['total']
+
+    return levels
+
+
+def low_pools(low_water_mark=None):
+    """
+    Pools below the low-water mark, emptiest first.
+    Returns a list of (subcategory_id, difficulty, count).
+    """
+    if low_water_mark is None:
+        low_water_mark = POOL_LOW_WATER_MARK
+
+    low = [
+        (subcategory_id, difficulty, count)
+        for (subcategory_id, difficulty), count in pool_levels().items()
+        if count < low_water_mark
+    ]
+    return sorted(low, key=lambda item: item[2])
+
+
+def refill_pool(subcategory, difficulty, target_size=None, batch_size=None):
+    """
+    Generate questions for one pool until it reaches target_size.
+    Returns the number of new questions added to the bank.
+    """
+    if target_size is None:
+        target_size = POOL_TARGET_SIZE
+    if batch_size is None:
+        batch_size = POOL_REFILL_BATCH
+
+    concept_names = list(
+        Concept.objects.filter(
+            subcategory=subcategory,
+            difficulty=difficulty
+        ).values_list('name', flat=True)
+    )
+    if not concept_names:
+        return 0
+
+    added = 0
+    empty_rounds = 0
+    current = pool_size(subcategory, difficulty)
+
+    while current < target_size and empty_rounds < MAX_EMPTY_ROUNDS:
+        count = min(batch_size, target_size - current)
+        selected_concepts = random.sample(concept_names, min(count, len(concept_names)))
+
+        questions_data = generate_quiz_questions(
+            topic=subcategory.name,
+            category=subcategory.category.name,
+            difficulty=difficulty,
+            count=count,
+            concepts=selected_concepts,
+            cache=False  # a cached repeat would only add duplicates to the bank
+        )
+
+        new_count = len(store_generated_questions(subcategory, difficulty, questions_data))
+        if new_count == 0:
+            empty_rounds += 1
+
+        added += new_count
+        current += new_count
+
+    logger.info(
+        "Refilled pool %s/%s with %d questions (now %d)",
+        subcategory.name, difficulty, added, current
+    )
+    return added
+
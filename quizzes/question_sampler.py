@@ -0,0 +1,77 @@
+# quizzes/question_sampler.py
+"""
+Random sampling of unseen bank questions without ORDER BY RANDOM().
+
+Every Question carries a `random_key` in [0, 1) covered by the
+(subcategory, difficulty, random_key) index. To draw N rows we pick a
+random pivot and read the next N keys after it (wrapping around to the
+start of the range if needed), so each draw is at most two index range
+scans of N rows - independent of pool size.
+
+"Unseen" is an indexed anti-join against QuestionExposure, which is
+written whenever a quiz is assembled (see `record_exposures`).
+
+Callers give sampled rows fresh keys when they use them, so the same
+neighbours do not keep appearing together.
+"""
+import random
+
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Question, QuestionExposure
+
+
+def sample_questions(subcategory, difficulty, count, exclude_seen_by=None, seen_since=None):
+    """
+    Return up to `count` random questions from one pool.
+    If `exclude_seen_by` is given, questions that user was served
+    (since `seen_since`, if given) are skipped.
+    """
+    pool = Question.objects.filter(
+        subcategory=subcategory,
+        difficulty=difficulty
+    )
+
+    if exclude_seen_by is not None:
+        seen = QuestionExposure.objects.filter(
+            user=exclude_seen_by,
+            question=OuterRef('pk')
+        )
+        if seen_since is not None:
+            seen = seen.filter(seen_at__gte=seen_since)
+        pool = pool.filter(~Exists(seen))
+
+    pivot = random.random()
+
+    picked = list(
+        pool.filter(random_key__gte=pivot).order_by('random_key')[:count]
+    )
+
+    # Wrap around to the start of the key range
+    if len(picked) < count:
+        picked += list(
+            pool.filter(random_key__lt=pivot).order_by('random_key')[:count - len(picked)]
+        )
+
+    return picked
+
+
+def record_exposures(user, question_ids, seen_at=None):
+    """
+    Mark bank questions as served to a user (one upsert query).
+    """
+    if not question_ids:
+        return
+
+    seen_at = seen_at or timezone.now()
+
+    QuestionExposure.objects.bulk_create(
+        [
+            QuestionExposure(user=user, question_id=question_id, seen_at=seen_at)
+            for question_id in set(question_ids)
+        ],
+        update_conflicts=True,
+        unique_fields=['user', 'question'],
+        update_fields=['seen_at']
+    )
@@ -0,0 +1,130 @@
+# quizzes/quiz_assembly.py
+"""
+Bulk write path for starting a quiz attempt.
+
+Every quiz start (bank, AI and shared quizzes) funnels its inserts
+through here so the number of queries stays fixed no matter how many
+questions the quiz has:
+  - AI questions are stored with one bulk_create, ids resolved with one
+    lookup into an in-memory hash -> id map
+  - usage_count is bumped for all served questions in a single UPDATE
+  - AttemptQuestion rows are created with one bulk_create
+  - the question list is stored once as a QuestionSet that attempts
+    serving the same questions share
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Random
+
+from .models import AttemptQuestion, Question, QuestionSet
+from .question_sampler import record_exposures
+
+
+def store_generated_questions(subcategory, difficulty, questions_data):
+    """
+    Insert AI-generated questions that are not already in the bank.
+    Returns [(question_dict, question_id)] for the newly stored ones,
+    in the order the AI returned them.
+    """
+    by_hash = {}
+    for q in questions_data:
+        by_hash.setdefault(Question.make_hash(q["question"]), q)
+
+    if not by_hash:
+        return []
+
+    existing = set(
+        Question.objects.filter(
+            normalized_hash__in=list(by_hash)
+        ).values_list('normalized_hash', flat=True)
+    )
+    new_hashes = [q_hash for q_hash in by_hash if q_hash not in existing]
+
+    # ignore_conflicts covers a concurrent insert of the same hash
+    Question.objects.bulk_create(
+        [
+            Question(
+                category=subcategory.category,
+                subcategory=subcategory,
+                difficulty=difficulty,
+                question_text=by_hash[q_hash]["question"],
+                option_a=by_hash[q_hash]["option_a"],
+                option_b=by_hash[q_hash]["option_b"],
+                option_c=by_hash[q_hash]["option_c"],
+                option_d=by_hash[q_hash]["option_d"],
+                correct_answer=by_hash[q_hash]["correct_answer"],
+                explanation=by_hash[q_hash].get("explanation", ""),
+                normalized_hash=q_hash,
+            )
+            for q_hash in new_hashes
+        ],
+        ignore_conflicts=True
+    )
+
+    # bulk_create does not return ids on every backend - resolve them in one query
+    hash_to_id = dict(
+        Question.objects.filter(
+            normalized_hash__in=new_hashes
+        ).values_list('normalized_hash', 'id')
+    )
+
+    return [
+        (by_hash[q_hash], hash_to_id[q_hash])
+        for q_hash in new_hashes
+        if q_hash in hash_to_id
+    ]
+
+
+def mark_questions_used(question_ids):
+    """
+    Bump usage_count and move the questions to new random positions in
+    their pool (see question_sampler) - one UPDATE for all of them.
+    """
+    if not question_ids:
+        return
+
+    Question.objects.filter(id__in=question_ids).update(
+        usage_count=F('usage_count') + 1,
+        random_key=Random()
+    )
+
+
+def create_attempt_questions(quiz_attempt, question_ids):
+    """
+    Create the AttemptQuestion rows for an attempt in one INSERT.
+    `question_ids` is in quiz order; use None for questions that are not
+    in the bank (AI and shared quizzes).
+    """
+    AttemptQuestion.objects.bulk_create([
+        AttemptQuestion(
+            attempt=quiz_attempt,
+            question_id=question_id,
+            question_order=idx,
+            status=AttemptQuestion.STATUS_UNVISITED
+        )
+        for idx, question_id in enumerate(question_ids)
+    ])
+
+
+def save_bank_attempt(quiz_attempt, questions, question_ids):
+    """
+    Persist an assembled bank quiz: usage counts, AttemptQuestion rows,
+    the user's exposures, the question set and the attempt itself, in one
+    transaction. `quiz_attempt` status / ai_meta must already be set.
+    """
+    served_ids = [question_id for question_id in question_ids if question_id]
+
+    with transaction.atomic():
+        mark_questions_used(served_ids)
+
+        AttemptQuestion.objects.filter(attempt=quiz_attempt).delete()
+        create_attempt_questions(quiz_attempt, question_ids)
+
+        # Remember what this user has been served for the next quiz's anti-join
+        record_exposures(quiz_attempt.user, served_ids)
+
+        # Status flips in the same commit as the rows it depends on
+        quiz_attempt.question_set = QuestionSet.for_questions(questions)
+        quiz_attempt.save(update_fields=['question_set', 'status', 'ai_meta'])
+
+    return quiz_attempt
@@ -0,0 +1,193 @@
+# quizzes/quiz_builder.py
+"""
+Assembles the question set for a bank quiz attempt.
+
+Picks unseen questions from the Question bank and tops up with
+AI-generated ones when the bank runs short, then moves the attempt from
+GENERATING to IN_PROGRESS. The bank-only path is cheap enough to run in the
+request; the AI path runs in a background worker (see quizzes/tasks.py).
+"""
+import random
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .ai_service import generate_quiz_questions
+from .models import Concept, QuizAttempt
+from .question_sampler import sample_questions
+from .quiz_assembly import save_bank_attempt, store_generated_questions
+
+
+MAX_AI_RETRIES = 3
+# Questions served to a user within this many days are not repeated
+SEEN_WINDOW_DAYS = 7
+
+
+class QuizGenerationError(Exception):
+    """Raised when not enough questions could be assembled for an attempt."""
+
+
+# shuffle correct options
+def shuffle_mcq(question_dict):
+    """
+    Shuffles MCQ options while keeping correct_answer accurate
+    """
+
+    options = [
+        ('A', question_dict['option_a']),
+        ('B', question_dict['option_b']),
+        ('C', question_dict['option_c']),
+        ('D', question_dict['option_d']),
+    ]
+
+    correct_text = dict(options)[question_dict['correct_answer']]
+
+    random.shuffle(options)
+
+    new_correct = None
+    for idx, (_, text) in enumerate(options):
+        letter = chr(ord('A') + idx)
+        question_dict[f'option_{letter.lower()}'] = text
+        if text == correct_text:
+            new_correct = letter
+
+    question_dict['correct_answer'] = new_correct
+    return question_dict
+
+
+def build_attempt_questions(quiz_attempt, allow_ai=True):
+    """
+    Fill the attempt's question set, create its AttemptQuestion rows and
+    mark it IN_PROGRESS. Raises QuizGenerationError if the bank plus AI
+    could not provide enough unique questions.
+
+    With allow_ai=False only the question bank is used: if the pool
+    cannot cover the quiz, nothing is written and None is returned so
+    the caller can queue the slow AI path instead.
+    """
+    # Already generated (e.g. job retried after the attempt was saved)
+    if quiz_attempt.question_set_id:
+        return quiz_attempt
+
+    REQUIRED_QUESTIONS = quiz_attempt.total_questions  # usually 10
+
+    # (question_dict, Question.id) pairs in the order they were picked
+    picked = []
+
+    # ============================================
+    # STEP 1: Pick random bank questions the user hasn't seen recently
+    # ============================================
+    # Index range scan + anti-join on QuestionExposure (no ORDER BY RANDOM())
+    unseen_questions = sample_questions(
+        quiz_attempt.subcategory,
+        quiz_attempt.difficulty,
+        REQUIRED_QUESTIONS,
+        exclude_seen_by=quiz_attempt.user,
+        seen_since=timezone.now() - timedelta(days=SEEN_WINDOW_DAYS)
+    )
+
+    # Pool too small - leave the attempt untouched for the AI path
+    if not allow_ai and len(unseen_questions) < REQUIRED_QUESTIONS:
+        return None
+
+    for q in unseen_questions:
+        picked.append((format_question(
+            q.question_text, q.option_a, q.option_b, q.option_c, q.option_d,
+            q.correct_answer, q.explanation
+        ), q.id))
+
+    existing_used = len(picked)
+
+    # ============================================
+    # STEP 2: Generate NEW questions if we don't have enough
+    # ============================================
+    if len(picked) < REQUIRED_QUESTIONS:
+        concept_names = list(
+            Concept.objects.filter(
+                subcategory=quiz_attempt.subcategory,
+                difficulty=quiz_attempt.difficulty
+            ).values_list('name', flat=True)
+        )
+        retry_count = 0
+
+        while len(picked) < REQUIRED_QUESTIONS and retry_count < MAX_AI_RETRIES:
+            retry_count += 1
+            questions_needed = REQUIRED_QUESTIONS - len(picked)
+
+            if len(concept_names) < questions_needed:
+                break  # Not enough concepts, use what we have
+
+            # Pick random concepts for new questions
+            selected_concepts = random.sample(concept_names, questions_needed)
+
+            # Generate with AI
+            questions_data = generate_quiz_questions(
+                topic=quiz_attempt.subcategory.name,
+                category=quiz_attempt.category.name,
+                difficulty=quiz_attempt.difficulty,
+                count=questions_needed,
+                concepts=selected_concepts,
+                cache=False  # a cached repeat would only add duplicates to the bank
+            )
+
+            # Brand new questions only (bulk insert); they are unseen by definition
+            stored = store_generated_questions(
+                quiz_attempt.subcategory,
+                quiz_attempt.difficulty,
+                questions_data
+            )
+
+            for q, question_id in stored[:REQUIRED_QUESTIONS - len(picked)]:
+                picked.append((format_question(
+                    q["question"], q["option_a"], q["option_b"], q["option_c"], q["option_d"],
+                    q["correct_answer"], q.get("explanation", "")
+                ), question_id))
+
+    # ============================================
+    # STEP 3: Check if we have enough questions
+    # ============================================
+    if len(picked) < REQUIRED_QUESTIONS:
+        raise QuizGenerationError(
+            f'Could not generate enough unique questions. '
+            f'Got {len(picked)}/{REQUIRED_QUESTIONS}. Try again later.'
+        )
+
+    # Shuffle to mix existing and new questions
+    random.shuffle(picked)
+
+    # Re-number after shuffle
+    for i, (q, _) in enumerate(picked):
+        q['id'] = i + 1
+
+    # ============================================
+    # STEP 4: Save (fixed number of queries, one transaction)
+    # ============================================
+    quiz_attempt.status = QuizAttempt.STATUS_IN_PROGRESS
+    quiz_attempt.ai_meta = {
+        'model': 'gpt-3.5-turbo',
+        'generated_at': timezone.now().isoformat(),
+        'existing_used': existing_used,
+        'newly_generated': REQUIRED_QUESTIONS - existing_used
+    }
+
+    return save_bank_attempt(
+        quiz_attempt,
+        [q for q, _ in picked],
+        [question_id for _, question_id in picked]
+    )
+
+
+def format_question(text, option_a, option_b, option_c, option_d, correct_answer, explanation):
+    """
+    Build the attempt JSON entry for one question, with options shuffled.
+    """
+    return shuffle_mcq({
+        "id": None,
+        "question": text,
+        "option_a": option_a,
+        "option_b": option_b,
+        "option_c": option_c,
+        "option_d": option_d,
+        "correct_answer": correct_answer,
+        "explanation": explanation
+    })
@@ -0,0 +1,222 @@
+# quizzes/quiz_player.py
+"""
+JSON state for the in-page quiz player.
+
+quiz_question.html renders questions client-side: answering a question
+returns everything the next screen needs (question, progress and palette)
+in one response instead of a POST followed by a full show_question load.
+The payload never includes correct_answer or explanation.
+
+With QUIZ_PLAYER_PREFETCH the whole question set is sent once and the
+browser navigates locally, syncing answer/palette changes in numbered
+batches (`apply_answer_batch`). Grading stays on the server.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AttemptQuestion, QuizAttempt
+
+
+# Question fields the browser is allowed to see
+PLAYER_QUESTION_FIELDS = ('question', 'option_a', 'option_b', 'option_c', 'option_d')
+VALID_ANSWERS = ('A', 'B', 'C', 'D')
+# Largest batch seq QuizAttempt.answer_sync_seq can store
+MAX_SYNC_SEQ = 2 ** 31 - 1
+
+
+def record_answer(quiz_attempt, question_order, answer):
+    """
+    Store an answer on its AttemptQuestion row (one UPDATE).
+    Returns whether the answer is correct.
+    """
+    is_correct = answer == quiz_attempt.questions[question_order]['correct_answer']
+
+    AttemptQuestion.objects.filter(
+        attempt=quiz_attempt,
+        question_order=question_order
+    ).update(
+        selected_option=answer,
+        status=AttemptQuestion.STATUS_SOLVED,
+        answered_at=timezone.now(),
+        is_correct=is_correct
+    )
+    return is_correct
+
+
+def mark_visited(quiz_attempt, question_order):
+    """
+    Stamp visited_at the first time a question is shown (one UPDATE).
+    """
+    AttemptQuestion.objects.filter(
+        attempt=quiz_attempt,
+        question_order=question_order,
+        visited_at__isnull=True
+    ).update(visited_at=timezone.now())
+
+
+def question_payload(question, user_answer=None):
+    """
+    Browser-safe copy of one question snapshot entry.
+    """
+    payload = {field: question.get(field, '') for field in PLAYER_QUESTION_FIELDS}
+    payload['user_answer'] = user_answer
+    return payload
+
+
+def player_state(quiz_attempt, attempt_questions):
+    """
+    Current question, progress and palette for the player.
+    `attempt_questions` is the attempt's AttemptQuestion rows, already loaded.
+    """
+    index = quiz_attempt.current_question_index
+    current = quiz_attempt.get_current_question()
+    current_aq = next(
+        (aq for aq in attempt_questions if aq.question_order == index),
+        None
+    )
+
+    return {
+        'question': (
+            question_payload(current, current_aq.selected_option if current_aq else None)
+            if current else None
+        ),
+        'question_index': index,
+        'question_number': index + 1,
+        'total_questions': quiz_attempt.total_questions,
+        'answered_count': sum(1 for aq in attempt_questions if aq.selected_option is not None),
+        'has_prev': index > 0,
+        'palette': [
+            {'order': aq.question_order, 'status': aq.status}
+            for aq in attempt_questions
+        ],
+    }
+
+
+def player_questions(quiz_attempt, attempt_questions):
+    """
+    Every question of the attempt with its answer and palette status,
+    for the prefetch player.
+    """
+    by_order = {aq.question_order: aq for aq in attempt_questions}
+
+    questions = []
+    for idx, question in enumerate(quiz_attempt.questions or []):
+        aq = by_order.get(idx)
+        payload = question_payload(question, aq.selected_option if aq else None)
+        payload['status'] = aq.status if aq else AttemptQuestion.STATUS_UNVISITED
+        payload['visited'] = bool(aq and aq.visited_at)
+        questions.append(payload)
+    return questions
+
+
+def _is_index(value, total_questions):
+    # bool is an int subclass, but true/false are not question numbers
+    return (
+        isinstance(value, int) and not isinstance(value, bool)
+        and 0 <= value < total_questions
+    )
+
+
+def parse_current_index(value, total_questions):
+    """
+    Validate the prefetch player's current question (None if not sent).
+    Raises ValueError on bad input.
+    """
+    if value is not None and not _is_index(value, total_questions):
+        raise ValueError(f"invalid current index: {value!r}")
+    return value
+
+
+def parse_answer_changes(changes, total_questions):
+    """
+    Validate a batch from the prefetch player.
+    Returns {question_order: change}; raises ValueError on bad input.
+    """
+    if not isinstance(changes, list):
+        raise ValueError("changes must be a list")
+
+    valid_statuses = {value for value, _ in AttemptQuestion.STATUS_CHOICES}
+    parsed = {}
+    for change in changes:
+        if not isinstance(change, dict):
+            raise ValueError("each change must be an object")
+
+        order = change.get('order')
+        status = change.get('status')
+        answer = change.get('answer')
+
+        if not _is_index(order, total_questions):
+            raise ValueError(f"invalid question order: {order!r}")
+        if status not in valid_statuses:
+            raise ValueError(f"invalid status: {status!r}")
+        if answer is not None and answer not in VALID_ANSWERS:
+            raise ValueError(f"invalid answer: {answer!r}")
+        if status == AttemptQuestion.STATUS_SOLVED and answer is None:
+            raise ValueError("solved questions need an answer")
+
+        # Later entries for the same question win
+        parsed[order] = {
+            'status': status,
+            'answer': answer,
+            'visited': bool(change.get('visited')),
+        }
+    return parsed
+
+
+def apply_answer_batch(quiz_attempt, seq, changes, current_index=None):
+    """
+    Apply one numbered batch of changes from the prefetch player.
+
+    Batches are idempotent: a batch whose seq is not newer than the last
+    applied one (a retry, or a late duplicate) is ignored. `changes` comes
+    from parse_answer_changes and `current_index` from parse_current_index.
+    Correctness is graded here from the question snapshot, never taken
+    from the browser.
+    Returns True if the batch was applied.
+    """
+    claim = {'answer_sync_seq': seq}
+    if current_index is not None:
+        claim['current_question_index'] = current_index
+
+    with transaction.atomic():
+        # Claiming the seq and writing the rows commit together
+        applied = QuizAttempt.objects.filter(
+            id=quiz_attempt.id,
+            answer_sync_seq__lt=seq
+        ).update(**claim)
+        if not applied:
+            return False
+
+        now = timezone.now()
+        rows = list(AttemptQuestion.objects.filter(
+            attempt=quiz_attempt,
+            question_order__in=list(changes)
+        ))
+        for aq in rows:
+            change = changes[aq.question_order]
+
+            if change['visited'] and aq.visited_at is None:
+                aq.visited_at = now
+
+            if change['status'] == AttemptQuestion.STATUS_SOLVED:
+                if aq.selected_option != change['answer']:
+                    aq.answered_at = now
+                aq.selected_option = change['answer']
+                aq.is_correct = (
+                    change['answer'] == quiz_attempt.questions[aq.question_order]['correct_answer']
+                )
+            elif change['status'] == AttemptQuestion.STATUS_SKIPPED:
+                aq.selected_option = None
+                aq.is_correct = None
+
+            aq.status = change['status']
+
+        AttemptQuestion.objects.bulk_update(
+            rows,
+            ['status', 'selected_option', 'is_correct', 'answered_at', 'visited_at']
+        )
+
+    quiz_attempt.answer_sync_seq = seq
+    if 'current_question_index' in claim:
+        quiz_attempt.current_question_index = claim['current_question_index']
+    return True
@@ -0,0 +1,275 @@
+# quizzes/reports.py
+"""
+Performance report PDFs.
+
+A report is rendered from the user's UserStats row and stored on disk
+under PERFORMANCE_REPORT_ROOT (outside MEDIA_ROOT, so it is only reachable
+through the login-protected download view). The file name is derived
+from the stats' last completion, so a download is served straight from
+disk until the user completes another quiz.
+
+Reports with many topics are rendered by a background job
+(tasks.enqueue_performance_report) instead of inside the request.
+"""
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.timezone import now
+
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+)
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+
+from .user_stats import stats_version, subcategory_rows
+
+
+REPORT_FILENAME = "AI_Quiz_Hub_Performance_Report.pdf"
+
+# Reports with more topic rows than this are rendered in the background
+INLINE_TOPIC_LIMIT = getattr(settings, 'PERFORMANCE_REPORT_INLINE_TOPICS', 50)
+
+report_storage = FileSystemStorage(
+    location=getattr(settings, 'PERFORMANCE_REPORT_ROOT', settings.BASE_DIR / "reports")
+)
+
+
+def report_name(stats):
+    """
+    Storage name of the report for the current state of `stats`.
+    """
+    return f"performance/{stats.user_id}/{stats_version(stats)}.pdf"
+
+
+def _report_version(filename):
+    """
+    (completed_count, last completion in microseconds) of a report file
+    name from report_name() (see stats_version), for ordering; None for
+    any other file.
+    """
+    stamp, _, rest = filename.partition('-')
+    count, _, extension = rest.partition('.')
+    if extension != 'pdf' or not count.isdigit():
+        return None
+    if stamp == 'none':
+        return int(count), -1
+    if not stamp.isdigit():
+        return None
+    return int(count), int(stamp)
+
+
+def cached_report(stats):
+    """
+    Storage name of the up-to-date report, or None if it is not rendered yet.
+    """
+    name = report_name(stats)
+    return name if report_storage.exists(name) else None
+
+
+def is_large_report(stats):
+    return len(stats.by_subcategory) > INLINE_TOPIC_LIMIT
+
+
+def draw_page_layout(canvas, doc):
+    canvas.saveState()
+
+    # Page border
+    canvas.setStrokeColor(colors.grey)
+    canvas.setLineWidth(1)
+    canvas.rect(20, 20, A4[0] - 40, A4[1] - 40)
+
+    # Header
+    canvas.setFont("Helvetica-Bold", 10)
+    canvas.drawString(40, A4[1] - 40, "AI Quiz Hub – Performance Report")
+
+    # Footer
+    canvas.setFont("Helvetica", 9)
+    canvas.setFillColor(colors.grey)
+    canvas.drawCentredString(
+        A4[0] / 2,
+        30,
+        f"Page {doc.page}"
+    )
+
+    canvas.restoreState()
+
+
+def build_performance_pdf(user, stats, fileobj):
+    """
+    Write the user's performance report to a binary file object.
+    """
+    doc = SimpleDocTemplate(
+        fileobj,
+        pagesize=A4,
+        rightMargin=36,
+        leftMargin=36,
+        topMargin=36,
+        bottomMargin=36
+    )
+
+    styles = getSampleStyleSheet()
+
+    styles.add(ParagraphStyle(
+        name="ReportTitle",
+        fontSize=22,
+        alignment=1,
+        spaceAfter=14,
+        textColor=colors.HexColor("#111827"),
+        fontName="Helvetica-Bold"
+    ))
+
+    styles.add(ParagraphStyle(
+        name="SectionTitle",
+        fontSize=14,
+        spaceBefore=16,
+        spaceAfter=8,
+        textColor=colors.HexColor("#1f2937"),
+        fontName="Helvetica-Bold"
+    ))
+
+    styles.add(ParagraphStyle(
+        name="ReportBody",
+        fontSize=10,
+        spaceAfter=6,
+        textColor=colors.black
+    ))
+
+    styles.add(ParagraphStyle(
+        name="MutedText",
+        fontSize=9,
+        textColor=colors.grey,
+        alignment=1
+    ))
+
+    elements = []
+
+    # ---------------- HEADER ----------------
+    elements.append(Paragraph("AI Quiz Hub", styles["ReportTitle"]))
+    elements.append(Paragraph(
+        "Personal Performance Report",
+        styles["MutedText"]
+    ))
+
+    elements.append(Spacer(1, 20))
+
+    elements.append(Paragraph(
+        f"Dear <b>{user.username}</b>,<br/><br/>"
+        "This report provides a detailed overview of your quiz performance, "
+        "accuracy, and topic-wise strengths. Use this insight to track progress "
+        "and identify improvement areas.",
+        styles["BodyText"]
+    ))
+
+    # ---------------- USER INFO ----------------
+    elements.append(Spacer(1, 10))
+    elements.append(Paragraph("User Information", styles["SectionTitle"]))
+
+    elements.append(Spacer(1, 6))
+
+    elements.append(Paragraph(
+        f"<b>Username:</b> {user.username}", styles['Normal']
+    ))
+    elements.append(Paragraph(
+        f"<b>Generated on:</b> {now().strftime('%d %b %Y')}", styles['Normal']
+    ))
+
+    elements.append(Spacer(1, 16))
+
+    # ---------------- SUMMARY ----------------
+    elements.append(Paragraph("Performance Summary", styles["SectionTitle"]))
+
+    elements.append(Spacer(1, 8))
+
+    summary_table = Table([
+        ["Total Quizzes Attempted", stats.completed_count],
+        ["Average Score", f"{round(stats.avg_score, 2)} %"],
+        ["Overall Accuracy", f"{round(stats.accuracy, 2)} %"],
+    ], colWidths=[250, 150])
+
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,-1), colors.whitesmoke),
+        ('GRID', (0,0), (-1,-1), 0.8, colors.grey),
+        ('FONT', (0,0), (-1,-1), 'Helvetica'),
+        ('FONT', (0,0), (0,-1), 'Helvetica-Bold'),
+        ('ALIGN', (1,0), (1,-1), 'RIGHT'),
+        ('PADDING', (0,0), (-1,-1), 10),
+    ]))
+
+    elements.append(summary_table)
+    elements.append(Spacer(1, 20))
+
+    # ---------------- TOPIC TABLE ----------------
+    elements.append(Paragraph("Topic-wise Accuracy", styles["SectionTitle"]))
+
+    elements.append(Spacer(1, 8))
+
+    topic_data = [["Topic", "Accuracy (%)"]]
+
+    for item in subcategory_rows(stats):
+        topic_data.append([item['subcategory'], item['accuracy']])
+
+    # repeatRows keeps the header on every page of a long table
+    topic_table = Table(topic_data, colWidths=[300, 100], repeatRows=1)
+    topic_table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#e5e7eb")),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('ALIGN', (1,1), (1,-1), 'RIGHT'),
+        ('FONT', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('PADDING', (0,0), (-1,-1), 8),
+    ]))
+
+    elements.append(topic_table)
+
+    # ---------------- FOOTER ----------------
+    elements.append(Spacer(1, 30))
+    elements.append(Paragraph(
+        "This report is system-generated and reflects quiz attempts completed on AI Quiz Hub.",
+        styles["MutedText"]
+    ))
+
+    doc.build(
+        elements,
+        onFirstPage=draw_page_layout,
+        onLaterPages=draw_page_layout
+    )
+
+
+def render_report(user, stats):
+    """
+    Render the report for `stats` to storage (unless it already exists),
+    drop the user's older report versions, and return its storage name.
+    """
+    name = report_name(stats)
+    if report_storage.exists(name):
+        return name
+
+    path = report_storage.path(name)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # Rendered next to the report, then renamed over it in one step, so a
+    # half-written report is never served (another worker rendering the
+    # same report meanwhile just replaces it with an identical file)
+    tmp = tempfile.NamedTemporaryFile(dir=directory, prefix='.', suffix='.tmp', delete=False)
+    try:
+        with tmp:
+            build_performance_pdf(user, stats, tmp)
+        os.replace(tmp.name, path)
+    except Exception:
+        os.unlink(tmp.name)
+        raise
+
+    # Only versions older than this one: a render that finishes late with
+    # stale stats must not delete a newer report another request is serving
+    # (in-progress .tmp files have no version and are left alone too)
+    written = _report_version(os.path.basename(path))
+    for filename in os.listdir(directory):
+        version = _report_version(filename)
+        if version is not None and version < written:
+            report_storage.delete(f"{os.path.dirname(name)}/{filename}")
+
+    return name
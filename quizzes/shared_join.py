@@ -0,0 +1,183 @@
+# quizzes/shared_join.py
+"""
+Student join fast path for shared (classroom) quizzes.
+
+When a teacher shares a link, a whole class opens it within seconds.
+Each join used to re-read the SharedQuiz by share code and count the
+student's attempts twice. Here:
+  - `join_payload()`   the quiz fields a join needs (the questions stay in
+                       their QuestionSet, which attempts reference). Fields
+                       that never change after creation (title, creator,
+                       ids) are cached per share code; the ones a teacher
+                       can change (active flag, expiry, attempt and time
+                       limits, question set) come from one indexed query
+                       on the share code every time, so a deactivated,
+                       deleted or edited quiz is seen by every worker at
+                       once, whichever cache backend is configured
+  - `join_state()`     the student's completed count and in-progress
+                       attempt, from one query on their own attempts
+  - `start_attempt()`  the attempt (pointing at the quiz's QuestionSet,
+                       nothing copied), its AttemptQuestion rows and the
+                       shared-quiz link, created in one transaction
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .classroom_live import publish
+from .models import ClassroomEvent, QuizAttempt, SharedQuiz, SharedQuizAttempt
+from .quiz_assembly import create_attempt_questions
+from .streaks import record_activity
+from .user_stats import record_attempt_started
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = getattr(settings, 'SHARED_QUIZ_CACHE_TTL', 300)
+
+
+def _cache_key(share_code):
+    return f"shared_quiz:join:v3:{share_code}"
+
+
+def _fixed_fields(shared_quiz):
+    return {
+        'id': str(shared_quiz.id),
+        'share_code': shared_quiz.share_code,
+        'title': shared_quiz.title,
+        'description': shared_quiz.description,
+        'difficulty': shared_quiz.difficulty,
+        'category_id': shared_quiz.category_id,
+        'subcategory_id': shared_quiz.subcategory_id,
+        'creator_username': shared_quiz.creator.username,
+    }
+
+
+def build_join_payload(shared_quiz):
+    return {
+        **_fixed_fields(shared_quiz),
+        'time_limit_seconds': shared_quiz.time_limit_seconds,
+        'max_attempts': shared_quiz.max_attempts,
+        'expires_at': shared_quiz.expires_at,
+        'question_set_id': shared_quiz.question_set_id,
+        'question_count': shared_quiz.question_set.question_count if shared_quiz.question_set_id else 0,
+    }
+
+
+def join_payload(share_code):
+    """
+    The active quiz behind a share code as a dict, or None.
+    One indexed query for the current settings; the fixed fields are
+    served from the cache after the first join.
+    """
+    current = SharedQuiz.objects.filter(
+        share_code=share_code,
+        is_active=True
+    ).values(
+        'time_limit_seconds', 'max_attempts', 'expires_at', 'question_set_id',
+        question_count=F('question_set__question_count')
+    ).first()
+    if current is None:
+        return None
+    current['question_count'] = current['question_count'] or 0
+
+    key = _cache_key(share_code)
+    try:
+        fixed = cache.get(key)
+    except Exception:
+        logger.exception("Shared quiz cache read failed")
+        fixed = None
+
+    if fixed is None:
+        shared_quiz = SharedQuiz.objects.select_related('creator').filter(share_code=share_code).first()
+        if shared_quiz is None:
+            return None
+        fixed = _fixed_fields(shared_quiz)
+        try:
+            cache.set(key, fixed, CACHE_TTL_SECONDS)
+        except Exception:
+            logger.exception("Shared quiz cache write failed")
+
+    return {**fixed, **current}
+
+
+def invalidate_join_payload(share_code):
+    try:
+        cache.delete(_cache_key(share_code))
+    except Exception:
+        logger.exception("Shared quiz cache delete failed")
+
+
+def is_expired(payload):
+    return bool(payload['expires_at']) and timezone.now() > payload['expires_at']
+
+
+def join_state(payload, user):
+    """
+    (completed_count, in_progress_attempt_id, latest_attempt_id) for the
+    user on this quiz, from one query on the user's attempts.
+    """
+    completed = 0
+    in_progress_id = None
+    latest_id = None
+
+    attempts = QuizAttempt.objects.filter(
+        user=user,
+        shared_quiz_link__shared_quiz_id=payload['id']
+    ).order_by('-shared_quiz_link__accessed_at').values_list('id', 'status')
+
+    for attempt_id, status in attempts:
+        if latest_id is None:
+            latest_id = attempt_id
+        if status == QuizAttempt.STATUS_COMPLETED:
+            completed += 1
+        elif status == QuizAttempt.STATUS_IN_PROGRESS and in_progress_id is None:
+            in_progress_id = attempt_id
+
+    return completed, in_progress_id, latest_id
+
+
+def start_attempt(payload, user):
+    """
+    Create the user's attempt for the quiz, with its AttemptQuestion rows
+    (one bulk INSERT) and shared-quiz link, in one transaction.
+    """
+    question_count = payload['question_count']
+
+    with transaction.atomic():
+        quiz_attempt = QuizAttempt.objects.create(
+            user=user,
+            category_id=payload['category_id'],
+            subcategory_id=payload['subcategory_id'],
+            difficulty=payload['difficulty'],
+            total_questions=question_count,
+            status=QuizAttempt.STATUS_IN_PROGRESS,
+            time_limit_seconds=payload['time_limit_seconds'],
+            remaining_seconds=payload['time_limit_seconds'],
+            # Question sets are immutable, so later edits by the creator
+            # (a new set) do not change an attempt in progress
+            question_set_id=payload['question_set_id'],
+            started_at=timezone.now(),
+            ai_meta={
+                'source': 'shared_quiz',
+                'shared_quiz_id': payload['id'],
+                'shared_by': payload['creator_username'],
+                'topic': payload['title'],
+            }
+        )
+
+        create_attempt_questions(quiz_attempt, [None] * question_count)
+
+        SharedQuizAttempt.objects.create(
+            shared_quiz_id=payload['id'],
+            attempt=quiz_attempt
+        )
+        record_attempt_started(user)
+        record_activity(user.pk)
+        publish(quiz_attempt, ClassroomEvent.KIND_JOINED)
+
+    return quiz_attempt
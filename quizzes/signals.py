@@ -0,0 +1,14 @@
+# quizzes/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import SharedQuiz
+from .shared_join import invalidate_join_payload
+
+
+@receiver(post_save, sender=SharedQuiz)
+@receiver(post_delete, sender=SharedQuiz)
+def drop_cached_join_payload(sender, instance, **kwargs):
+    # Only the fixed fields are cached and join_payload() reads the rest
+    # live, so this just keeps an admin title edit from lingering here
+    invalidate_join_payload(instance.share_code)
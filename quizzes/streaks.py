@@ -0,0 +1,134 @@
+# quizzes/streaks.py
+"""
+Daily quiz streaks.
+
+A day counts as active when the user starts or completes an attempt on
+it, in the user's time zone. The streak is stored on the user
+(current_streak, longest_streak, last_active_date) and advanced by
+`record_activity()`, so reading it costs no queries.
+
+`streak_from_history()` recomputes it from QuizAttempt with one query
+(distinct active dates, walked in Python). It backfills users and is
+used by the rebuild_user_stats command.
+"""
+from datetime import timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import QuizAttempt
+
+
+def user_timezone(user):
+    """
+    The user's tzinfo (settings.TIME_ZONE if unset or invalid).
+    """
+    if user.time_zone:
+        try:
+            return ZoneInfo(user.time_zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return timezone.get_default_timezone()
+
+
+def user_today(user):
+    return timezone.localdate(timezone=user_timezone(user))
+
+
+def current_streak(user):
+    """
+    Consecutive active days ending today (0 if the user has not been
+    active today). Reads only fields already on the user.
+    """
+    if user.last_active_date == user_today(user):
+        return user.current_streak
+    return 0
+
+
+def record_activity(user_id, when=None):
+    """
+    Mark the day of `when` (default now) as active and advance the streak.
+    """
+    User = get_user_model()
+
+    with transaction.atomic():
+        user = User.objects.select_for_update().only(
+            'time_zone', 'current_streak', 'longest_streak', 'last_active_date'
+        ).get(pk=user_id)
+
+        day = timezone.localtime(when or timezone.now(), user_timezone(user)).date()
+        last = user.last_active_date
+
+        if last is not None and day <= last:
+            # Already counted today (or an out-of-order event)
+            return
+
+        if last is not None and day - last == timedelta(days=1):
+            streak = user.current_streak + 1
+        else:
+            streak = 1
+
+        User.objects.filter(pk=user_id).update(
+            current_streak=streak,
+            longest_streak=max(user.longest_streak, streak),
+            last_active_date=day
+        )
+
+
+def compute_streaks(active_dates):
+    """
+    (current_streak, longest_streak, last_active_date) for a collection of
+    dates. current_streak is the run ending at the latest date.
+    """
+    current = longest = 0
+    previous = None
+
+    for day in sorted(set(active_dates)):
+        if previous is not None and day - previous == timedelta(days=1):
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        previous = day
+
+    return current, longest, previous
+
+
+def active_dates(user):
+    """
+    Distinct days on which the user started or completed an attempt (one query).
+    """
+    tz = user_timezone(user)
+    attempts = QuizAttempt.objects.filter(user=user)
+
+    started = attempts.exclude(started_at__isnull=True).annotate(
+        day=TruncDate('started_at', tzinfo=tz)
+    ).order_by().values_list('day', flat=True)
+    completed = attempts.exclude(completed_at__isnull=True).annotate(
+        day=TruncDate('completed_at', tzinfo=tz)
+    ).order_by().values_list('day', flat=True)
+
+    return set(started.union(completed))
+
+
+def streak_from_history(user, save=True):
+    """
+    Recompute the user's streak fields from their attempts.
+    Returns (current_streak, longest_streak, last_active_date).
+    """
+    current, longest, last = compute_streaks(active_dates(user))
+
+    if save:
+        get_user_model().objects.filter(pk=user.pk).update(
+            current_streak=current,
+            longest_streak=longest,
+            last_active_date=last
+        )
+        user.current_streak = current
+        user.longest_streak = longest
+        user.last_active_date = last
+
+    return current, longest, last
@@ -0,0 +1,162 @@
+# quizzes/tasks.py
+"""
+Background job handlers. Imported from QuizzesConfig.ready() so every
+process (web and run_jobs workers) has the same handler registry.
+"""
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .ai_feedback_service import generate_ai_feedback
+from .feedback import feedback_summary
+from .jobs import enqueue, job_handler
+from .models import QuizAttempt, SubCategory
+from .question_pool import POOL_LOW_WATER_MARK, pool_size, refill_pool
+from .quiz_builder import build_attempt_questions
+from .reports import render_report
+from .user_stats import get_user_stats, record_abandon
+
+
+JOB_GENERATE_QUESTIONS = "generate_questions"
+JOB_REFILL_POOL = "refill_question_pool"
+JOB_AI_FEEDBACK = "generate_ai_feedback"
+JOB_PERFORMANCE_REPORT = "performance_report"
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_question_generation(quiz_attempt):
+    """
+    Queue question generation for an attempt (idempotent per attempt).
+    """
+    return enqueue(
+        JOB_GENERATE_QUESTIONS,
+        payload={"attempt_id": str(quiz_attempt.id)},
+        dedupe_key=f"{JOB_GENERATE_QUESTIONS}:{quiz_attempt.id}",
+    )
+
+
+@job_handler(JOB_GENERATE_QUESTIONS)
+def generate_questions_job(payload):
+    quiz_attempt = QuizAttempt.objects.select_related(
+        'user', 'category', 'subcategory'
+    ).filter(id=payload["attempt_id"]).first()
+
+    # Attempt deleted or quit while waiting in the queue
+    if not quiz_attempt or quiz_attempt.status != QuizAttempt.STATUS_GENERATING:
+        return
+
+    try:
+        build_attempt_questions(quiz_attempt)
+    except Exception as e:
+        quiz_attempt.status = QuizAttempt.STATUS_ABANDONED
+        quiz_attempt.ai_meta = {
+            **(quiz_attempt.ai_meta or {}),
+            'generation_error': str(e),
+        }
+        with transaction.atomic():
+            quiz_attempt.save(update_fields=['status', 'ai_meta'])
+            record_abandon(quiz_attempt)
+        raise
+
+    # Top the pool back up so the next quiz start is served from the bank
+    request_pool_refill_if_low(quiz_attempt.subcategory, quiz_attempt.difficulty)
+
+
+def enqueue_pool_refill(subcategory_id, difficulty, target_size=None):
+    """
+    Queue a refill for one pool up to `target_size` (default
+    QUESTION_POOL_TARGET_SIZE). At most one refill per pool is pending;
+    if one already is, it keeps its own target.
+    """
+    payload = {"subcategory_id": subcategory_id, "difficulty": difficulty}
+    if target_size is not None:
+        payload["target_size"] = target_size
+
+    return enqueue(
+        JOB_REFILL_POOL,
+        payload=payload,
+        dedupe_key=f"{JOB_REFILL_POOL}:{subcategory_id}:{difficulty}",
+    )
+
+
+def request_pool_refill_if_low(subcategory, difficulty):
+    if subcategory and pool_size(subcategory, difficulty) < POOL_LOW_WATER_MARK:
+        enqueue_pool_refill(subcategory.id, difficulty)
+
+
+@job_handler(JOB_REFILL_POOL)
+def refill_pool_job(payload):
+    subcategory = SubCategory.objects.select_related('category').filter(
+        id=payload["subcategory_id"]
+    ).first()
+
+    if subcategory:
+        refill_pool(subcategory, payload["difficulty"], target_size=payload.get("target_size"))
+
+
+def enqueue_ai_feedback(quiz_attempt):
+    """
+    Queue AI feedback for a completed attempt (once per attempt).
+    """
+    return enqueue(
+        JOB_AI_FEEDBACK,
+        payload={"attempt_id": str(quiz_attempt.id)},
+        dedupe_key=f"{JOB_AI_FEEDBACK}:{quiz_attempt.id}",
+    )
+
+
+def request_ai_feedback(quiz_attempt):
+    """
+    Mark the attempt's feedback as pending and queue it, unless it was
+    already requested.
+    """
+    updated = QuizAttempt.objects.filter(
+        id=quiz_attempt.id,
+        ai_feedback_status=QuizAttempt.FEEDBACK_NONE
+    ).update(ai_feedback_status=QuizAttempt.FEEDBACK_PENDING)
+
+    if updated:
+        quiz_attempt.ai_feedback_status = QuizAttempt.FEEDBACK_PENDING
+        enqueue_ai_feedback(quiz_attempt)
+
+
+@job_handler(JOB_AI_FEEDBACK)
+def generate_feedback_job(payload):
+    quiz_attempt = QuizAttempt.objects.select_related(
+        'category', 'subcategory', 'question_set'
+    ).filter(id=payload["attempt_id"]).first()
+
+    if not quiz_attempt or quiz_attempt.ai_feedback_status == QuizAttempt.FEEDBACK_READY:
+        return
+
+    try:
+        feedback = generate_ai_feedback(str(feedback_summary(quiz_attempt)))
+    except Exception:
+        logger.exception("AI feedback failed for attempt %s", quiz_attempt.id)
+        quiz_attempt.ai_feedback_status = QuizAttempt.FEEDBACK_FAILED
+        quiz_attempt.save(update_fields=['ai_feedback_status'])
+        raise
+
+    quiz_attempt.ai_feedback = feedback
+    quiz_attempt.ai_feedback_status = QuizAttempt.FEEDBACK_READY
+    quiz_attempt.save(update_fields=['ai_feedback', 'ai_feedback_status'])
+
+
+def enqueue_performance_report(user):
+    """
+    Queue rendering of the user's performance report (one pending job per user).
+    """
+    return enqueue(
+        JOB_PERFORMANCE_REPORT,
+        payload={"user_id": user.pk},
+        dedupe_key=f"{JOB_PERFORMANCE_REPORT}:{user.pk}",
+    )
+
+
+@job_handler(JOB_PERFORMANCE_REPORT)
+def performance_report_job(payload):
+    user = get_user_model().objects.filter(pk=payload["user_id"]).first()
+    if user:
+        render_report(user, get_user_stats(user))
@@ -1,3 +1,226 @@
-from django.test import TestCase
+import io
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.db import IntegrityError, OperationalError, connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from openpyxl import load_workbook
+
+from accounts.models import User
+from .classroom_export import stream_csv, write_xlsx
+from .models import (
+    AttemptQuestion, Category, Concept, Question, QuestionSet, QuizAttempt, SharedQuiz,
+    SharedQuizAttempt, SubCategory
+)
+from .quiz_builder import build_attempt_questions
+from .quiz_player import parse_answer_changes, parse_current_index
+
+
+def make_question_data(text):
+    return {
+        "question": text,
+        "option_a": "a",
+        "option_b": "b",
+        "option_c": "c",
+        "option_d": "d",
+        "correct_answer": "A",
+        "explanation": "",
+    }
+
+
+class QuizAssemblyQueryCountTests(TestCase):
+    """
+    Starting a quiz costs the same number of queries whatever its size.
+    """
+    SIZES = (5, 10, 30)
+    BANK_QUERIES = 12
+    AI_QUERIES = 18
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='assembler', email='assembler@example.com', password='pw-12345!')
+        cls.category = Category.objects.create(name='Science')
+        cls.bank = SubCategory.objects.create(category=cls.category, name='Biology')
+        cls.empty = SubCategory.objects.create(category=cls.category, name='Chemistry')
+
+        Question.objects.bulk_create([
+            Question(
+                category=cls.category,
+                subcategory=cls.bank,
+                difficulty='easy',
+                question_text=f'Bank question {i}?',
+                option_a='a', option_b='b', option_c='c', option_d='d',
+                correct_answer='A',
+                explanation='',
+                normalized_hash=Question.make_hash(f'Bank question {i}?'),
+            )
+            for i in range(sum(cls.SIZES))
+        ])
+        Concept.objects.bulk_create([
+            Concept(subcategory=cls.empty, difficulty='easy', name=f'Concept {i}')
+            for i in range(max(cls.SIZES))
+        ])
+
+    def new_attempt(self, subcategory, size):
+        attempt = QuizAttempt.objects.create(
+            user=self.user,
+            category=self.category,
+            subcategory=subcategory,
+            difficulty='easy',
+            total_questions=size
+        )
+        return QuizAttempt.objects.select_related('user', 'category', 'subcategory').get(id=attempt.id)
+
+    def assert_attempt_rows(self, attempt, size, from_bank):
+        rows = list(AttemptQuestion.objects.filter(attempt=attempt).order_by('question_order'))
+        self.assertEqual([row.question_order for row in rows], list(range(size)))
+        self.assertTrue(all(row.status == AttemptQuestion.STATUS_UNVISITED for row in rows))
+        self.assertTrue(all(row.question_id is not None for row in rows))
+        self.assertEqual(len({row.question_id for row in rows}), size)
+
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.status, QuizAttempt.STATUS_IN_PROGRESS)
+        self.assertEqual(len(attempt.questions), size)
+        self.assertEqual(attempt.ai_meta['existing_used'], size if from_bank else 0)
+
+    # Pivot 0: the sampler's first index range always covers the pool
+    @mock.patch('quizzes.question_sampler.random.random', return_value=0.0)
+    def test_bank_quiz_query_count_is_fixed(self, _):
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                attempt = self.new_attempt(self.bank, size)
+                with self.assertNumQueries(self.BANK_QUERIES):
+                    build_attempt_questions(attempt, allow_ai=False)
+                self.assert_attempt_rows(attempt, size, from_bank=True)
+
+    def test_ai_quiz_query_count_is_fixed(self):
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                generated = [make_question_data(f'Generated {size} question {i}?') for i in range(size)]
+                attempt = self.new_attempt(self.empty, size)
+                with mock.patch('quizzes.quiz_builder.generate_quiz_questions', return_value=generated):
+                    with self.assertNumQueries(self.AI_QUERIES):
+                        build_attempt_questions(attempt)
+                self.assert_attempt_rows(attempt, size, from_bank=False)
+
+
+class ShareCodeAllocationTests(TransactionTestCase):
+    """
+    SharedQuiz.save draws a code and lets the unique index reject duplicates.
+    """
+    THREADS = 8
+    QUIZZES_PER_THREAD = 250
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='teacher', email='teacher@example.com', password='pw-12345!')
+
+    def test_parallel_creates_get_unique_codes(self):
+        errors = []
+
+        def create_quiz(i):
+            while True:
+                try:
+                    return SharedQuiz.objects.create(creator=self.teacher, title=f'Quiz {i}')
+                except OperationalError as e:
+                    # SQLite's shared in-memory test database fails a
+                    # concurrent writer at once instead of waiting for it
+                    if 'locked' not in str(e):
+                        raise
+
+        def create_quizzes():
+            try:
+                for i in range(self.QUIZZES_PER_THREAD):
+                    create_quiz(i)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=create_quizzes) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        codes = list(SharedQuiz.objects.values_list('share_code', flat=True))
+        self.assertEqual(len(codes), self.THREADS * self.QUIZZES_PER_THREAD)
+        self.assertEqual(len(set(codes)), len(codes))
+
+    def test_collision_is_retried(self):
+        taken = SharedQuiz.objects.create(creator=self.teacher, title='First')
+
+        with mock.patch.object(
+            SharedQuiz, 'new_share_code', side_effect=[taken.share_code, 'FRESH123']
+        ) as new_share_code:
+            quiz = SharedQuiz.objects.create(creator=self.teacher, title='Second')
+
+        self.assertEqual(new_share_code.call_count, 2)
+        self.assertEqual(quiz.share_code, 'FRESH123')
+        self.assertTrue(SharedQuiz.objects.filter(pk=quiz.pk, share_code='FRESH123').exists())
+
+    def test_gives_up_after_retry_limit(self):
+        taken = SharedQuiz.objects.create(creator=self.teacher, title='First')
+
+        with mock.patch.object(SharedQuiz, 'new_share_code', return_value=taken.share_code) as new_share_code:
+            with self.assertRaises(IntegrityError):
+                SharedQuiz.objects.create(creator=self.teacher, title='Second')
+
+        self.assertEqual(new_share_code.call_count, SharedQuiz.SHARE_CODE_ATTEMPTS)
+        self.assertEqual(SharedQuiz.objects.count(), 1)
+
+
+class AnswerBatchValidationTests(SimpleTestCase):
+    """
+    Question numbers from the prefetch player must be in-range ints.
+    """
+    def test_current_index(self):
+        self.assertIsNone(parse_current_index(None, 5))
+        self.assertEqual(parse_current_index(4, 5), 4)
+        for value in (True, False, -1, 5, '2', 2.0, [1]):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_current_index(value, 5)
+
+    def test_change_order(self):
+        def change(order):
+            return [{'order': order, 'status': AttemptQuestion.STATUS_SOLVED, 'answer': 'A'}]
+
+        self.assertEqual(list(parse_answer_changes(change(1), 5)), [1])
+        for order in (True, -1, 5, '1'):
+            with self.subTest(order=order):
+                with self.assertRaises(ValueError):
+                    parse_answer_changes(change(order), 5)
+
+
+class ClassroomExportFormulaTests(TestCase):
+    """
+    Participant-supplied text is never exported as a spreadsheet formula.
+    """
+    NAME = '=HYPERLINK("http://example.com","x")'
+
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user(username='exporter', email='exporter@example.com', password='pw-12345!')
+        student = User.objects.create_user(
+            username='-student', email='student@example.com', password='pw-12345!', full_name=cls.NAME
+        )
+        cls.shared_quiz = SharedQuiz.objects.create(
+            creator=teacher,
+            title='Export',
+            question_set=QuestionSet.for_questions([make_question_data('Exported?')])
+        )
+        attempt = QuizAttempt.objects.create(user=student, difficulty='easy', total_questions=1)
+        SharedQuizAttempt.objects.create(shared_quiz=cls.shared_quiz, attempt=attempt)
+
+    def test_csv(self):
+        content = ''.join(stream_csv(self.shared_quiz))
+        self.assertIn(f"'{self.NAME}".replace('"', '""'), content)
+        self.assertIn(",'-student,", content)
+
+    def test_xlsx(self):
+        fileobj = io.BytesIO()
+        write_xlsx(self.shared_quiz, fileobj)
+        fileobj.seek(0)
+        row = next(load_workbook(fileobj).active.iter_rows(min_row=2, values_only=True))
+        self.assertEqual(row[:2], (f"'{self.NAME}", "'-student"))
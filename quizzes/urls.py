@@ -24,10 +24,14 @@ urlpatterns = [
     path('quiz/pre-start/',views.pre_start_quiz,name='pre_start_quiz'),
     path("start/<int:subcategory_id>/<str:difficulty>/",views.start_quiz,name="start_quiz"),
     path("attempt/<uuid:attempt_id>/generate/", views.generate_questions, name="generate_questions"),
+    path("attempt/<uuid:attempt_id>/generate/status/", views.generation_status, name="generation_status"),
     path("attempt/<uuid:attempt_id>/question/", views.show_question, name="show_question"),
     path("attempt/<uuid:attempt_id>/submit/", views.submit_answer, name="submit_answer"),
+    path("attempt/<uuid:attempt_id>/api/answer/", views.answer_question_api, name="answer_question_api"),
+    path("attempt/<uuid:attempt_id>/api/sync/", views.sync_answers_api, name="sync_answers_api"),
     path("attempt/<uuid:attempt_id>/auto-submit/", views.auto_submit_quiz, name="auto_submit_quiz"),
     path("attempt/<uuid:attempt_id>/results/", views.quiz_results, name="quiz_results"),
+    path("attempt/<uuid:attempt_id>/results/feedback/", views.feedback_status, name="feedback_status"),
     # ============================================================
     # Performance & Analytics
     # ============================================================
@@ -90,6 +94,8 @@ urlpatterns = [
     path("classroom/my-quizzes/", views.my_classroom_quizzes, name="my_classroom_quizzes"),
     path("classroom/<uuid:quiz_id>/share/", views.share_classroom_quiz, name="share_classroom_quiz"),
     path("classroom/<uuid:quiz_id>/results/", views.classroom_quiz_results, name="classroom_quiz_results"),
+    path("classroom/<uuid:quiz_id>/live/", views.classroom_quiz_live, name="classroom_quiz_live"),
+    path("classroom/<uuid:quiz_id>/export/<str:fmt>/", views.classroom_quiz_export, name="classroom_quiz_export"),
     path("classroom/<uuid:quiz_id>/toggle/", views.toggle_shared_quiz_status, name="toggle_shared_quiz"),
     path("classroom/<uuid:quiz_id>/delete/", views.delete_shared_quiz, name="delete_shared_quiz"),
     
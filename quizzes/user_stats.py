@@ -0,0 +1,315 @@
+# quizzes/user_stats.py
+"""
+Per-user statistics rollup (UserStats).
+
+The dashboard, performance page, PDF report, attempts summary and profile
+used to re-aggregate the user's whole QuizAttempt history on every
+request. The same numbers are now kept as running counters, updated in
+the transaction that changes the attempt:
+  - record_attempt_started()  when an attempt is created
+  - record_completion()       from finalize_quiz_attempt
+  - record_abandon()          from quit_quiz / failed generation
+
+`rebuild_user_stats()` recomputes a row from history. It backs the
+`rebuild_user_stats` management command (run it once after deploying to
+fill in existing users) and runs the first time a user without a row is
+read or updated.
+"""
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import QuizAttempt, UserStats
+
+
+# Fields of a completed attempt that the rollup needs
+COMPLETION_FIELDS = (
+    'category_id', 'category__name', 'subcategory_id', 'subcategory__name',
+    'difficulty', 'score', 'correct_answers', 'attempted_questions',
+    'time_taken_seconds', 'completed_at',
+)
+
+
+def _bucket(buckets, key, name=None):
+    bucket = buckets.get(key)
+    if bucket is None:
+        bucket = buckets[key] = {'n': 0, 'score': 0.0, 'correct': 0, 'attempted': 0}
+    if name is not None:
+        bucket['name'] = name
+    return bucket
+
+
+def _add(bucket, row):
+    bucket['n'] += 1
+    bucket['score'] += row['score']
+    bucket['correct'] += row['correct_answers']
+    bucket['attempted'] += row['attempted_questions']
+
+
+def _completion_row(quiz_attempt):
+    """
+    A completed attempt in the shape of a COMPLETION_FIELDS values() row.
+    """
+    return {
+        'category_id': quiz_attempt.category_id,
+        'category__name': quiz_attempt.category.name if quiz_attempt.category_id else None,
+        'subcategory_id': quiz_attempt.subcategory_id,
+        'subcategory__name': quiz_attempt.subcategory.name if quiz_attempt.subcategory_id else None,
+        'difficulty': quiz_attempt.difficulty,
+        'score': quiz_attempt.score,
+        'correct_answers': quiz_attempt.correct_answers,
+        'attempted_questions': quiz_attempt.attempted_questions,
+        'time_taken_seconds': quiz_attempt.time_taken_seconds,
+        'completed_at': quiz_attempt.completed_at,
+    }
+
+
+def _apply_completion(stats, row):
+    """
+    Fold one completed attempt into the counters (in memory).
+    """
+    score = row['score'] or 0
+    row = {
+        **row,
+        'score': score,
+        'correct_answers': row['correct_answers'] or 0,
+        'attempted_questions': row['attempted_questions'] or 0,
+    }
+
+    stats.completed_count += 1
+    stats.score_sum += score
+    stats.best_score = score if stats.best_score is None else max(stats.best_score, score)
+    stats.worst_score = score if stats.worst_score is None else min(stats.worst_score, score)
+    stats.correct_sum += row['correct_answers']
+    stats.attempted_sum += row['attempted_questions']
+    stats.time_taken_sum += row['time_taken_seconds'] or 0
+    if row['completed_at'] and (
+        stats.last_completed_at is None or row['completed_at'] > stats.last_completed_at
+    ):
+        stats.last_completed_at = row['completed_at']
+
+    category_key = str(row['category_id'] or '')
+    _add(_bucket(stats.by_difficulty, row['difficulty']), row)
+    _add(_bucket(stats.by_category, category_key, row['category__name']), row)
+    if row['subcategory_id']:
+        _add(_bucket(stats.by_subcategory, str(row['subcategory_id']), row['subcategory__name']), row)
+
+    if row['completed_at']:
+        day_key = timezone.localdate(row['completed_at']).isoformat()
+        day = _bucket(stats.daily, day_key)
+        _add(day, row)
+        day_categories = day.setdefault('cat', {})
+        day_categories[category_key] = day_categories.get(category_key, 0) + 1
+        day_difficulty = day.setdefault('diff', {}).setdefault(row['difficulty'], {'n': 0, 'score': 0.0})
+        day_difficulty['n'] += 1
+        day_difficulty['score'] += score
+
+
+def rebuild_user_stats(user):
+    """
+    Recompute a user's UserStats from their attempt history and save it.
+    """
+    # Make sure the row exists first: two first requests for a user both
+    # get here, and get_or_create re-reads the row when the other's insert
+    # wins instead of failing on the unique user
+    UserStats.objects.get_or_create(user=user)
+
+    with transaction.atomic():
+        # Hold the row while recounting so a concurrent completion is
+        # applied after the rebuild instead of being overwritten by it
+        stats = UserStats.objects.select_for_update().get(user=user)
+
+        attempts = QuizAttempt.objects.filter(user=user)
+        counts = attempts.aggregate(
+            started=Count('id'),
+            abandoned=Count('id', filter=Q(status=QuizAttempt.STATUS_ABANDONED)),
+            timeup=Count('id', filter=Q(
+                is_auto_submitted=True,
+                auto_submit_reason=QuizAttempt.AUTO_SUBMIT_TIME_UP
+            )),
+            tabswitch=Count('id', filter=Q(
+                is_auto_submitted=True,
+                auto_submit_reason=QuizAttempt.AUTO_SUBMIT_TAB_SWITCH
+            )),
+        )
+
+        stats.attempts_started = counts['started']
+        stats.abandoned_count = counts['abandoned']
+        stats.timeup_auto_count = counts['timeup']
+        stats.tabswitch_auto_count = counts['tabswitch']
+
+        stats.completed_count = 0
+        stats.score_sum = 0.0
+        stats.best_score = None
+        stats.worst_score = None
+        stats.correct_sum = 0
+        stats.attempted_sum = 0
+        stats.time_taken_sum = 0
+        stats.last_completed_at = None
+        stats.by_difficulty = {}
+        stats.by_category = {}
+        stats.by_subcategory = {}
+        stats.daily = {}
+
+        completed = attempts.filter(status=QuizAttempt.STATUS_COMPLETED).values(*COMPLETION_FIELDS)
+        for row in completed.iterator(chunk_size=500):
+            _apply_completion(stats, row)
+
+        stats.save()
+    return stats
+
+
+def get_user_stats(user):
+    """
+    The user's UserStats row, built from history on first access.
+    """
+    stats = UserStats.objects.filter(user=user).first()
+    if stats is None:
+        stats = rebuild_user_stats(user)
+    return stats
+
+
+def record_attempt_started(user):
+    """
+    Count a newly created attempt (call after it is saved).
+    """
+    updated = UserStats.objects.filter(user=user).update(
+        attempts_started=F('attempts_started') + 1
+    )
+    if not updated:
+        # First attempt, or a user from before the rollup - the rebuild counts it
+        rebuild_user_stats(user)
+
+
+def record_completion(quiz_attempt, previous_status=None):
+    """
+    Fold a just-completed attempt into its user's stats.
+    Call inside the transaction that marks the attempt completed, exactly
+    once per attempt. `previous_status` is the status it had before.
+    """
+    with transaction.atomic():
+        stats = UserStats.objects.select_for_update().filter(user_id=quiz_attempt.user_id).first()
+        if stats is None:
+            # The rebuild already sees this attempt as completed
+            rebuild_user_stats(quiz_attempt.user)
+            return
+
+        _apply_completion(stats, _completion_row(quiz_attempt))
+
+        if previous_status == QuizAttempt.STATUS_ABANDONED and stats.abandoned_count:
+            stats.abandoned_count -= 1
+
+        if quiz_attempt.is_auto_submitted:
+            if quiz_attempt.auto_submit_reason == QuizAttempt.AUTO_SUBMIT_TIME_UP:
+                stats.timeup_auto_count += 1
+            elif quiz_attempt.auto_submit_reason == QuizAttempt.AUTO_SUBMIT_TAB_SWITCH:
+                stats.tabswitch_auto_count += 1
+
+        stats.save()
+
+
+def record_abandon(quiz_attempt):
+    """
+    Count an attempt that was just marked abandoned.
+    """
+    updated = UserStats.objects.filter(user_id=quiz_attempt.user_id).update(
+        abandoned_count=F('abandoned_count') + 1
+    )
+    if not updated:
+        rebuild_user_stats(quiz_attempt.user)
+
+
+# ------------------------------------------------------------
+# Reading the rollup
+# ------------------------------------------------------------
+
+def stats_version(stats):
+    """
+    A string that changes whenever the user completes another quiz, for
+    keying anything derived from the rollup.
+    """
+    if stats.last_completed_at:
+        return f"{int(stats.last_completed_at.timestamp() * 1000000)}-{stats.completed_count}"
+    return f"none-{stats.completed_count}"
+
+
+def difficulty_rows(stats):
+    """
+    [{'difficulty', 'quizzes', 'avg_score'}] ordered by difficulty.
+    """
+    return [
+        {
+            'difficulty': difficulty,
+            'quizzes': bucket['n'],
+            'avg_score': bucket['score'] / bucket['n'] if bucket['n'] else 0,
+        }
+        for difficulty, bucket in sorted(stats.by_difficulty.items())
+    ]
+
+
+def category_rows(stats, include_unknown=True):
+    """
+    [{'category__name', 'quizzes', 'avg_score'}] ordered by quiz count.
+    """
+    rows = [
+        {
+            'category__name': bucket.get('name'),
+            'quizzes': bucket['n'],
+            'avg_score': bucket['score'] / bucket['n'] if bucket['n'] else 0,
+        }
+        for key, bucket in stats.by_category.items()
+        if key or include_unknown
+    ]
+    rows.sort(key=lambda row: -row['quizzes'])
+    return rows
+
+
+def subcategory_rows(stats):
+    """
+    [{'subcategory', 'accuracy'}] for every subcategory with attempted questions.
+    """
+    return [
+        {
+            'subcategory': bucket.get('name'),
+            'accuracy': round((bucket['correct'] / bucket['attempted']) * 100, 2),
+        }
+        for bucket in stats.by_subcategory.values()
+        if bucket['attempted']
+    ]
+
+
+def daily_rows(stats):
+    """
+    [{'date', 'count', 'avg_score'}] for every day with a completed quiz, oldest first.
+    """
+    return [
+        {
+            'date': date.fromisoformat(day_key),
+            'count': bucket['n'],
+            'avg_score': bucket['score'] / bucket['n'] if bucket['n'] else 0,
+        }
+        for day_key, bucket in sorted(stats.daily.items())
+    ]
+
+
+def window_days(days):
+    """
+    The last `days` local dates, oldest first (today included).
+    """
+    today = timezone.localdate()
+    return [today - timedelta(days=days - 1 - i) for i in range(days)]
+
+
+def window_totals(stats, days):
+    """
+    Completed-quiz count and score sum over the last `days` days: {'count', 'score'}.
+    """
+    totals = {'count': 0, 'score': 0.0}
+    for day in window_days(days):
+        bucket = stats.daily.get(day.isoformat())
+        if bucket:
+            totals['count'] += bucket['n']
+            totals['score'] += bucket['score']
+    return totals
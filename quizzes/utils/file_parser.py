@@ -1,17 +1,61 @@
 # quizzes/utils/file_parser.py
+"""
+Text extraction for documents uploaded to the AI quiz generator.
+
+Only the first few thousand characters of a document reach the prompt,
+so extraction is lazy and budgeted:
+  - `iter_pdf_pages()`          yields page texts in order, parsing each
+                                page only when asked for it
+  - `extract_text_from_file()`  stops reading once `max_chars` characters
+                                are collected
+
+PDFs with at least DOCUMENT_PARSE_PARALLEL_PAGES pages can be parsed by
+a pool of DOCUMENT_PARSE_WORKERS processes (0 = in the request
+process). Workers take consecutive page ranges, results come back in
+page order, and no new ranges are handed out once the budget is met.
+"""
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import pdfplumber
+from django.conf import settings
 from docx import Document
 
 
-def extract_text_from_file(uploaded_file):
+PARSE_WORKERS = getattr(settings, 'DOCUMENT_PARSE_WORKERS', 0)
+PARALLEL_MIN_PAGES = getattr(settings, 'DOCUMENT_PARSE_PARALLEL_PAGES', 50)
+# Pages per task handed to a worker
+PAGES_PER_TASK = 16
+
+# Worker count -> process pool, created on first use and kept for reuse
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _process_pool(workers):
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def extract_text_from_file(uploaded_file, max_chars=None):
+    """
+    The document's text. With `max_chars`, reading stops as soon as at
+    least that many characters are collected (the result may run a
+    little over; the caller truncates).
+    """
     file_name = uploaded_file.name.lower()
 
     if file_name.endswith(".pdf"):
-        return extract_pdf_text(uploaded_file)
+        return extract_pdf_text(uploaded_file, max_chars)
 
     elif file_name.endswith(".docx"):
-        return extract_docx_text(uploaded_file)
+        return extract_docx_text(uploaded_file, max_chars)
 
     elif file_name.endswith(".txt"):
         return uploaded_file.read().decode("utf-8")
@@ -20,16 +64,99 @@ def extract_text_from_file(uploaded_file):
         raise ValueError("Unsupported file type")
 
 
-def extract_pdf_text(uploaded_file):
-    text = ""
-    with pdfplumber.open(uploaded_file) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
+def _take(texts, max_chars):
+    parts = []
+    collected = 0
+    for text in texts:
+        if not text:
+            continue
+        parts.append(text)
+        collected += len(text) + 1
+        if max_chars is not None and collected >= max_chars:
+            break
+    return "\n".join(parts)
+
 
+def extract_pdf_text(uploaded_file, max_chars=None, workers=None):
+    pages = iter_pdf_pages(uploaded_file, workers)
+    try:
+        return _take(pages, max_chars)
+    finally:
+        # Stop the generator now: closes the PDF and cancels queued ranges
+        pages.close()
 
-def extract_docx_text(uploaded_file):
+
+def extract_docx_text(uploaded_file, max_chars=None):
     doc = Document(uploaded_file)
-    return "\n".join(p.text for p in doc.paragraphs)
+    return _take((p.text for p in doc.paragraphs), max_chars)
+
+
+def iter_pdf_pages(uploaded_file, workers=None):
+    """
+    Yield the text of each page in order ('' for pages without text).
+    `workers` overrides DOCUMENT_PARSE_WORKERS.
+    """
+    workers = PARSE_WORKERS if workers is None else workers
+
+    with pdfplumber.open(uploaded_file) as pdf:
+        page_count = len(pdf.pages)
+
+        if workers < 2 or page_count < PARALLEL_MIN_PAGES:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+                # Drop the parsed layout objects, they add up on long documents
+                page.close()
+            return
+
+    yield from _iter_pdf_pages_parallel(uploaded_file, page_count, workers)
+
+
+def _extract_page_range(path, start, stop):
+    with pdfplumber.open(path) as pdf:
+        texts = []
+        for page in pdf.pages[start:stop]:
+            texts.append(page.extract_text() or "")
+            page.close()
+        return texts
+
+
+def _iter_pdf_pages_parallel(uploaded_file, page_count, workers):
+    # Workers open the file themselves; upload it to disk if Django kept it in memory
+    temp_path = None
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        path = uploaded_file.temporary_file_path()
+    elif isinstance(uploaded_file, (str, os.PathLike)):
+        path = uploaded_file
+    else:
+        uploaded_file.seek(0)
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp:
+            for chunk in iter(lambda: uploaded_file.read(1024 * 1024), b""):
+                temp.write(chunk)
+        path = temp_path = temp.name
+
+    pool = _process_pool(workers)
+    ranges = iter(
+        (start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    )
+    in_flight = deque()
+
+    try:
+        # Keep every worker busy, but no further ahead than that
+        for start, stop in ranges:
+            in_flight.append(pool.submit(_extract_page_range, path, start, stop))
+            if len(in_flight) >= workers:
+                break
+
+        while in_flight:
+            texts = in_flight.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                in_flight.append(pool.submit(_extract_page_range, path, *next_range))
+            yield from texts
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if temp_path:
+            # Running tasks still have it open; on POSIX that is fine
+            os.unlink(temp_path)
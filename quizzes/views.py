@@ -1,40 +1,68 @@
 from .models import AttemptQuestion
-from .models import SharedQuiz, SharedQuizAttempt
+from .models import ClassroomEvent, QuestionSet, SharedQuiz
+from django.db import transaction
 from django.db.models import Count, Q
-import random
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
 from django.contrib import messages
-from django.db.models import Avg, Max, Min, Sum, Count, Q
-from django.db.models.functions import Coalesce, TruncDate
-from django.http import JsonResponse, HttpResponse
+from django.core.paginator import Paginator
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
-from django.utils.timezone import now
 from django.views.decorators.http import require_POST
-from datetime import timedelta, datetime
-import random
 import json
 from django.views.decorators.csrf import csrf_exempt
 from .models import Category, SubCategory, QuizAttempt, Question, Concept, Feedback
 
 # for performance pdf functionality
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from .reports import (
+    REPORT_FILENAME, cached_report, is_large_report, render_report, report_storage
+)
+
+# Background question generation
+from .quiz_assembly import create_attempt_questions
+from .quiz_builder import build_attempt_questions
+from .quiz_player import (
+    MAX_SYNC_SEQ, apply_answer_batch, mark_visited, parse_answer_changes,
+    parse_current_index, player_questions, player_state, record_answer
+)
+from .feedback import performance_areas
+from .tasks import (
+    enqueue_performance_report, enqueue_question_generation, request_ai_feedback,
+    request_pool_refill_if_low
+)
+from .user_stats import (
+    category_rows, daily_rows, difficulty_rows, get_user_stats, record_abandon,
+    record_attempt_started, record_completion, subcategory_rows, window_totals
+)
+from .classroom_results import participant_page, participant_summary, question_stats
+from .classroom_live import event_stream as live_event_stream, publish as publish_classroom_event
+from .shared_join import (
+    is_expired as is_shared_quiz_expired, join_payload, join_state,
+    start_attempt as start_shared_attempt
+)
+from .classroom_export import (
+    CONTENT_TYPES, EXPORT_FORMATS, export_filename, stream_csv, write_export
+)
+from .analytics import chart_bundle
+from .streaks import current_streak, record_activity
+from .leaderboard import (
+    BOARD_ALL, board_entries, category_board, difficulty_board, record_score, user_rank,
+    week_board
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
 
 # AI Feedback recommendation
 from .ai_feedback_service import generate_ai_feedback
 # Ai pdf to Quiz generator
-from quizzes.utils.file_parser import extract_text_from_file
+from .document_cache import document_questions, document_text
 #============================================================
 # USER DASHBOARD
 # ============================================================
 @login_required
 def dashboard(request):
     user = request.user
+    stats = get_user_stats(user)
 
     # Base queryset: only completed quizzes
     completed_qs = QuizAttempt.objects.filter(
@@ -42,97 +70,30 @@ def dashboard(request):
         status=QuizAttempt.STATUS_COMPLETED
     )
 
-    total_attempted = QuizAttempt.objects.filter(user=user).count()
-    total_completed = completed_qs.count()
+    total_attempted = stats.attempts_started
+    total_completed = stats.completed_count
 
-    completion_rate = (
-        (total_completed / total_attempted) * 100
-        if total_attempted > 0 else 0
-    )
-
-    score_stats = completed_qs.aggregate(
-        avg_score=Coalesce(Avg('score'), 0.0),
-        best_score=Coalesce(Max('score'), 0.0),
-        worst_score=Coalesce(Min('score'), 0.0),
-    )
-
-    difficulty_stats = completed_qs.values('difficulty').annotate(
-        quizzes=Count('id'),
-        avg_score=Avg('score')
-    ).order_by('difficulty')
-
-    category_stats = completed_qs.values(
-        'category__name'
-    ).annotate(
-        quizzes=Count('id'),
-        avg_score=Avg('score')
-    ).order_by('-avg_score')
+    difficulty_stats = difficulty_rows(stats)
+    category_stats = sorted(category_rows(stats), key=lambda row: -row['avg_score'])
 
     recent_quizzes = completed_qs.select_related(
         'category', 'subcategory'
     ).order_by('-completed_at')[:10]
 
-    last_7_days = completed_qs.filter(
-        completed_at__gte=timezone.now() - timedelta(days=7)
-    ).count()
+    last_7_days = window_totals(stats, 7)['count']
 
     # ===== DATA FOR CHARTS (Past 30 Days) =====
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    
-    # Daily quiz activity (quizzes completed per day)
-    daily_activity = completed_qs.filter(
-        completed_at__gte=thirty_days_ago
-    ).annotate(
-        date=TruncDate('completed_at')
-    ).values('date').annotate(
-        count=Count('id'),
-        avg_score=Avg('score')
-    ).order_by('date')
-    
-    # Prepare data for chart - fill in missing days with 0
-    activity_dict = {item['date']: {'count': item['count'], 'avg_score': round(item['avg_score'] or 0, 1)} for item in daily_activity}
-    
-    chart_labels = []
-    chart_quiz_counts = []
-    chart_scores = []
-    
-    for i in range(30):
-        date = (timezone.now() - timedelta(days=29-i)).date()
-        chart_labels.append(date.strftime('%b %d'))
-        data = activity_dict.get(date, {'count': 0, 'avg_score': 0})
-        chart_quiz_counts.append(data['count'])
-        chart_scores.append(data['avg_score'])
-    
-    # Category distribution for pie chart
-    category_distribution = completed_qs.filter(
-        completed_at__gte=thirty_days_ago
-    ).values('category__name').annotate(
-        count=Count('id')
-    ).order_by('-count')[:6]
-    
-    category_labels = [item['category__name'] or 'Unknown' for item in category_distribution]
-    category_counts = [item['count'] for item in category_distribution]
-    
-    # Difficulty distribution
-    difficulty_distribution = completed_qs.filter(
-        completed_at__gte=thirty_days_ago
-    ).values('difficulty').annotate(
-        count=Count('id'),
-        avg_score=Avg('score')
-    ).order_by('difficulty')
-    
-    difficulty_labels = [item['difficulty'].capitalize() for item in difficulty_distribution]
-    difficulty_counts = [item['count'] for item in difficulty_distribution]
-    difficulty_scores = [round(item['avg_score'] or 0, 1) for item in difficulty_distribution]
+    # Same cached payload the charts API serves
+    charts = chart_bundle(user, stats)
 
     context = {
         "total_attempted": total_attempted,
         "total_completed": total_completed,
-        "completion_rate": round(completion_rate, 2),
+        "completion_rate": round(stats.completion_rate, 2),
 
-        "avg_score": round(score_stats["avg_score"], 2),
-        "best_score": score_stats["best_score"],
-        "worst_score": score_stats["worst_score"],
+        "avg_score": round(stats.avg_score, 2),
+        "best_score": stats.best_score or 0.0,
+        "worst_score": stats.worst_score or 0.0,
 
         "difficulty_stats": difficulty_stats,
         "category_stats": category_stats,
@@ -141,14 +102,14 @@ def dashboard(request):
         "last_7_days": last_7_days,
         
         # Chart data (JSON serialized for JavaScript)
-        "chart_labels": json.dumps(chart_labels),
-        "chart_quiz_counts": json.dumps(chart_quiz_counts),
-        "chart_scores": json.dumps(chart_scores),
-        "category_labels": json.dumps(category_labels),
-        "category_counts": json.dumps(category_counts),
-        "difficulty_labels": json.dumps(difficulty_labels),
-        "difficulty_counts": json.dumps(difficulty_counts),
-        "difficulty_scores": json.dumps(difficulty_scores),
+        "chart_labels": json.dumps(charts['chart_labels']),
+        "chart_quiz_counts": json.dumps(charts['chart_quiz_counts']),
+        "chart_scores": json.dumps(charts['chart_scores']),
+        "category_labels": json.dumps(charts['category_labels']),
+        "category_counts": json.dumps(charts['category_counts']),
+        "difficulty_labels": json.dumps(charts['difficulty_labels']),
+        "difficulty_counts": json.dumps(charts['difficulty_counts']),
+        "difficulty_scores": json.dumps(charts['difficulty_scores']),
     }
     return render(request, "quizzes/dashboard.html", context)
 
@@ -162,84 +123,9 @@ def dashboard_charts_api(request):
     API endpoint to fetch chart data for dashboard.
     Returns JSON data for charts that update after quiz completion.
     """
-    user = request.user
-    
-    # Base queryset: only completed quizzes
-    completed_qs = QuizAttempt.objects.filter(
-        user=user,
-        status=QuizAttempt.STATUS_COMPLETED
-    )
-    
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    
-    # Daily quiz activity (quizzes completed per day)
-    daily_activity = completed_qs.filter(
-        completed_at__gte=thirty_days_ago
-    ).annotate(
-        date=TruncDate('completed_at')
-    ).values('date').annotate(
-        count=Count('id'),
-        avg_score=Avg('score')
-    ).order_by('date')
-    
-    # Prepare data for chart - fill in missing days with 0
-    activity_dict = {item['date']: {'count': item['count'], 'avg_score': round(item['avg_score'] or 0, 1)} for item in daily_activity}
-    
-    chart_labels = []
-    chart_quiz_counts = []
-    chart_scores = []
-    
-    for i in range(30):
-        date = (timezone.now() - timedelta(days=29-i)).date()
-        chart_labels.append(date.strftime('%b %d'))
-        data = activity_dict.get(date, {'count': 0, 'avg_score': 0})
-        chart_quiz_counts.append(data['count'])
-        chart_scores.append(data['avg_score'])
-    
-    # Category distribution for pie chart
-    category_distribution = completed_qs.filter(
-        completed_at__gte=thirty_days_ago
-    ).values('category__name').annotate(
-        count=Count('id')
-    ).order_by('-count')[:6]
-    
-    category_labels = [item['category__name'] or 'Unknown' for item in category_distribution]
-    category_counts = [item['count'] for item in category_distribution]
-    
-    # Difficulty distribution
-    difficulty_distribution = completed_qs.filter(
-        completed_at__gte=thirty_days_ago
-    ).values('difficulty').annotate(
-        count=Count('id'),
-        avg_score=Avg('score')
-    ).order_by('difficulty')
-    
-    difficulty_labels = [item['difficulty'].capitalize() for item in difficulty_distribution]
-    difficulty_counts = [item['count'] for item in difficulty_distribution]
-    difficulty_scores = [round(item['avg_score'] or 0, 1) for item in difficulty_distribution]
-    
-    # Summary stats
-    total_completed = completed_qs.count()
-    total_30_days = completed_qs.filter(completed_at__gte=thirty_days_ago).count()
-    avg_score_30_days = completed_qs.filter(
-        completed_at__gte=thirty_days_ago
-    ).aggregate(avg=Avg('score'))['avg'] or 0
-    
     return JsonResponse({
         'success': True,
-        'chart_labels': chart_labels,
-        'chart_quiz_counts': chart_quiz_counts,
-        'chart_scores': chart_scores,
-        'category_labels': category_labels,
-        'category_counts': category_counts,
-        'difficulty_labels': difficulty_labels,
-        'difficulty_counts': difficulty_counts,
-        'difficulty_scores': difficulty_scores,
-        'summary': {
-            'total_completed': total_completed,
-            'total_30_days': total_30_days,
-            'avg_score_30_days': round(avg_score_30_days, 1),
-        }
+        **chart_bundle(request.user),
     })
 
 
@@ -305,6 +191,8 @@ def start_quiz(request, subcategory_id, difficulty):
         status=QuizAttempt.STATUS_GENERATING,
         started_at=timezone.now()  # Add this line
     )
+    record_attempt_started(request.user)
+    record_activity(request.user.pk)
     
     # Show loading page that will trigger AJAX to generate questions
     return render(request, "quizzes/generating_quiz.html", {
@@ -418,44 +306,34 @@ def quit_quiz(request, attempt_id):
     
     quiz_attempt.status = QuizAttempt.STATUS_ABANDONED
     quiz_attempt.completed_at = timezone.now()
-    quiz_attempt.save(update_fields=['time_spent_seconds', 'paused_at', 'status', 'completed_at'])
-
-    return redirect('quizzes:dashboard')
-
-# shuffle correct options
-def shuffle_mcq(question_dict):
-    """
-    Shuffles MCQ options while keeping correct_answer accurate
-    """
 
-    options = [
-        ('A', question_dict['option_a']),
-        ('B', question_dict['option_b']),
-        ('C', question_dict['option_c']),
-        ('D', question_dict['option_d']),
-    ]
-
-    correct_text = dict(options)[question_dict['correct_answer']]
-
-    random.shuffle(options)
-
-    new_correct = None
-    for idx, (_, text) in enumerate(options):
-        letter = chr(ord('A') + idx)
-        question_dict[f'option_{letter.lower()}'] = text
-        if text == correct_text:
-            new_correct = letter
+    with transaction.atomic():
+        # Only the request that actually moves it out of IN_PROGRESS counts it
+        quit_now = QuizAttempt.objects.filter(
+            id=quiz_attempt.id,
+            status=QuizAttempt.STATUS_IN_PROGRESS
+        ).update(
+            time_spent_seconds=quiz_attempt.time_spent_seconds,
+            paused_at=quiz_attempt.paused_at,
+            status=quiz_attempt.status,
+            completed_at=quiz_attempt.completed_at
+        )
+        if quit_now:
+            record_abandon(quiz_attempt)
+            publish_classroom_event(quiz_attempt, ClassroomEvent.KIND_QUIT)
 
-    question_dict['correct_answer'] = new_correct
-    return question_dict
+    return redirect('quizzes:dashboard')
 
 @login_required
 @require_POST
 def generate_questions(request, attempt_id):
     """
-    AJAX endpoint to generate questions using AI
+    AJAX endpoint to assemble the quiz questions.
+    Served straight from the question bank when the pool is warm; otherwise
+    generation is queued for a background worker and the loading page polls
+    generation_status until the quiz is ready.
     """
-    quiz_attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
+    quiz_attempt = get_object_or_404(QuizAttempt.objects.select_related('question_set'), id=attempt_id, user=request.user)
 
     # Check if questions already generated
     if quiz_attempt.questions:
@@ -464,216 +342,56 @@ def generate_questions(request, attempt_id):
             'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/question/'
         })
 
-    try:
-        from .ai_service import generate_quiz_questions
-        from .models import Question, Concept
-        import random
-        from datetime import timedelta
-
-        REQUIRED_QUESTIONS = quiz_attempt.total_questions  # usually 10
-        MAX_RETRIES = 3
-        
-        formatted_questions = []
-        question_id = 1
-        
-        # ============================================
-        # STEP 1: Get questions user has seen recently (last 7 days)
-        # ============================================
-        recent_attempts = QuizAttempt.objects.filter(
-            user=request.user,
-            subcategory=quiz_attempt.subcategory,
-            status=QuizAttempt.STATUS_COMPLETED,
-            completed_at__gte=timezone.now() - timedelta(days=7)
-        )
-        
-        # Collect question hashes the user has seen
-        seen_question_texts = set()
-        for attempt in recent_attempts:
-            if attempt.questions:
-                for q in attempt.questions:
-                    seen_question_texts.add(q.get('question', ''))
-        
-        # ============================================
-        # STEP 2: Try to use existing questions from DB that user hasn't seen
-        # ============================================
-        existing_questions = Question.objects.filter(
-            subcategory=quiz_attempt.subcategory,
-            difficulty=quiz_attempt.difficulty
-        ).order_by('?')  # Random order
-        
-        # Filter out questions user has seen recently
-        unseen_questions = [
-            q for q in existing_questions 
-            if q.question_text not in seen_question_texts
-        ]
-        
-        # Use up to REQUIRED_QUESTIONS from existing pool
-        for q in unseen_questions[:REQUIRED_QUESTIONS]:
-            
-            question_data = {
-                "id": question_id,
-                "question": q.question_text,
-                "option_a": q.option_a,
-                "option_b": q.option_b,
-                "option_c": q.option_c,
-                "option_d": q.option_d,
-                "correct_answer": q.correct_answer,
-                "explanation": q.explanation,
-                "user_answer": None,
-                "is_correct": None
-            }
-
-            question_data = shuffle_mcq(question_data)
-            formatted_questions.append(question_data)
-
-            # Update usage count
-            q.usage_count += 1
-            q.save(update_fields=['usage_count'])
-            question_id += 1
-        
-        # ============================================
-        # STEP 3: Generate NEW questions if we don't have enough
-        # ============================================
-        if len(formatted_questions) < REQUIRED_QUESTIONS:
-            questions_needed = REQUIRED_QUESTIONS - len(formatted_questions)
-            retry_count = 0
-            
-            while len(formatted_questions) < REQUIRED_QUESTIONS and retry_count < MAX_RETRIES:
-                retry_count += 1
-                
-                # Fetch concepts
-                concepts_qs = Concept.objects.filter(
-                    subcategory=quiz_attempt.subcategory,
-                    difficulty=quiz_attempt.difficulty
-                )
-                concept_names = list(concepts_qs.values_list('name', flat=True))
-                
-                if len(concept_names) < questions_needed:
-                    break  # Not enough concepts, use what we have
-                
-                # Pick random concepts for new questions
-                selected_concepts = random.sample(concept_names, min(questions_needed, len(concept_names)))
-                
-                # Generate with AI
-                questions_data = generate_quiz_questions(
-                    topic=quiz_attempt.subcategory.name,
-                    category=quiz_attempt.category.name,
-                    difficulty=quiz_attempt.difficulty,
-                    count=questions_needed,
-                    concepts=selected_concepts
-                )
-                
-                for q in questions_data:
-                    if len(formatted_questions) >= REQUIRED_QUESTIONS:
-                        break
-                    
-                    q_hash = Question.make_hash(q["question"])
-                    
-                    # Skip if this exact question exists OR user has seen it
-                    if Question.objects.filter(normalized_hash=q_hash).exists():
-                        continue
-                    if q["question"] in seen_question_texts:
-                        continue
-                    
-                    # Create new question in DB
-                    question_obj = Question.objects.create(
-                        category=quiz_attempt.category,
-                        subcategory=quiz_attempt.subcategory,
-                        difficulty=quiz_attempt.difficulty,
-                        question_text=q["question"],
-                        option_a=q["option_a"],
-                        option_b=q["option_b"],
-                        option_c=q["option_c"],
-                        option_d=q["option_d"],
-                        correct_answer=q["correct_answer"],
-                        explanation=q.get("explanation", ""),
-                        normalized_hash=q_hash,
-                        usage_count=1
-                    )
-                    
-                    question_data = {
-                        "id": question_id,
-                        "question": question_obj.question_text,
-                        "option_a": question_obj.option_a,
-                        "option_b": question_obj.option_b,
-                        "option_c": question_obj.option_c,
-                        "option_d": question_obj.option_d,
-                        "correct_answer": question_obj.correct_answer,
-                        "explanation": question_obj.explanation,
-                        "user_answer": None,
-                        "is_correct": None
-                    }
-
-                    question_data = shuffle_mcq(question_data)
-                    formatted_questions.append(question_data)
-
-                    question_id += 1
-        
-        # ============================================
-        # STEP 4: Check if we have enough questions
-        # ============================================
-        if len(formatted_questions) < REQUIRED_QUESTIONS:
-            quiz_attempt.status = QuizAttempt.STATUS_ABANDONED
-            quiz_attempt.save()
-            return JsonResponse({
-                'success': False,
-                'error': f'Could not generate enough unique questions. Got {len(formatted_questions)}/{REQUIRED_QUESTIONS}. Try again later.'
-            }, status=500)
-        
-        # Shuffle to mix existing and new questions
-        random.shuffle(formatted_questions)
-        
-        # Re-number after shuffle
-        for i, q in enumerate(formatted_questions):
-            q['id'] = i + 1
-        
-        # ============================================
-        # STEP 5: Save and return
-        # ============================================
-        quiz_attempt.questions = formatted_questions
-        quiz_attempt.status = QuizAttempt.STATUS_IN_PROGRESS
-        quiz_attempt.ai_meta = {
-            'model': 'gpt-3.5-turbo',
-            'generated_at': timezone.now().isoformat(),
-            'existing_used': sum(1 for q in formatted_questions if q.get('id')),
-            'newly_generated': REQUIRED_QUESTIONS - sum(1 for q in formatted_questions if q.get('id'))
-        }
-        quiz_attempt.save(update_fields=['questions', 'status', 'ai_meta'])
-
-        # ============================
-        # CREATE AttemptQuestion ROWS
-        # ============================
-        AttemptQuestion.objects.filter(attempt=quiz_attempt).delete()
-
-        for idx, q in enumerate(formatted_questions):
-            question_obj = Question.objects.filter(
-                question_text=q["question"],
-                subcategory=quiz_attempt.subcategory
-            ).first()
-
-            if not question_obj:
-                continue
-
-            AttemptQuestion.objects.create(
-                attempt=quiz_attempt,
-                question=question_obj,
-                question_order=idx,
-                status=AttemptQuestion.STATUS_UNVISITED
-            )
+    if quiz_attempt.status != QuizAttempt.STATUS_GENERATING:
+        return JsonResponse({
+            'success': False,
+            'error': (quiz_attempt.ai_meta or {}).get('generation_error', 'This quiz can no longer be generated.')
+        }, status=400)
 
+    # Fast path: a warm question pool covers the quiz straight from the DB
+    if build_attempt_questions(quiz_attempt, allow_ai=False):
+        request_pool_refill_if_low(quiz_attempt.subcategory, quiz_attempt.difficulty)
         return JsonResponse({
             'success': True,
             'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/question/'
         })
 
-    except Exception as e:
-        quiz_attempt.status = QuizAttempt.STATUS_ABANDONED
-        quiz_attempt.save()
+    # Slow path: the pool is short, let a worker call the AI
+    enqueue_question_generation(quiz_attempt)
+
+    return JsonResponse({
+        'success': True,
+        'queued': True,
+        'status_url': reverse('quizzes:generation_status', kwargs={'attempt_id': quiz_attempt.id})
+    }, status=202)
+
 
+@login_required
+def generation_status(request, attempt_id):
+    """
+    Lightweight polling endpoint for the generating_quiz loading page.
+    """
+    quiz_attempt = get_object_or_404(
+        QuizAttempt.objects.only('id', 'user_id', 'status', 'ai_meta'),
+        id=attempt_id,
+        user=request.user
+    )
+
+    if quiz_attempt.status == QuizAttempt.STATUS_GENERATING:
+        return JsonResponse({'success': True, 'status': 'pending'})
+
+    if quiz_attempt.status == QuizAttempt.STATUS_ABANDONED:
         return JsonResponse({
             'success': False,
-            'error': str(e)
-        }, status=500)
+            'status': 'failed',
+            'error': (quiz_attempt.ai_meta or {}).get('generation_error', 'Quiz generation failed. Try again later.')
+        })
+
+    return JsonResponse({
+        'success': True,
+        'status': 'ready',
+        'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/question/'
+    })
 
 @login_required
 def show_question(request, attempt_id):
@@ -681,7 +399,7 @@ def show_question(request, attempt_id):
     Show current question in the quiz
     """
     quiz_attempt = get_object_or_404(
-        QuizAttempt,
+        QuizAttempt.objects.select_related('question_set'),
         id=attempt_id,
         user=request.user
     )
@@ -693,11 +411,12 @@ def show_question(request, attempt_id):
             attempt_id=quiz_attempt.id
         )
 
-    # ADD: Fetch AttemptQuestion
-    attempt_questions = quiz_attempt.attempt_questions.all()
-    current_aq = attempt_questions.filter(
-        question_order=quiz_attempt.current_question_index
-    ).first()
+    # AttemptQuestion rows hold the answers; fetch them once for the palette
+    attempt_questions = list(quiz_attempt.attempt_questions.all())
+    current_aq = next(
+        (aq for aq in attempt_questions if aq.question_order == quiz_attempt.current_question_index),
+        None
+    )
 
     # Mark VISITED automatically
     if current_aq and current_aq.visited_at is None:
@@ -715,18 +434,13 @@ def show_question(request, attempt_id):
         )
 
     # Preserve previously selected answer
-    current_idx = quiz_attempt.current_question_index
-    user_answer = None
-    if current_idx < len(quiz_attempt.questions):
-        user_answer = quiz_attempt.questions[current_idx].get('user_answer')
-
     current_question_with_answer = dict(current_question)
-    current_question_with_answer['user_answer'] = user_answer
+    current_question_with_answer['user_answer'] = current_aq.selected_option if current_aq else None
 
     # Progress
     answered_count = sum(
-        1 for q in quiz_attempt.questions
-        if q.get('user_answer') is not None
+        1 for aq in attempt_questions
+        if aq.selected_option is not None
     )
 
     # ✅ SINGLE SOURCE OF TRUTH FOR TIMER
@@ -736,9 +450,14 @@ def show_question(request, attempt_id):
         else quiz_attempt.time_limit_seconds
     )
 
+    # Prefetch mode ships every question up front and navigates locally
+    prefetch = getattr(settings, 'QUIZ_PLAYER_PREFETCH', False)
+
     return render(request, "quizzes/quiz_question.html", {
         "quiz_attempt": quiz_attempt,
         "question": current_question_with_answer,
+        "prefetch": prefetch,
+        "player_questions": player_questions(quiz_attempt, attempt_questions) if prefetch else None,
         "question_number": quiz_attempt.current_question_index + 1,
         "total_questions": quiz_attempt.total_questions,
         "answered_count": answered_count,
@@ -759,7 +478,7 @@ def submit_answer(request, attempt_id):
 
     
 
-    quiz_attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
+    quiz_attempt = get_object_or_404(QuizAttempt.objects.select_related('question_set'), id=attempt_id, user=request.user)
 
     if quiz_attempt.is_auto_submitted:
         return JsonResponse({
@@ -772,46 +491,19 @@ def submit_answer(request, attempt_id):
 
     if user_answer not in ['A', 'B', 'C', 'D']:
         return JsonResponse({'error': 'Invalid answer'}, status=400)
-    
-    # ADD DB UPDATE
+
     current_idx = quiz_attempt.current_question_index
 
-    # Try to get AttemptQuestion (may not exist for AI-generated quizzes)
-    aq = AttemptQuestion.objects.filter(
-        attempt=quiz_attempt,
-        question_order=current_idx
-    ).first()
+    if not quiz_attempt.questions or current_idx >= len(quiz_attempt.questions):
+        return JsonResponse({'error': 'No more questions'}, status=400)
 
-    # Update AttemptQuestion if it exists
-    if aq:
-        aq.selected_option = user_answer
-        aq.status = AttemptQuestion.STATUS_SOLVED
-        aq.answered_at = timezone.now()
-        aq.is_correct = (
-            user_answer == quiz_attempt.questions[current_idx]['correct_answer']
-        )
+    # The answer is a single-row UPDATE - the question snapshot is never rewritten
+    record_answer(quiz_attempt, current_idx, user_answer)
+    publish_classroom_event(quiz_attempt, ClassroomEvent.KIND_PROGRESS)
 
-        aq.save(update_fields=[
-            'selected_option',
-            'status',
-            'answered_at',
-            'is_correct'
-        ])
-    
-    if current_idx >= len(quiz_attempt.questions):
-        return JsonResponse({'error': 'No more questions'}, status=400)
-    
-    # Update question with user's answer
-    quiz_attempt.questions[current_idx]['user_answer'] = user_answer
-    quiz_attempt.questions[current_idx]['is_correct'] = (
-        user_answer == quiz_attempt.questions[current_idx]['correct_answer']
-    )
-    
     # Move to next question
     quiz_attempt.current_question_index += 1
-
-    # Persist only the changed fields to ensure JSONField is saved
-    quiz_attempt.save(update_fields=['questions', 'current_question_index'])
+    quiz_attempt.save(update_fields=['current_question_index'])
     
     # Check if quiz is complete
     if quiz_attempt.is_quiz_complete():
@@ -830,6 +522,126 @@ def submit_answer(request, attempt_id):
         'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/question/'
     })
 
+@login_required
+@require_POST
+def answer_question_api(request, attempt_id):
+    """
+    Quiz player API: store an answer and return the next question and
+    palette state in the same response, so the page can re-render in place.
+    """
+    quiz_attempt = get_object_or_404(QuizAttempt.objects.select_related('question_set'), id=attempt_id, user=request.user)
+
+    if quiz_attempt.is_auto_submitted:
+        return JsonResponse({
+            'success': False,
+            'completed': True,
+            'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/results/?auto_submitted=true'
+        })
+
+    if quiz_attempt.status == QuizAttempt.STATUS_COMPLETED:
+        return JsonResponse({
+            'success': True,
+            'completed': True,
+            'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/results/'
+        })
+
+    if quiz_attempt.status != QuizAttempt.STATUS_IN_PROGRESS:
+        return JsonResponse({'success': False, 'error': 'Quiz is not in progress'}, status=400)
+
+    user_answer = request.POST.get('answer', '').upper()
+
+    if user_answer not in ['A', 'B', 'C', 'D']:
+        return JsonResponse({'success': False, 'error': 'Invalid answer'}, status=400)
+
+    current_idx = quiz_attempt.current_question_index
+
+    if not quiz_attempt.questions or current_idx >= len(quiz_attempt.questions):
+        return JsonResponse({'success': False, 'error': 'No more questions'}, status=400)
+
+    record_answer(quiz_attempt, current_idx, user_answer)
+    publish_classroom_event(quiz_attempt, ClassroomEvent.KIND_PROGRESS)
+
+    quiz_attempt.current_question_index += 1
+    quiz_attempt.save(update_fields=['current_question_index'])
+
+    attempt_questions = list(quiz_attempt.attempt_questions.all())
+
+    # Everything answered, or ran past the last question (same as show_question)
+    if (
+        all(aq.selected_option is not None for aq in attempt_questions)
+        or quiz_attempt.get_current_question() is None
+    ):
+        finalize_quiz_attempt(quiz_attempt)
+        return JsonResponse({
+            'success': True,
+            'completed': True,
+            'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/results/'
+        })
+
+    mark_visited(quiz_attempt, quiz_attempt.current_question_index)
+
+    return JsonResponse({
+        'success': True,
+        'completed': False,
+        **player_state(quiz_attempt, attempt_questions)
+    })
+
+@login_required
+@require_POST
+def sync_answers_api(request, attempt_id):
+    """
+    Prefetch player API: apply a numbered batch of answer/palette changes.
+    Re-sent batches are acknowledged without being applied twice. With
+    "finish": true the quiz is finalized and graded after the batch.
+    """
+    try:
+        data = json.loads(request.body)
+        seq = int(data['seq'])
+        if not 0 < seq <= MAX_SYNC_SEQ:
+            raise ValueError("seq out of range")
+    except (ValueError, TypeError, KeyError):
+        return JsonResponse({'success': False, 'error': 'Invalid request'}, status=400)
+
+    quiz_attempt = get_object_or_404(QuizAttempt.objects.select_related('question_set'), id=attempt_id, user=request.user)
+
+    if quiz_attempt.status == QuizAttempt.STATUS_COMPLETED:
+        return JsonResponse({
+            'success': True,
+            'completed': True,
+            'acked_seq': quiz_attempt.answer_sync_seq,
+            'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/results/'
+        })
+
+    if quiz_attempt.status != QuizAttempt.STATUS_IN_PROGRESS:
+        return JsonResponse({'success': False, 'error': 'Quiz is not in progress'}, status=400)
+
+    total_questions = len(quiz_attempt.questions or [])
+    try:
+        changes = parse_answer_changes(data.get('changes', []), total_questions)
+        current_index = parse_current_index(data.get('current_index'), total_questions)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    applied = apply_answer_batch(quiz_attempt, seq, changes, current_index)
+    if applied and changes:
+        publish_classroom_event(quiz_attempt, ClassroomEvent.KIND_PROGRESS)
+
+    if data.get('finish'):
+        finalize_quiz_attempt(quiz_attempt)
+        return JsonResponse({
+            'success': True,
+            'completed': True,
+            'acked_seq': seq,
+            'redirect_url': f'/quiz/attempt/{quiz_attempt.id}/results/'
+        })
+
+    return JsonResponse({
+        'success': True,
+        'completed': False,
+        'acked_seq': seq,
+        'duplicate': not applied
+    })
+
 @login_required
 @require_POST
 def auto_submit_quiz(request, attempt_id):
@@ -837,7 +649,7 @@ def auto_submit_quiz(request, attempt_id):
     Auto-submit quiz when timer expires
     Marks all unanswered questions as attempted but incorrect
     """
-    quiz_attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
+    quiz_attempt = get_object_or_404(QuizAttempt.objects.select_related('question_set'), id=attempt_id, user=request.user)
     
     quiz_attempt.is_auto_submitted = True
     quiz_attempt.auto_submit_reason = QuizAttempt.AUTO_SUBMIT_TIME_UP
@@ -859,11 +671,14 @@ def quiz_results(request, attempt_id):
     """
     Show quiz results with score and review
     """
-    quiz_attempt = get_object_or_404(QuizAttempt, id=attempt_id, user=request.user)
+    quiz_attempt = get_object_or_404(QuizAttempt.objects.select_related('question_set'), id=attempt_id, user=request.user)
     
+    # Question snapshot merged with the answers stored in AttemptQuestion
+    review_questions = quiz_attempt.answered_questions()
+
     # Calculate results
-    total = len(quiz_attempt.questions) if quiz_attempt.questions else 0
-    correct = sum(1 for q in quiz_attempt.questions if q.get('is_correct')) if quiz_attempt.questions else 0
+    total = len(review_questions)
+    correct = sum(1 for q in review_questions if q['is_correct'])
     incorrect = total - correct
     percentage = round((correct * 100) / total, 2) if total else 0
 
@@ -883,43 +698,20 @@ def quiz_results(request, attempt_id):
     # Check if this was an auto-submit
     auto_submitted = request.GET.get('auto_submitted') == 'true'
     
-    # Generate AI Feedback
-    ai_feedback = None
-    strong_areas = []
-    weak_areas = []
-    
-    try:
-        # Analyze questions for strong/weak areas
-        questions = quiz_attempt.questions or []
-        
-        for q in questions:
-            topic = q.get('topic', quiz_attempt.subcategory.name)
-            if q.get('is_correct'):
-                if topic not in strong_areas:
-                    strong_areas.append(topic)
-            else:
-                if topic not in weak_areas:
-                    weak_areas.append(topic)
-        
-        # Remove overlaps - if in both, keep in weak
-        strong_areas = [a for a in strong_areas if a not in weak_areas]
-        
-        # Generate AI feedback
-        summary_data = {
-            "subcategory": quiz_attempt.subcategory.name,
-            "category": quiz_attempt.category.name,
-            "difficulty": quiz_attempt.difficulty,
-            "score": percentage,
-            "correct": correct,
-            "total": total,
-            "strong_areas": strong_areas[:3],
-            "weak_areas": weak_areas[:3],
-        }
-        
-        ai_feedback = generate_ai_feedback(str(summary_data))
-    except Exception as e:
-        print(f"AI Feedback error: {e}")
-        ai_feedback = None
+    strong_areas, weak_areas = performance_areas(quiz_attempt, review_questions)
+
+    # AI feedback is generated in the background and fetched by the page
+    # (attempts finished before feedback was queued get queued on first view)
+    if (
+        quiz_attempt.status == QuizAttempt.STATUS_COMPLETED
+        and quiz_attempt.ai_feedback_status == QuizAttempt.FEEDBACK_NONE
+    ):
+        request_ai_feedback(quiz_attempt)
+
+    ai_feedback = (
+        quiz_attempt.ai_feedback
+        if quiz_attempt.ai_feedback_status == QuizAttempt.FEEDBACK_READY else None
+    )
     
     # Check if user already submitted feedback for this quiz
     existing_feedback = Feedback.objects.filter(quiz_attempt=quiz_attempt).first()
@@ -934,6 +726,7 @@ def quiz_results(request, attempt_id):
     
     return render(request, "quizzes/quiz_results.html", {
         "quiz_attempt": quiz_attempt,
+        "review_questions": review_questions,
         "total": total,
         "correct": correct,
         "incorrect": incorrect,
@@ -941,12 +734,36 @@ def quiz_results(request, attempt_id):
         "grade": grade,
         "auto_submitted": auto_submitted,
         "ai_feedback": ai_feedback,
-        "strong_areas": strong_areas[:3],
-        "weak_areas": weak_areas[:3],
+        "ai_feedback_pending": quiz_attempt.ai_feedback_status == QuizAttempt.FEEDBACK_PENDING,
+        "strong_areas": strong_areas,
+        "weak_areas": weak_areas,
         "existing_feedback": existing_feedback,
         "quiz_hoster": quiz_hoster,
     })
 
+@login_required
+def feedback_status(request, attempt_id):
+    """
+    Lightweight polling endpoint for the AI feedback on the results page.
+    """
+    quiz_attempt = get_object_or_404(
+        QuizAttempt.objects.only('id', 'user_id', 'ai_feedback', 'ai_feedback_status'),
+        id=attempt_id,
+        user=request.user
+    )
+
+    if quiz_attempt.ai_feedback_status == QuizAttempt.FEEDBACK_READY:
+        return JsonResponse({
+            'success': True,
+            'status': 'ready',
+            'lines': [line[2:] for line in quiz_attempt.ai_feedback.splitlines() if line.strip()]
+        })
+
+    if quiz_attempt.ai_feedback_status == QuizAttempt.FEEDBACK_FAILED:
+        return JsonResponse({'success': False, 'status': 'failed'})
+
+    return JsonResponse({'success': True, 'status': 'pending'})
+
 def finalize_quiz_attempt(quiz_attempt):
     """
     Finalize a quiz attempt - calculate score, set status to completed.
@@ -954,17 +771,15 @@ def finalize_quiz_attempt(quiz_attempt):
     # Skip if already completed
     if quiz_attempt.status == QuizAttempt.STATUS_COMPLETED:
         return
-        
-    aq_qs = AttemptQuestion.objects.filter(attempt=quiz_attempt)
+    previous_status = quiz_attempt.status
 
-    # Try to get counts from AttemptQuestion
-    attempted = aq_qs.filter(selected_option__isnull=False).count()
-    correct = aq_qs.filter(is_correct=True).count()
-    
-    # If AttemptQuestion doesn't have data, fall back to JSON questions
-    if attempted == 0 and quiz_attempt.questions:
-        attempted = sum(1 for q in quiz_attempt.questions if q.get('user_answer'))
-        correct = sum(1 for q in quiz_attempt.questions if q.get('is_correct'))
+    # Answers live only in AttemptQuestion - count both in one query
+    counts = AttemptQuestion.objects.filter(attempt=quiz_attempt).aggregate(
+        attempted=Count('id', filter=Q(selected_option__isnull=False)),
+        correct=Count('id', filter=Q(is_correct=True))
+    )
+    attempted = counts['attempted']
+    correct = counts['correct']
 
     quiz_attempt.attempted_questions = attempted
     quiz_attempt.correct_answers = correct
@@ -988,122 +803,60 @@ def finalize_quiz_attempt(quiz_attempt):
 
     quiz_attempt.time_spent_seconds = quiz_attempt.time_taken_seconds
 
-    quiz_attempt.save(update_fields=[
-        'attempted_questions',
-        'correct_answers',
-        'score',
-        'time_taken_seconds',
-        'time_spent_seconds',
-        'completed_at',
-        'status',
-        'paused_at'
-    ])
-
-
-
-# streak
-def calculate_streak(user):
-    """
-    Calculate consecutive-day quiz streak for a user.
-    """
-    streak = 0
-    today = timezone.now().date()
-
-    while True:
-        # Calculate the date we are checking
-        check_date = today - timedelta(days=streak)
-
-        # Start & end time of that day
-        day_start = timezone.make_aware(
-            datetime.combine(check_date, datetime.min.time())
-        )
-        day_end = timezone.make_aware(
-            datetime.combine(check_date, datetime.max.time())
+    with transaction.atomic():
+        # Conditional update so concurrent finalizes count the attempt once
+        completed_now = QuizAttempt.objects.filter(
+            id=quiz_attempt.id
+        ).exclude(
+            status=QuizAttempt.STATUS_COMPLETED
+        ).update(
+            attempted_questions=attempted,
+            correct_answers=correct,
+            score=quiz_attempt.score,
+            time_taken_seconds=quiz_attempt.time_taken_seconds,
+            time_spent_seconds=quiz_attempt.time_spent_seconds,
+            completed_at=quiz_attempt.completed_at,
+            status=QuizAttempt.STATUS_COMPLETED,
+            paused_at=None
         )
+        if not completed_now:
+            return
 
-        # Check if user attempted any quiz on that day
-        attempted = QuizAttempt.objects.filter(
-            user=user,
-            started_at__range=(day_start, day_end)
-        ).exists()
+        record_completion(quiz_attempt, previous_status=previous_status)
+        record_activity(quiz_attempt.user_id, quiz_attempt.completed_at)
+        record_score(quiz_attempt)
+        publish_classroom_event(quiz_attempt, ClassroomEvent.KIND_COMPLETED)
+
+    # Feedback is generated once, off the request path
+    request_ai_feedback(quiz_attempt)
 
-        if attempted:
-            streak += 1
-        else:
-            break
 
-    return streak
 
 # Performance Analysis and AI-Feedback 
 @login_required
 def performance_dashboard(request):
     request.session.pop("ai_feedback", None)
 
-    user = request.user
-
-    completed_qs = QuizAttempt.objects.filter(
-        user=user,
-        status=QuizAttempt.STATUS_COMPLETED
-    )
+    stats = get_user_stats(request.user)
 
     # ---------------------------
     # 1. OVERALL STATS
     # ---------------------------
-    overall = completed_qs.aggregate(
-        total_quizzes=Count('id'),
-        avg_score=Avg('score'),          
-        total_correct=Sum('correct_answers'),
-        total_attempted=Sum('attempted_questions'),
-        total_time=Sum('time_taken_seconds')
-    )
-
-    overall_accuracy = (
-        (overall['total_correct'] / overall['total_attempted']) * 100
-        if overall['total_attempted']
-        else 0
-    )
-
-    avg_time_per_question = (
-        overall['total_time'] / overall['total_attempted']
-        if overall['total_attempted']
-        else 0
-    )
+    overall_accuracy = stats.accuracy
+    avg_time_per_question = stats.avg_time_per_question
 
     # ---------------------------
     # 2. CATEGORY-WISE DISTRIBUTION
     # ---------------------------
-    category_distribution = (
-        completed_qs
-        .exclude(category__isnull=True)
-        .values('category__name')        
-        .annotate(quiz_count=Count('id'))
-        .order_by('-quiz_count')
-    )
+    category_distribution = [
+        {'category__name': row['category__name'], 'quiz_count': row['quizzes']}
+        for row in category_rows(stats, include_unknown=False)
+    ]
 
     # ---------------------------
     # 3. SUBCATEGORY-WISE ACCURACY
     # ---------------------------
-    subcategory_stats = (
-        completed_qs
-        .exclude(subcategory__isnull=True)
-        .values('subcategory__name')
-        .annotate(
-            correct=Sum('correct_answers'),
-            attempted=Sum('attempted_questions')
-        )
-    )
-
-    subcategory_accuracy = []
-    for item in subcategory_stats:
-        accuracy = (
-            (item['correct'] / item['attempted']) * 100
-            if item['attempted']
-            else 0
-        )
-        subcategory_accuracy.append({
-            'subcategory': item['subcategory__name'],
-            'accuracy': round(accuracy, 2)
-        })
+    subcategory_accuracy = subcategory_rows(stats)
 
     # ---------------------------
     # STRONG vs WEAK TOPICS
@@ -1120,23 +873,18 @@ def performance_dashboard(request):
     # ---------------------------
     # 4. DIFFICULTY-WISE PERFORMANCE
     # ---------------------------
-    difficulty_performance = completed_qs.values(
-        'difficulty'
-    ).annotate(
-        avg_score=Avg('score')
-    )
+    difficulty_performance = [
+        {'difficulty': row['difficulty'], 'avg_score': row['avg_score']}
+        for row in difficulty_rows(stats)
+    ]
 
     # ---------------------------
     # 5. PERFORMANCE OVER TIME
     # ---------------------------
-    performance_over_time = (
-        completed_qs
-        .exclude(completed_at__isnull=True)
-        .annotate(date=TruncDate('completed_at'))
-        .values('date')
-        .annotate(avg_score=Avg('score'))
-        .order_by('date')
-    )
+    performance_over_time = [
+        {'date': row['date'], 'avg_score': row['avg_score']}
+        for row in daily_rows(stats)
+    ]
 
     # ---------------------------
     # 6. INSIGHTS
@@ -1158,7 +906,7 @@ def performance_dashboard(request):
     # ---------------------------
     # 7. AI-GENERATED FEEDBACK 
     # ---------------------------
-    total_quizzes = overall['total_quizzes'] or 0
+    total_quizzes = stats.completed_count
 
     if total_quizzes == 0:
         ai_feedback = (
@@ -1199,21 +947,21 @@ def performance_dashboard(request):
         ai_feedback = request.session["ai_feedback"]
 
     # streak
-    streak = calculate_streak(request.user)
+    streak = current_streak(request.user)
 
     # ---------------------------
     # FINAL CONTEXT
     # ---------------------------
     context = {
-        'total_quizzes': total_quizzes or 0,
-        'avg_score': round(overall['avg_score'] or 0, 2),
+        'total_quizzes': total_quizzes,
+        'avg_score': round(stats.avg_score, 2),
         'overall_accuracy': round(overall_accuracy, 2),
         'avg_time_per_question': round(avg_time_per_question, 2),
 
-        'category_distribution': list(category_distribution),
+        'category_distribution': category_distribution,
         'subcategory_accuracy': subcategory_accuracy,
-        'difficulty_performance': list(difficulty_performance),
-        'performance_over_time': list(performance_over_time),
+        'difficulty_performance': difficulty_performance,
+        'performance_over_time': performance_over_time,
 
         'insights': insights,
         'strong_topics': strong_topics,
@@ -1224,219 +972,38 @@ def performance_dashboard(request):
 
     return render(request, 'quizzes/performance_dashboard.html', context)
 
-def draw_page_layout(canvas, doc):
-    canvas.saveState()
-
-    # Page border
-    canvas.setStrokeColor(colors.grey)
-    canvas.setLineWidth(1)
-    canvas.rect(20, 20, A4[0] - 40, A4[1] - 40)
-
-    # Header
-    canvas.setFont("Helvetica-Bold", 10)
-    canvas.drawString(40, A4[1] - 40, "AI Quiz Hub – Performance Report")
-
-    # Footer
-    canvas.setFont("Helvetica", 9)
-    canvas.setFillColor(colors.grey)
-    canvas.drawCentredString(
-        A4[0] / 2,
-        30,
-        f"Page {doc.page}"
-    )
-
-    canvas.restoreState()
-
 @login_required
 def download_performance_pdf(request):
+    """
+    Serve the user's performance report from disk, rendering it first if
+    they completed a quiz since it was last built. Large reports are
+    rendered by a background job while the user sees a page that retries.
+    """
     user = request.user
+    stats = get_user_stats(user)
 
-    completed_qs = QuizAttempt.objects.filter(
-        user=user,
-        status=QuizAttempt.STATUS_COMPLETED
-    )
-
-    overall = completed_qs.aggregate(
-        total_quizzes=Count('id'),
-        avg_score=Avg('score'),
-        total_correct=Sum('correct_answers'),
-        total_attempted=Sum('attempted_questions'),
-    )
-
-    overall_accuracy = (
-        (overall['total_correct'] / overall['total_attempted']) * 100
-        if overall['total_attempted'] else 0
-    )
-
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = (
-        'attachment; filename="AI_Quiz_Hub_Performance_Report.pdf"'
-    )
-
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        rightMargin=36,
-        leftMargin=36,
-        topMargin=36,
-        bottomMargin=36
-    )
-
-    styles = getSampleStyleSheet()
-
-    styles.add(ParagraphStyle(
-        name="ReportTitle",
-        fontSize=22,
-        alignment=1,
-        spaceAfter=14,
-        textColor=colors.HexColor("#111827"),
-        fontName="Helvetica-Bold"
-    ))
-
-    styles.add(ParagraphStyle(
-        name="SectionTitle",
-        fontSize=14,
-        spaceBefore=16,
-        spaceAfter=8,
-        textColor=colors.HexColor("#1f2937"),
-        fontName="Helvetica-Bold"
-    ))
-
-    styles.add(ParagraphStyle(
-        name="ReportBody",
-        fontSize=10,
-        spaceAfter=6,
-        textColor=colors.black
-    ))
-
-    styles.add(ParagraphStyle(
-        name="MutedText",
-        fontSize=9,
-        textColor=colors.grey,
-        alignment=1
-    ))
-
-    elements = []
-
-    # ---------------- HEADER ----------------
-    title_style = ParagraphStyle(
-        name="TitleStyle",
-        fontSize=20,
-        alignment=1,
-        spaceAfter=10,
-        textColor=colors.HexColor("#1f2937")
-    )
-
-    subtitle_style = ParagraphStyle(
-        name="SubtitleStyle",
-        fontSize=12,
-        alignment=1,
-        spaceAfter=20,
-        textColor=colors.grey
-    )
-
-    elements.append(Paragraph("AI Quiz Hub", styles["ReportTitle"]))
-    elements.append(Paragraph(
-        "Personal Performance Report",
-        styles["MutedText"]
-    ))
-
-    elements.append(Spacer(1, 20))
-
-    elements.append(Paragraph(
-        f"Dear <b>{user.username}</b>,<br/><br/>"
-        "This report provides a detailed overview of your quiz performance, "
-        "accuracy, and topic-wise strengths. Use this insight to track progress "
-        "and identify improvement areas.",
-        styles["BodyText"]
-    ))
-
+    name = cached_report(stats)
+    if name is None:
+        if is_large_report(stats):
+            enqueue_performance_report(user)
+            return render(request, 'quizzes/report_preparing.html', status=202)
+        name = render_report(user, stats)
 
-    # ---------------- USER INFO ----------------
-    elements.append(Spacer(1, 10))
-    elements.append(Paragraph("User Information", styles["SectionTitle"]))
-
-    elements.append(Spacer(1, 6))
-
-    elements.append(Paragraph(
-        f"<b>Username:</b> {user.username}", styles['Normal']
-    ))
-    elements.append(Paragraph(
-        f"<b>Generated on:</b> {now().strftime('%d %b %Y')}", styles['Normal']
-    ))
-
-    elements.append(Spacer(1, 16))
-
-    # ---------------- SUMMARY ----------------
-    elements.append(Paragraph("Performance Summary", styles["SectionTitle"]))
-
-    elements.append(Spacer(1, 8))
-
-    summary_table = Table([
-        ["Total Quizzes Attempted", overall['total_quizzes'] or 0],
-        ["Average Score", f"{round(overall['avg_score'] or 0, 2)} %"],
-        ["Overall Accuracy", f"{round(overall_accuracy, 2)} %"],
-    ], colWidths=[250, 150])
-
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,-1), colors.whitesmoke),
-        ('GRID', (0,0), (-1,-1), 0.8, colors.grey),
-        ('FONT', (0,0), (-1,-1), 'Helvetica'),
-        ('FONT', (0,0), (0,-1), 'Helvetica-Bold'),
-        ('ALIGN', (1,0), (1,-1), 'RIGHT'),
-        ('PADDING', (0,0), (-1,-1), 10),
-    ]))
-
-
-    elements.append(summary_table)
-    elements.append(Spacer(1, 20))
-
-    # ---------------- TOPIC TABLE ----------------
-    elements.append(Paragraph("Topic-wise Accuracy", styles["SectionTitle"]))
-
-    elements.append(Spacer(1, 8))
-
-    topic_data = [["Topic", "Accuracy (%)"]]
-
-    subcategory_stats = completed_qs.values(
-        'subcategory__name'
-    ).annotate(
-        correct=Sum('correct_answers'),
-        attempted=Sum('attempted_questions')
-    )
-
-    for item in subcategory_stats:
-        if item['attempted']:
-            acc = round((item['correct'] / item['attempted']) * 100, 2)
-            topic_data.append([item['subcategory__name'], acc])
-
-    topic_table = Table(topic_data, colWidths=[300, 100])
-    topic_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#e5e7eb")),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-        ('ALIGN', (1,1), (1,-1), 'RIGHT'),
-        ('FONT', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('PADDING', (0,0), (-1,-1), 8),
-    ]))
-
-    elements.append(topic_table)
-
-    # ---------------- FOOTER ----------------
-    elements.append(Spacer(1, 30))
-    elements.append(Paragraph(
-        "This report is system-generated and reflects quiz attempts completed on AI Quiz Hub.",
-        styles["MutedText"]
-    ))
-
-
-    doc.build(
-        elements,
-        onFirstPage=draw_page_layout,
-        onLaterPages=draw_page_layout
+    try:
+        report = report_storage.open(name, 'rb')
+    except FileNotFoundError:
+        # Removed since it was looked up (cleared by hand, or by a render
+        # for newer stats); build it again rather than fail the download
+        name = render_report(user, get_user_stats(user))
+        report = report_storage.open(name, 'rb')
+
+    return FileResponse(
+        report,
+        as_attachment=True,
+        filename=REPORT_FILENAME,
+        content_type='application/pdf'
     )
 
-    return response
-
 # RECENT QUIZZES
 @login_required
 def recent_quizzes_view(request):
@@ -1456,29 +1023,7 @@ def recent_quizzes_view(request):
 
 @login_required
 def attempts_summary_view(request):
-    user = request.user
-
-    total_attempts = QuizAttempt.objects.filter(user=user, status__in=[
-        QuizAttempt.STATUS_COMPLETED,
-        QuizAttempt.STATUS_ABANDONED
-    ]).count()
-
-    status_counts = QuizAttempt.objects.filter(user=user).aggregate(
-        completed=Count('id', filter=Q(status=QuizAttempt.STATUS_COMPLETED)),
-        abandoned=Count('id', filter=Q(status=QuizAttempt.STATUS_ABANDONED)),
-    )
-
-    timeup_auto = QuizAttempt.objects.filter(
-        user=request.user,
-        is_auto_submitted=True,
-        auto_submit_reason=QuizAttempt.AUTO_SUBMIT_TIME_UP
-    ).count()
-
-    tabswitch_auto = QuizAttempt.objects.filter(
-        user=request.user,
-        is_auto_submitted=True,
-        auto_submit_reason=QuizAttempt.AUTO_SUBMIT_TAB_SWITCH
-    ).count()
+    stats = get_user_stats(request.user)
 
     # last_7_days_attempts = QuizAttempt.objects.filter(
     #     user=user,
@@ -1486,34 +1031,77 @@ def attempts_summary_view(request):
     # ).count()
 
     context = {
-        'total_attempts': total_attempts,
-        'completed_attempts': status_counts['completed'],
-        'abandoned_attempts': status_counts['abandoned'],
+        'total_attempts': stats.completed_count + stats.abandoned_count,
+        'completed_attempts': stats.completed_count,
+        'abandoned_attempts': stats.abandoned_count,
         # 'last_7_days_attempts': last_7_days_attempts,
-        "timeup_auto": timeup_auto,
-        "tabswitch_auto": tabswitch_auto,
+        "timeup_auto": stats.timeup_auto_count,
+        "tabswitch_auto": stats.tabswitch_auto_count,
     }
 
     return render(request, 'quizzes/attempts_summary.html', context)
 
 # Leaderboard
 
+LEADERBOARD_PAGE_SIZE = 20
+LEADERBOARD_DIFFICULTIES = ('easy', 'medium', 'hard')
+
 @login_required
 def leaderboard(request):
-    leaderboard_data = (
-        QuizAttempt.objects
-        .filter(status=QuizAttempt.STATUS_COMPLETED)
-        .values('user__username')
-        .annotate(
-            avg_score=Avg('score'),
-            quizzes_attempted=Count('id')
-        )
-        .filter(quizzes_attempted__gte=1)  # minimum 1 attempt to appear
-        .order_by('-avg_score', '-quizzes_attempted')[:20]
-    )
+    """
+    Ranked boards (all-time, this week, per category, per difficulty),
+    paginated, plus the viewer's own rank. Served from LeaderboardEntry.
+    """
+    board_type = request.GET.get('board', 'all')
+    categories = list(Category.objects.order_by('name').values('id', 'name'))
+    selected_category = None
+    selected_difficulty = None
+
+    if board_type == 'week':
+        board = week_board()
+    elif board_type == 'category' and categories:
+        category_ids = {c['id'] for c in categories}
+        try:
+            selected_category = int(request.GET.get('category', ''))
+        except ValueError:
+            selected_category = None
+        if selected_category not in category_ids:
+            selected_category = categories[0]['id']
+        board = category_board(selected_category)
+    elif board_type == 'difficulty':
+        selected_difficulty = request.GET.get('difficulty')
+        if selected_difficulty not in LEADERBOARD_DIFFICULTIES:
+            selected_difficulty = LEADERBOARD_DIFFICULTIES[0]
+        board = difficulty_board(selected_difficulty)
+    else:
+        board_type = 'all'
+        board = BOARD_ALL
+
+    page_obj = Paginator(board_entries(board), LEADERBOARD_PAGE_SIZE).get_page(request.GET.get('page'))
+
+    leaderboard_data = [
+        {
+            'rank': page_obj.start_index() + i,
+            'user__username': entry.user.username,
+            'avg_score': entry.avg_score,
+            'quizzes_attempted': entry.quizzes,
+            'is_viewer': entry.user_id == request.user.id,
+        }
+        for i, entry in enumerate(page_obj)
+    ]
+
+    my_entry, my_rank = user_rank(board, request.user)
 
     return render(request, 'quizzes/leaderboard.html', {
-        'leaderboard': leaderboard_data
+        'leaderboard': leaderboard_data,
+        'page_obj': page_obj,
+        'board_type': board_type,
+        'categories': categories,
+        'selected_category': selected_category,
+        'difficulties': LEADERBOARD_DIFFICULTIES,
+        'selected_difficulty': selected_difficulty,
+        'my_entry': my_entry,
+        'my_rank': my_rank,
     })
 
 @login_required
@@ -1802,10 +1390,12 @@ def generate_ai_quiz(request):
         
         extracted_text = ""
         source_name = topic or "Custom Quiz"
+        # Document text sent to the AI (API limits); parsing stops there too
+        max_content_length = 8000
         
         if uploaded_file:
             try:
-                extracted_text = extract_text_from_file(uploaded_file)
+                document_hash, extracted_text = document_text(uploaded_file, max_chars=max_content_length)
                 source_name = uploaded_file.name.rsplit('.', 1)[0]  # File name without extension
                 if not extracted_text or len(extracted_text.strip()) < 50:
                     messages.error(request, "Could not extract enough text from the file. Please try another file.")
@@ -1826,16 +1416,20 @@ def generate_ai_quiz(request):
             # For file uploads, use the extracted content as context
             if uploaded_file:
                 # Truncate text if too long (API limits)
-                max_content_length = 8000
                 if len(extracted_text) > max_content_length:
                     extracted_text = extracted_text[:max_content_length] + "..."
                 
-                questions = generate_quiz_questions(
-                    topic=source_name,
-                    category="Document-Based",
-                    difficulty=difficulty,
-                    count=question_count,
-                    concepts=[f"Based on the following content:\n{extracted_text}"]
+                # Same document, difficulty and count as an earlier upload:
+                # reuse its questions instead of prompting again
+                questions = document_questions(
+                    document_hash, difficulty, question_count,
+                    lambda: generate_quiz_questions(
+                        topic=source_name,
+                        category="Document-Based",
+                        difficulty=difficulty,
+                        count=question_count,
+                        concepts=[f"Based on the following content:\n{extracted_text}"]
+                    )
                 )
             else:
                 questions = generate_quiz_questions(
@@ -1960,7 +1554,7 @@ def start_ai_quiz(request):
         # Calculate time limit (1 minute per question)
         time_limit_seconds = len(questions) * 60
         
-        # Format questions with IDs and user_answer fields
+        # Format questions with IDs (answers are stored in AttemptQuestion)
         formatted_questions = []
         for idx, q in enumerate(questions):
             formatted_questions.append({
@@ -1971,40 +1565,35 @@ def start_ai_quiz(request):
                 "option_c": q.get('option_c', ''),
                 "option_d": q.get('option_d', ''),
                 "correct_answer": q.get('correct_answer', 'A'),
-                "explanation": q.get('explanation', ''),
-                "user_answer": None,
-                "is_correct": None
+                "explanation": q.get('explanation', '')
             })
         
         # Create quiz attempt without category/subcategory
-        quiz_attempt = QuizAttempt.objects.create(
-            user=request.user,
-            category=None,  # No category saved
-            subcategory=None,  # No subcategory saved
-            difficulty=config['difficulty'],
-            total_questions=len(formatted_questions),
-            status=QuizAttempt.STATUS_IN_PROGRESS,
-            time_limit_seconds=time_limit_seconds,
-            remaining_seconds=time_limit_seconds,
-            questions=formatted_questions,
-            started_at=timezone.now(),
-            ai_meta={
-                'model': 'gpt-3.5-turbo',
-                'source': config.get('source', 'topic'),
-                'topic': config.get('topic', 'AI Generated Quiz'),
-                'generated_at': timezone.now().isoformat()
-            }
-        )
-        
-        # Create AttemptQuestion entries for navigation panel
-        for idx in range(len(formatted_questions)):
-            AttemptQuestion.objects.create(
-                attempt=quiz_attempt,
-                question=None,  # No Question object for AI-generated quizzes
-                question_order=idx,
-                status=AttemptQuestion.STATUS_UNVISITED
+        with transaction.atomic():
+            quiz_attempt = QuizAttempt.objects.create(
+                user=request.user,
+                category=None,  # No category saved
+                subcategory=None,  # No subcategory saved
+                difficulty=config['difficulty'],
+                total_questions=len(formatted_questions),
+                status=QuizAttempt.STATUS_IN_PROGRESS,
+                time_limit_seconds=time_limit_seconds,
+                remaining_seconds=time_limit_seconds,
+                question_set=QuestionSet.for_questions(formatted_questions),
+                started_at=timezone.now(),
+                ai_meta={
+                    'model': 'gpt-3.5-turbo',
+                    'source': config.get('source', 'topic'),
+                    'topic': config.get('topic', 'AI Generated Quiz'),
+                    'generated_at': timezone.now().isoformat()
+                }
             )
-        
+
+            # AttemptQuestion entries for navigation panel (no Question object for AI quizzes)
+            create_attempt_questions(quiz_attempt, [None] * len(formatted_questions))
+            record_attempt_started(request.user)
+            record_activity(request.user.pk)
+
         # Clear session data
         del request.session['ai_generated_questions']
         del request.session['ai_quiz_config']
@@ -2079,7 +1668,7 @@ def save_classroom_quiz(request):
             title=title,
             description=description,
             difficulty=config.get('difficulty', 'medium'),
-            questions=formatted_questions,
+            question_set=QuestionSet.for_questions(formatted_questions),
             time_limit_seconds=int(time_limit),
         )
         
@@ -2123,10 +1712,12 @@ def take_shared_quiz(request, share_code):
     Handle shared quiz access via link.
     Requires login to take the quiz.
     """
-    shared_quiz = get_object_or_404(SharedQuiz, share_code=share_code, is_active=True)
+    quiz = join_payload(share_code)
+    if quiz is None:
+        raise Http404("No SharedQuiz matches the given query.")
     
     # Check if quiz has expired
-    if shared_quiz.is_expired():
+    if is_shared_quiz_expired(quiz):
         messages.error(request, "This quiz has expired and is no longer available.")
         return redirect('core:home')
     
@@ -2137,34 +1728,22 @@ def take_shared_quiz(request, share_code):
         request.session['pending_shared_quiz'] = share_code
         return redirect('accounts:login')
     
-    # Check if user has already attempted this quiz
-    existing_attempt = SharedQuizAttempt.objects.filter(
-        shared_quiz=shared_quiz,
-        attempt__user=request.user
-    ).select_related('attempt').first()
+    # The user's previous attempts at this quiz, in one query
+    completed, in_progress_id, latest_id = join_state(quiz, request.user)
     
-    if existing_attempt:
-        # Check if completed or can retry
-        if existing_attempt.attempt.status == QuizAttempt.STATUS_COMPLETED:
-            # Check max attempts
-            user_attempts = SharedQuizAttempt.objects.filter(
-                shared_quiz=shared_quiz,
-                attempt__user=request.user,
-                attempt__status=QuizAttempt.STATUS_COMPLETED
-            ).count()
-            
-            if user_attempts >= shared_quiz.max_attempts:
-                messages.warning(request, "You have already completed this quiz.")
-                return redirect('quizzes:quiz_results', attempt_id=existing_attempt.attempt.id)
-        elif existing_attempt.attempt.status == QuizAttempt.STATUS_IN_PROGRESS:
-            # Resume existing attempt
-            return redirect('quizzes:show_question', attempt_id=existing_attempt.attempt.id)
+    if in_progress_id:
+        # Resume existing attempt
+        return redirect('quizzes:show_question', attempt_id=in_progress_id)
+    
+    if completed >= quiz['max_attempts']:
+        messages.warning(request, "You have already completed this quiz.")
+        return redirect('quizzes:quiz_results', attempt_id=latest_id)
     
     # Show quiz instructions page
     context = {
-        'quiz': shared_quiz,
-        'creator': shared_quiz.creator,
-        'question_count': len(shared_quiz.questions),
+        'quiz': quiz,
+        'creator': {'username': quiz['creator_username']},
+        'question_count': quiz['question_count'],
     }
     return render(request, 'quizzes/shared_quiz_instructions.html', context)
 
@@ -2175,66 +1754,25 @@ def start_shared_quiz(request, share_code):
     """
     Start a shared quiz attempt.
     """
-    shared_quiz = get_object_or_404(SharedQuiz, share_code=share_code, is_active=True)
+    quiz = join_payload(share_code)
+    if quiz is None:
+        raise Http404("No SharedQuiz matches the given query.")
     
-    if shared_quiz.is_expired():
+    if is_shared_quiz_expired(quiz):
         messages.error(request, "This quiz has expired.")
         return redirect('core:home')
     
-    # Check max attempts
-    user_attempts = SharedQuizAttempt.objects.filter(
-        shared_quiz=shared_quiz,
-        attempt__user=request.user,
-        attempt__status=QuizAttempt.STATUS_COMPLETED
-    ).count()
+    completed, in_progress_id, _ = join_state(quiz, request.user)
     
-    if user_attempts >= shared_quiz.max_attempts:
+    # A double-clicked start resumes the attempt instead of opening another
+    if in_progress_id:
+        return redirect("quizzes:show_question", attempt_id=in_progress_id)
+    
+    if completed >= quiz['max_attempts']:
         messages.warning(request, "You have reached the maximum number of attempts for this quiz.")
         return redirect('quizzes:dashboard')
     
-    # Format questions with user_answer fields
-    formatted_questions = []
-    for q in shared_quiz.questions:
-        formatted_questions.append({
-            **q,
-            "user_answer": None,
-            "is_correct": None
-        })
-    
-    # Create quiz attempt
-    quiz_attempt = QuizAttempt.objects.create(
-        user=request.user,
-        category=shared_quiz.category,
-        subcategory=shared_quiz.subcategory,
-        difficulty=shared_quiz.difficulty,
-        total_questions=len(formatted_questions),
-        status=QuizAttempt.STATUS_IN_PROGRESS,
-        time_limit_seconds=shared_quiz.time_limit_seconds,
-        remaining_seconds=shared_quiz.time_limit_seconds,
-        questions=formatted_questions,
-        started_at=timezone.now(),
-        ai_meta={
-            'source': 'shared_quiz',
-            'shared_quiz_id': str(shared_quiz.id),
-            'shared_by': shared_quiz.creator.username,
-            'topic': shared_quiz.title,
-        }
-    )
-    
-    # Create AttemptQuestion entries
-    for idx in range(len(formatted_questions)):
-        AttemptQuestion.objects.create(
-            attempt=quiz_attempt,
-            question=None,
-            question_order=idx,
-            status=AttemptQuestion.STATUS_UNVISITED
-        )
-    
-    # Link attempt to shared quiz
-    SharedQuizAttempt.objects.create(
-        shared_quiz=shared_quiz,
-        attempt=quiz_attempt
-    )
+    quiz_attempt = start_shared_attempt(quiz, request.user)
     
     return redirect("quizzes:show_question", attempt_id=quiz_attempt.id)
 
@@ -2243,80 +1781,80 @@ def start_shared_quiz(request, share_code):
 def classroom_quiz_results(request, quiz_id):
     """
     Results dashboard for classroom quiz creator.
-    Shows all students who attempted the quiz with their scores.
+    Shows the students who attempted the quiz (paginated) with their
+    scores, and per-question statistics.
     """
     shared_quiz = get_object_or_404(SharedQuiz, id=quiz_id, creator=request.user)
-    
-    # Get all attempts for this quiz
-    attempts = SharedQuizAttempt.objects.filter(
-        shared_quiz=shared_quiz
-    ).select_related(
-        'attempt', 'attempt__user'
-    ).order_by('-attempt__completed_at')
-    
-    # Calculate statistics
-    completed_attempts = [a for a in attempts if a.attempt.status == QuizAttempt.STATUS_COMPLETED]
-    in_progress_attempts = [a for a in attempts if a.attempt.status == QuizAttempt.STATUS_IN_PROGRESS]
-    
-    total_participants = len(attempts)
-    completed_count = len(completed_attempts)
-    
-    avg_score = 0
-    if completed_attempts:
-        avg_score = sum(a.attempt.score for a in completed_attempts) / len(completed_attempts)
-    
-    # Build participant details
-    participants = []
-    for shared_attempt in attempts:
-        attempt = shared_attempt.attempt
-        user = attempt.user
-        
-        # Count question stats
-        answered = 0
-        skipped = 0
-        not_attempted = 0
-        
-        if attempt.questions:
-            for q in attempt.questions:
-                if q.get('user_answer'):
-                    answered += 1
-                elif q.get('skipped'):
-                    skipped += 1
-                else:
-                    not_attempted += 1
-        
-        participants.append({
-            'user': user,
-            'username': user.username,
-            'email': user.email,
-            'full_name': user.full_name or user.username,  # Fallback to username if no full_name
-            'avatar': user.avatar_path.url if user.avatar_path else None,
-            'date_joined': user.date_joined,
-            'score': attempt.score if attempt.status == QuizAttempt.STATUS_COMPLETED else None,
-            'correct_answers': attempt.correct_answers,
-            'status': attempt.get_status_display(),
-            'status_code': attempt.status,
-            'answered': answered,
-            'skipped': skipped,
-            'not_attempted': not_attempted,
-            'completed_at': attempt.completed_at,
-            'started_at': attempt.started_at,
-            'time_taken': attempt.time_taken_seconds,
-            'attempt_id': attempt.id,
-        })
-    
+
+    search = request.GET.get('q', '').strip()
+    summary = participant_summary(shared_quiz)
+    page_obj, participants = participant_page(shared_quiz, request.GET.get('page'), search)
+
     context = {
         'quiz': shared_quiz,
         'participants': participants,
-        'total_participants': total_participants,
-        'completed_count': completed_count,
-        'in_progress_count': len(in_progress_attempts),
-        'avg_score': round(avg_score, 1),
+        'page_obj': page_obj,
+        'search': search,
+        'question_stats': question_stats(shared_quiz),
+        'total_participants': summary['total'],
+        'completed_count': summary['completed'],
+        'in_progress_count': summary['in_progress'],
+        'avg_score': summary['avg_score'],
         'share_url': request.build_absolute_uri(f'/quiz/join/{shared_quiz.share_code}/'),
     }
     return render(request, 'quizzes/classroom_quiz_results.html', context)
 
 
+@login_required
+def classroom_quiz_live(request, quiz_id):
+    """
+    Server-sent event stream of participant changes and running totals
+    for the results dashboard (see quizzes/classroom_live.py).
+    """
+    shared_quiz = get_object_or_404(SharedQuiz, id=quiz_id, creator=request.user)
+
+    # Sent by the browser when it reconnects after a stream ends
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        live_event_stream(shared_quiz, last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+def classroom_quiz_export(request, quiz_id, fmt):
+    """
+    Download every participant's result and per-question answers as
+    CSV (streamed), XLSX or PDF.
+    """
+    shared_quiz = get_object_or_404(SharedQuiz, id=quiz_id, creator=request.user)
+
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export format")
+
+    filename = export_filename(shared_quiz, fmt)
+
+    if fmt == 'csv':
+        response = StreamingHttpResponse(stream_csv(shared_quiz), content_type=CONTENT_TYPES['csv'])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    return FileResponse(
+        write_export(shared_quiz, fmt),
+        as_attachment=True,
+        filename=filename,
+        content_type=CONTENT_TYPES[fmt]
+    )
+
+
 @login_required
 def my_classroom_quizzes(request):
     """
@@ -2324,7 +1862,7 @@ def my_classroom_quizzes(request):
     """
     quizzes = SharedQuiz.objects.filter(
         creator=request.user
-    ).annotate(
+    ).select_related('question_set').defer('question_set__questions').annotate(
         attempts_count=Count('shared_attempts'),
         completed_count=Count('shared_attempts', filter=Q(shared_attempts__attempt__status=QuizAttempt.STATUS_COMPLETED))
     ).order_by('-created_at')